@@ -0,0 +1 @@
+import blog.signals  # NOQA
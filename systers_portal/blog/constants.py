@@ -0,0 +1,10 @@
+# cache
+POSTS_FEED_ALL_COMMUNITIES = "all"
+POSTS_FEED_VERSION_KEY = "blog:feed:{0}:version"
+POSTS_FEED_CACHE_KEY = "blog:feed:{0}:{1}"
+POSTS_COUNTS_VERSION_KEY = "blog:community:{0}:counts:version"
+TAG_COUNTS_CACHE_KEY = "blog:community:{0}:tags"
+RESOURCE_TYPE_COUNTS_CACHE_KEY = "blog:community:{0}:resource_types"
+
+# tag cloud
+TAG_CLOUD_WEIGHTS = 5
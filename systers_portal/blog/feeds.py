@@ -0,0 +1,133 @@
+from datetime import datetime, time
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from blog.constants import (POSTS_FEED_ALL_COMMUNITIES,
+                            POSTS_FEED_VERSION_KEY, POSTS_FEED_CACHE_KEY)
+from blog.models import News, Resource
+from community.models import Community
+from community.utils import get_cache_version
+
+
+def date_to_datetime(date):
+    """Get the aware datetime of the start of a day
+
+    :param date: date object
+    :return: datetime object in UTC
+    """
+    return timezone.make_aware(datetime.combine(date, time.min), timezone.utc)
+
+
+class LatestPostsFeed(Feed):
+    """RSS feed of the latest news and resources of a community, or of all
+    communities if the URL has no community slug.
+
+    Conditional requests are answered with 304 Not Modified from the ETag,
+    which is derived from the cache version of the feed, without loading the
+    posts. Last-Modified is not sent, since posts only store the day they
+    were modified on. The feed body is cached until a News or Resource of the
+    community changes, or until the cache timeout expires.
+    """
+    feed_format = 'rss'
+    items_count = 20
+
+    def __call__(self, request, slug=None):
+        community = None
+        if slug is not None:
+            community = get_object_or_404(
+                Community.objects.only('pk', 'name', 'slug'), slug=slug)
+        scope = POSTS_FEED_ALL_COMMUNITIES if community is None \
+            else community.pk
+        version = get_cache_version(POSTS_FEED_VERSION_KEY.format(scope))
+        etag = "{0}-{1}".format(self.feed_format, version)
+        view = condition(
+            etag_func=lambda request, **kwargs: etag)(self.get_response)
+        return view(request, community=community, version=version)
+
+    def get_response(self, request, community, version):
+        """Get the feed response, rendered once per cache version
+
+        :param request: HttpRequest object
+        :param community: Community object or None for all communities
+        :param version: integer cache version of the feed
+        :return: HttpResponse object
+        """
+        scope = POSTS_FEED_ALL_COMMUNITIES if community is None \
+            else community.pk
+        cache_key = POSTS_FEED_CACHE_KEY.format(scope, self.feed_format)
+        cached = cache.get(cache_key, version=version)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        response = super(LatestPostsFeed, self).__call__(request,
+                                                         community=community)
+        # Last-Modified is derived from the day precision item_pubdate, so
+        # it is left out like on cache hits
+        del response['Last-Modified']
+        cache.set(cache_key, (response.content, response['Content-Type']),
+                  version=version)
+        return response
+
+    def get_object(self, request, community=None):
+        return community
+
+    def title(self, community):
+        if community is None:
+            return "Systers Portal"
+        return "Systers Portal - {0}".format(community.name)
+
+    def link(self, community):
+        if community is None:
+            return reverse('index')
+        return reverse('view_community_landing',
+                       kwargs={'slug': community.slug})
+
+    def description(self, community):
+        if community is None:
+            return "Latest news and resources of Systers communities"
+        return "Latest news and resources of {0}".format(community.name)
+
+    def items(self, community):
+        """Get the latest news and resources, newest first"""
+        posts = []
+        for model in (News, Resource):
+            queryset = model.objects.select_related('author__user',
+                                                    'community')
+            if community is not None:
+                queryset = queryset.filter(community=community)
+            posts.extend(queryset.defer('content').order_by(
+                '-date_created', '-pk')[:self.items_count])
+        posts.sort(key=lambda post: post.date_created, reverse=True)
+        return posts[:self.items_count]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.excerpt
+
+    def item_author_name(self, post):
+        return str(post.author)
+
+    def item_pubdate(self, post):
+        return date_to_datetime(post.date_created)
+
+    def item_updateddate(self, post):
+        return date_to_datetime(post.date_modified)
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    """Atom feed of the latest news and resources of a community, or of all
+    communities"""
+    feed_type = Atom1Feed
+    feed_format = 'atom'
+
+    def subtitle(self, community):
+        return self.description(community)
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_auto_20150522_1233'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='excerpt',
+            field=models.TextField(verbose_name='Excerpt', editable=False, blank=True),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='excerpt',
+            field=models.TextField(verbose_name='Excerpt', editable=False, blank=True),
+            preserve_default=True,
+        ),
+    ]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+TABLES = ['blog_news', 'blog_resource']
+
+ADD_SEARCH_VECTOR = [
+    "ALTER TABLE {0} ADD COLUMN search_vector tsvector",
+    "UPDATE {0} SET search_vector = "
+    "setweight(to_tsvector('pg_catalog.english', coalesce(title, '')), 'A') "
+    "|| setweight(to_tsvector('pg_catalog.english', coalesce(content, '')), "
+    "'B')",
+    "CREATE INDEX {0}_search_vector ON {0} USING gin(search_vector)",
+    "CREATE TRIGGER {0}_search_vector_update "
+    "BEFORE INSERT OR UPDATE OF title, content ON {0} "
+    "FOR EACH ROW EXECUTE PROCEDURE common_post_search_vector_update()",
+]
+
+REMOVE_SEARCH_VECTOR = [
+    "DROP TRIGGER {0}_search_vector_update ON {0}",
+    "ALTER TABLE {0} DROP COLUMN search_vector",
+]
+
+
+def add_search_vector(apps, schema_editor):
+    for table in TABLES:
+        for statement in ADD_SEARCH_VECTOR:
+            schema_editor.execute(statement.format(table))
+
+
+def remove_search_vector(apps, schema_editor):
+    for table in TABLES:
+        for statement in REMOVE_SEARCH_VECTOR:
+            schema_editor.execute(statement.format(table))
+
+
+class Migration(migrations.Migration):
+    """Add to news and resources a full-text search vector column, which is
+    not a model field. It is GIN-indexed and kept current by a trigger on
+    every insert and every update of the title or content."""
+
+    dependencies = [
+        ('blog', '0007_post_excerpt'),
+        ('common', '0003_post_search_vector_function'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, remove_search_vector),
+    ]
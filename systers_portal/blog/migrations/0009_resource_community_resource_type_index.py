@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='resource',
+            index_together=set([('community', 'resource_type')]),
+        ),
+    ]
@@ -1,9 +1,50 @@
-from blog.models import ResourceType
+from blog.utils import get_resource_type_counts, get_tag_counts
 
 
 class ResourceTypesMixin(object):
-    """Mixin allows to add to the context all resource type object"""
+    """Mixin allows to add to the context the resource types of the
+    resources of the community, with their counts, and the resource type
+    selected by the `type` GET parameter. It expects a `get_community()`
+    method, e.g. from CommunityMenuMixin."""
     def get_context_data(self, **kwargs):
         context = super(ResourceTypesMixin, self).get_context_data(**kwargs)
-        context["resource_types"] = ResourceType.objects.all()
+        context["resource_types"] = get_resource_type_counts(
+            self.get_community())
+        context["active_resource_type"] = self.get_active_resource_type()
         return context
+
+    def get_active_resource_type(self):
+        """Get the resource type selected by the `type` GET parameter
+
+        :return: ResourceTypeCount tuple or None if the community has no
+                 resources of that type
+        """
+        name = self.request.GET.get("type", "")
+        for resource_type in get_resource_type_counts(self.get_community()):
+            if resource_type.name == name:
+                return resource_type
+        return None
+
+
+class TagsMixin(object):
+    """Mixin allows to add to the context the tags of the posts of the
+    community, with their counts, and the tag selected by the `tag` GET
+    parameter. It expects a `get_community()` method, e.g. from
+    CommunityMenuMixin."""
+    def get_context_data(self, **kwargs):
+        context = super(TagsMixin, self).get_context_data(**kwargs)
+        context["tag_counts"] = get_tag_counts(self.get_community())
+        context["active_tag"] = self.get_active_tag()
+        return context
+
+    def get_active_tag(self):
+        """Get the tag selected by the `tag` GET parameter
+
+        :return: TagCount tuple or None if no post of the community has that
+                 tag
+        """
+        name = self.request.GET.get("tag", "")
+        for tag in get_tag_counts(self.get_community()):
+            if tag.name == name:
+                return tag
+        return None
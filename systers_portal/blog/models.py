@@ -21,6 +21,24 @@ class ResourceType(models.Model):
         return self.name
 
 
+class NewsQuerySet(models.QuerySet):
+    """QuerySet for News model"""
+    def with_related(self):
+        """Load the related authors, communities and tags of the news in a
+        fixed number of queries"""
+        return self.select_related('author__user', 'community').\
+            prefetch_related('tags')
+
+
+class ResourceQuerySet(NewsQuerySet):
+    """QuerySet for Resource model"""
+    def with_related(self):
+        """Load the related authors, communities, resource types and tags of
+        the resources in a fixed number of queries"""
+        return super(ResourceQuerySet, self).with_related().select_related(
+            'resource_type')
+
+
 class News(Post):
     """Model to represent community news in resource area"""
     community = models.ForeignKey(Community, verbose_name="Community")
@@ -29,6 +47,8 @@ class News(Post):
                                        verbose_name="Is monitored")
     tags = models.ManyToManyField(Tag, blank=True, verbose_name="Tags")
 
+    objects = NewsQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "News"
         unique_together = ('community', 'slug')
@@ -53,8 +73,11 @@ class Resource(Post):
     resource_type = models.ForeignKey(ResourceType, blank=True, null=True,
                                       verbose_name="Resource type")
 
+    objects = ResourceQuerySet.as_manager()
+
     class Meta:
         unique_together = ('community', 'slug')
+        index_together = ('community', 'resource_type')
 
     def __str__(self):
         return "{0} of {1} Community".format(self.title, self.community.name)
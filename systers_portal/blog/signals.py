@@ -0,0 +1,80 @@
+from django.db.models.signals import (post_save, post_delete, pre_delete,
+                                      m2m_changed)
+from django.dispatch import receiver
+
+from blog.constants import POSTS_FEED_ALL_COMMUNITIES, POSTS_FEED_VERSION_KEY
+from blog.models import News, Resource
+from blog.utils import invalidate_posts_counts
+from community.utils import bump_cache_version
+
+
+@receiver([post_save, post_delete], sender='blog.News',
+          dispatch_uid="invalidate_news_feeds")
+@receiver([post_save, post_delete], sender='blog.Resource',
+          dispatch_uid="invalidate_resource_feeds")
+def invalidate_posts_feeds(sender, instance, **kwargs):
+    """Invalidate cached feeds of the community of a News or Resource and
+    the feeds of all communities"""
+    bump_cache_version(POSTS_FEED_VERSION_KEY.format(instance.community_id))
+    bump_cache_version(POSTS_FEED_VERSION_KEY.format(
+        POSTS_FEED_ALL_COMMUNITIES))
+
+
+@receiver(post_save, sender='community.Community',
+          dispatch_uid="invalidate_community_feeds")
+def invalidate_community_feeds(sender, instance, **kwargs):
+    """Invalidate cached feeds of a Community, whose title is its name"""
+    bump_cache_version(POSTS_FEED_VERSION_KEY.format(instance.pk))
+
+
+@receiver([post_save, post_delete], sender='blog.News',
+          dispatch_uid="invalidate_news_counts")
+@receiver([post_save, post_delete], sender='blog.Resource',
+          dispatch_uid="invalidate_resource_counts")
+def invalidate_post_counts(sender, instance, **kwargs):
+    """Invalidate cached tag and resource type counts of the community of a
+    News or Resource"""
+    invalidate_posts_counts([instance.community_id])
+
+
+@receiver(m2m_changed, sender=News.tags.through,
+          dispatch_uid="invalidate_news_tag_counts")
+@receiver(m2m_changed, sender=Resource.tags.through,
+          dispatch_uid="invalidate_resource_tag_counts")
+def invalidate_tag_counts(sender, instance, action, reverse, model, pk_set,
+                          **kwargs):
+    """Invalidate cached tag counts of the communities whose posts were
+    tagged or untagged. The posts of a cleared Tag are looked up before they
+    are untagged."""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_posts_counts([instance.community_id])
+    elif action in ('post_add', 'post_remove'):
+        invalidate_posts_counts(model.objects.filter(
+            pk__in=pk_set).values_list('community_id', flat=True))
+    elif action == 'pre_clear':
+        invalidate_posts_counts(model.objects.filter(
+            tags=instance).values_list('community_id', flat=True))
+
+
+@receiver(post_save, sender='blog.Tag', dispatch_uid="rename_tag_counts")
+@receiver(pre_delete, sender='blog.Tag', dispatch_uid="delete_tag_counts")
+def invalidate_tag_communities_counts(sender, instance, **kwargs):
+    """Invalidate cached tag counts of the communities with posts tagged by
+    a renamed or deleted Tag"""
+    if kwargs.get('created'):
+        return
+    for model in (News, Resource):
+        invalidate_posts_counts(model.objects.filter(
+            tags=instance).values_list('community_id', flat=True))
+
+
+@receiver(post_save, sender='blog.ResourceType',
+          dispatch_uid="rename_resource_type_counts")
+def invalidate_resource_type_counts(sender, instance, created, **kwargs):
+    """Invalidate cached resource type counts of the communities with
+    resources of a renamed ResourceType. Deleted types are handled by the
+    deletion of their resources."""
+    if not created:
+        invalidate_posts_counts(Resource.objects.filter(
+            resource_type=instance).values_list('community_id', flat=True))
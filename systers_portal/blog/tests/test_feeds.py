@@ -0,0 +1,102 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import TestCase, Client
+
+from blog.models import News, Resource
+from community.models import Community
+from users.models import SystersUser
+
+
+class LatestPostsFeedTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+        self.other_community = Community.objects.create(
+            name="Bar", slug="bar", order=2, admin=self.systers_user)
+        self.news = News.objects.create(slug="news", title="Foo news",
+                                        content="<p>Foo content</p>",
+                                        author=self.systers_user,
+                                        community=self.community)
+        Resource.objects.create(slug="resource", title="Foo resource",
+                                content="Content", author=self.systers_user,
+                                community=self.community)
+        News.objects.create(slug="news", title="Bar news", content="Content",
+                            author=self.systers_user,
+                            community=self.other_community)
+        self.client = Client()
+
+    def test_community_rss_feed(self):
+        """Test the RSS feed of the news and resources of a community"""
+        url = reverse('community_rss_feed', kwargs={'slug': 'foo'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith(
+            'application/rss+xml'))
+        self.assertContains(response, "Foo news")
+        self.assertContains(response, "Foo resource")
+        self.assertContains(response, "Foo content")
+        self.assertContains(response, "/community/foo/news/news/")
+        self.assertNotContains(response, "Bar news")
+        self.assertTrue(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        url = reverse('community_rss_feed', kwargs={'slug': 'baz'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_atom_feed(self):
+        """Test the Atom feed of the news and resources of all communities"""
+        response = self.client.get(reverse('atom_feed'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith(
+            'application/atom+xml'))
+        self.assertContains(response, "Foo news")
+        self.assertContains(response, "Bar news")
+        rss_response = self.client.get(reverse('rss_feed'))
+        self.assertNotEqual(response['ETag'], rss_response['ETag'])
+
+    def test_feed_conditional_get(self):
+        """Test that unchanged feeds are answered with 304 Not Modified
+        without loading the posts"""
+        url = reverse('rss_feed')
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url,
+                                       HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        url = reverse('community_atom_feed', kwargs={'slug': 'foo'})
+        response = self.client.get(url)
+        # the community is looked up by its slug
+        with self.assertNumQueries(1):
+            response = self.client.get(url,
+                                       HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_feed_cache(self):
+        """Test that the feed body is cached until a post of the community
+        changes"""
+        url = reverse('community_rss_feed', kwargs={'slug': 'foo'})
+        response = self.client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            cached_response = self.client.get(url)
+        self.assertEqual(cached_response.content, response.content)
+
+        News.objects.create(slug="other", title="Other news",
+                            content="Content", author=self.systers_user,
+                            community=self.other_community)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.news.title = "Updated news"
+        self.news.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, "Updated news")
@@ -1,43 +1,99 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase, RequestFactory
 from django.views.generic import TemplateView
 
-from blog.mixins import ResourceTypesMixin
-from blog.models import ResourceType
+from blog.mixins import ResourceTypesMixin, TagsMixin
+from blog.models import News, Resource, ResourceType, Tag
 from community.models import Community
 from users.models import SystersUser
 
 
 class ResourceTypesMixinTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.factory = RequestFactory()
         self.user = User.objects.create_user(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
         self.community = Community.objects.create(name="Foo", slug="foo",
                                                   order=1,
                                                   admin=self.systers_user)
+        community = self.community
 
-    def test_get_context_data_empty(self):
-        """Test mixin and no resource type objects"""
         class DummyView(ResourceTypesMixin, TemplateView):
             template_name = "dummy"
 
+            def get_community(self):
+                return community
+
+        self.view = DummyView.as_view()
+
+    def test_get_context_data_empty(self):
+        """Test mixin and no resource type objects"""
+        ResourceType.objects.create(name="foo")
         request = self.factory.get("/dummy/")
-        view = DummyView.as_view()
-        response = view(request)
+        response = self.view(request)
         context = response.context_data
         self.assertSequenceEqual(context.get('resource_types'), [])
+        self.assertIsNone(context.get('active_resource_type'))
 
     def test_get_context_data(self):
-        """Test mixin with 2 resource types"""
-        class DummyView(ResourceTypesMixin, TemplateView):
-            template_name = "dummy"
-
+        """Test mixin with 2 resource types of the community resources"""
         resource_type1 = ResourceType.objects.create(name="foo")
         resource_type2 = ResourceType.objects.create(name="bar")
-        request = self.factory.get("/dummy/")
-        view = DummyView.as_view()
-        response = view(request)
+        ResourceType.objects.create(name="baz")
+        for i, resource_type in enumerate([resource_type1, resource_type1,
+                                           resource_type2]):
+            Resource.objects.create(slug="foo{0}".format(i), title="Foo",
+                                    content="Content",
+                                    author=self.systers_user,
+                                    community=self.community,
+                                    resource_type=resource_type)
+        request = self.factory.get("/dummy/", {'type': "foo"})
+        response = self.view(request)
         context = response.context_data
-        self.assertCountEqual(context.get('resource_types'),
-                              [resource_type1, resource_type2])
+        self.assertEqual(
+            [(resource_type.name, resource_type.resources_count)
+             for resource_type in context.get('resource_types')],
+            [("bar", 1), ("foo", 2)])
+        self.assertEqual(context.get('active_resource_type').pk,
+                         resource_type1.pk)
+
+
+class TagsMixinTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+        community = self.community
+
+        class DummyView(TagsMixin, TemplateView):
+            template_name = "dummy"
+
+            def get_community(self):
+                return community
+
+        self.view = DummyView.as_view()
+
+    def test_get_context_data(self):
+        """Test mixin with tags of news of the community"""
+        tag = Tag.objects.create(name="foo")
+        Tag.objects.create(name="bar")
+        news = News.objects.create(slug="foo", title="Foo", content="Content",
+                                   author=self.systers_user,
+                                   community=self.community)
+        news.tags.add(tag)
+        request = self.factory.get("/dummy/", {'tag': "foo"})
+        response = self.view(request)
+        context = response.context_data
+        self.assertEqual([tag.name for tag in context.get('tag_counts')],
+                         ["foo"])
+        self.assertEqual(context.get('active_tag').pk, tag.pk)
+
+        request = self.factory.get("/dummy/", {'tag': "bar"})
+        response = self.view(request)
+        self.assertIsNone(response.context_data.get('active_tag'))
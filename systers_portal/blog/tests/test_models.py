@@ -36,6 +36,18 @@ class NewsModelTestCase(TestCase):
                                    community=self.community)
         self.assertEqual(str(news), "Bar of Foo Community")
 
+    def test_excerpt(self):
+        """Test extracting the plain text excerpt of news on save"""
+        news = News.objects.create(
+            slug="foonews", title="Bar", author=self.systers_user,
+            content="<p>Hi <strong>there</strong> &amp; welcome!</p>",
+            community=self.community)
+        self.assertEqual(News.objects.get().excerpt, "Hi there & welcome!")
+        news.content = "<p>{0}</p>".format(" ".join(["word"] * 60))
+        news.save(update_fields=['content'])
+        self.assertEqual(News.objects.get().excerpt,
+                         " ".join(["word"] * 50) + "...")
+
 
 class ResourceModelTestCase(TestCase):
     def setUp(self):
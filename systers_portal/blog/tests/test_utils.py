@@ -0,0 +1,110 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from blog.models import News, Resource, ResourceType, Tag
+from blog.utils import (get_tag_counts, get_resource_type_counts,
+                        get_weight, TagCount)
+from community.models import Community
+from users.models import SystersUser
+
+
+class UtilsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+        self.other_community = Community.objects.create(
+            name="Bar", slug="bar", order=2, admin=self.systers_user)
+
+    def create_news(self, slug, community=None):
+        return News.objects.create(slug=slug, title="News", content="Content",
+                                   author=self.systers_user,
+                                   community=community or self.community)
+
+    def create_resource(self, slug, resource_type=None, community=None):
+        return Resource.objects.create(slug=slug, title="Resource",
+                                       content="Content",
+                                       author=self.systers_user,
+                                       community=community or self.community,
+                                       resource_type=resource_type)
+
+    def test_get_tag_counts(self):
+        """Test counting the posts of a community by tag"""
+        foo = Tag.objects.create(name="foo")
+        bar = Tag.objects.create(name="bar")
+        Tag.objects.create(name="baz")
+        self.create_news("news1").tags.add(foo, bar)
+        self.create_news("news2").tags.add(foo)
+        self.create_resource("resource").tags.add(foo)
+        self.create_news("news", community=self.other_community).tags.add(bar)
+        with self.assertNumQueries(1):
+            tag_counts = get_tag_counts(self.community)
+        self.assertEqual(tag_counts, [TagCount(bar.pk, "bar", 1, 0, 1),
+                                      TagCount(foo.pk, "foo", 2, 1, 5)])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_tag_counts(self.community), tag_counts)
+
+    def test_get_tag_counts_invalidation(self):
+        """Test that cached tag counts follow changes of posts and tags"""
+        tag = Tag.objects.create(name="foo")
+        news = self.create_news("news")
+        self.assertEqual(get_tag_counts(self.community), [])
+
+        news.tags.add(tag)
+        self.assertEqual(len(get_tag_counts(self.community)), 1)
+
+        resource = self.create_resource("resource")
+        tag.resource_set.add(resource)
+        self.assertEqual(get_tag_counts(self.community)[0].resources_count, 1)
+
+        tag.name = "bar"
+        tag.save()
+        self.assertEqual(get_tag_counts(self.community)[0].name, "bar")
+
+        tag.news_set.clear()
+        self.assertEqual(get_tag_counts(self.community)[0].news_count, 0)
+
+        resource.delete()
+        self.assertEqual(get_tag_counts(self.community), [])
+
+        news.tags.add(tag)
+        self.assertEqual(len(get_tag_counts(self.community)), 1)
+        tag.delete()
+        self.assertEqual(get_tag_counts(self.community), [])
+
+    def test_get_resource_type_counts(self):
+        """Test counting the resources of a community by type"""
+        foo = ResourceType.objects.create(name="foo")
+        bar = ResourceType.objects.create(name="bar")
+        self.create_resource("resource1", resource_type=foo)
+        self.create_resource("resource2", resource_type=foo)
+        self.create_resource("resource3")
+        self.create_resource("resource", resource_type=bar,
+                             community=self.other_community)
+        with self.assertNumQueries(1):
+            resource_type_counts = get_resource_type_counts(self.community)
+        self.assertEqual(resource_type_counts, [(foo.pk, "foo", 2)])
+        with self.assertNumQueries(0):
+            get_resource_type_counts(self.community)
+
+        resource = self.create_resource("resource4", resource_type=bar)
+        self.assertEqual(get_resource_type_counts(self.community),
+                         [(bar.pk, "bar", 1), (foo.pk, "foo", 2)])
+        bar.name = "baz"
+        bar.save()
+        self.assertEqual(get_resource_type_counts(self.community)[0].name,
+                         "baz")
+        resource.delete()
+        self.assertEqual(get_resource_type_counts(self.community),
+                         [(foo.pk, "foo", 2)])
+
+    def test_get_weight(self):
+        """Test the weights of tags in the tag cloud"""
+        self.assertEqual(get_weight(1, 1), 1)
+        self.assertEqual(get_weight(1, 10), 1)
+        self.assertEqual(get_weight(10, 10), 5)
+        self.assertEqual(get_weight(5, 10), 2)
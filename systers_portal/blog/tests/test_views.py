@@ -1,13 +1,50 @@
 from django.contrib.auth.models import User, Group
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 
 from blog.models import News, Resource, ResourceType, Tag
 from community.models import Community
 from users.models import SystersUser
 
 
-class CommunityNewsListViewTestCase(TestCase):
+# maximum number of queries to render a page of posts or a single post
+POST_QUERIES_BUDGET = 10
+
+
+class PostQueriesBudgetMixin(object):
+    """Mixin for test cases that check the number of queries to render posts
+    doesn't depend on the number of posts, authors or tags"""
+    def get_queries_count(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertQueriesBudget(self, url, populate):
+        """Assert that rendering a URL costs the same number of queries, within
+        budget, after each call to populate.
+
+        :param url: string URL of a page of posts or a single post
+        :param populate: callable adding posts, authors or tags, taking the
+                         number of the call as argument
+        """
+        self.get_queries_count(url)
+        queries_counts = []
+        for i in range(3):
+            populate(i)
+            queries_counts.append(self.get_queries_count(url))
+        self.assertEqual(len(set(queries_counts)), 1, queries_counts)
+        self.assertLessEqual(queries_counts[0], POST_QUERIES_BUDGET)
+
+    def create_author(self, i):
+        user = User.objects.create_user(username='author{0}'.format(i),
+                                        password='foobar')
+        return SystersUser.objects.get(user=user)
+
+
+class CommunityNewsListViewTestCase(PostQueriesBudgetMixin, TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
@@ -42,6 +79,39 @@ class CommunityNewsListViewTestCase(TestCase):
         self.assertContains(response, "Bar")
         self.assertContains(response, "Hi there!")
 
+    def test_community_news_list_view_tag(self):
+        """Test GET request to news list filtered by a tag"""
+        tag = Tag.objects.create(name="Django girls")
+        news = News.objects.create(slug="bar", title="Bar",
+                                   author=self.systers_user,
+                                   content="Hi there!",
+                                   community=self.community)
+        news.tags.add(tag)
+        News.objects.create(slug="baz", title="Baz",
+                            author=self.systers_user,
+                            content="Hello!", community=self.community)
+        url = reverse('view_community_news_list', kwargs={'slug': 'foo'})
+        response = self.client.get(url, {'tag': "Django girls"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['object_list']), [news])
+        self.assertEqual(response.context['active_tag'].pk, tag.pk)
+        self.assertContains(response, "?tag=Django%20girls")
+
+        response = self.client.get(url, {'tag': "Missing"})
+        self.assertEqual(len(response.context['object_list']), 2)
+
+    def test_community_news_list_view_queries(self):
+        """Test that a page of news costs a fixed number of queries"""
+        def create_news(i):
+            news = News.objects.create(slug="bar{0}".format(i), title="Bar",
+                                       author=self.create_author(i),
+                                       content="Hi there!",
+                                       community=self.community)
+            news.tags.add(Tag.objects.create(name="Tag{0}".format(i)),
+                          *Tag.objects.all())
+        url = reverse('view_community_news_list', kwargs={'slug': 'foo'})
+        self.assertQueriesBudget(url, create_news)
+
     def test_community_news_sidebar(self):
         """Test the presence or the lack of a news sidebar in the template"""
         url = reverse('view_community_news_list', kwargs={'slug': 'foo'})
@@ -67,7 +137,7 @@ class CommunityNewsListViewTestCase(TestCase):
         self.assertNotContains(response, "Add news")
 
 
-class CommunityNewsViewTestCase(TestCase):
+class CommunityNewsViewTestCase(PostQueriesBudgetMixin, TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
@@ -95,6 +165,17 @@ class CommunityNewsViewTestCase(TestCase):
         self.assertContains(response, "Bar")
         self.assertContains(response, "Hi there!")
 
+    def test_community_news_view_queries(self):
+        """Test that a single news costs a fixed number of queries"""
+        news = News.objects.create(slug="bar", title="Bar",
+                                   author=self.systers_user,
+                                   content="Hi there!",
+                                   community=self.community)
+        url = reverse('view_community_news',
+                      kwargs={'slug': 'foo', 'news_slug': 'bar'})
+        self.assertQueriesBudget(url, lambda i: news.tags.add(
+            Tag.objects.create(name="Tag{0}".format(i))))
+
     def test_multiple_communities_same_slug_news_view(self):
         """Test GET request to two news object with same slug, but belonging to
         two separate communities"""
@@ -279,7 +360,7 @@ class DeleteCommunityNewsViewTestCase(TestCase):
         self.assertSequenceEqual(News.objects.all(), [])
 
 
-class CommunityResourceListViewTestCase(TestCase):
+class CommunityResourceListViewTestCase(PostQueriesBudgetMixin, TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
@@ -336,6 +417,43 @@ class CommunityResourceListViewTestCase(TestCase):
         self.assertNotContains(response, "Bar")
         self.assertContains(response, "New")
 
+    def test_community_resource_list_view_tag(self):
+        """Test GET request to resource list filtered by a resource type and
+        a tag"""
+        tag = Tag.objects.create(name="tag")
+        resource_type = ResourceType.objects.create(name="abc")
+        resources = []
+        for i, resource_tag in enumerate([tag, tag, None]):
+            resource = Resource.objects.create(
+                slug="bar{0}".format(i), title="Bar",
+                author=self.systers_user, content="Hi there!",
+                community=self.community,
+                resource_type=resource_type if i else None)
+            if resource_tag:
+                resource.tags.add(resource_tag)
+            resources.append(resource)
+        url = reverse('view_community_resource_list', kwargs={'slug': 'foo'})
+        response = self.client.get(url, {'tag': "tag"})
+        self.assertCountEqual(response.context['object_list'],
+                              resources[:2])
+        response = self.client.get(url, {'tag': "tag", 'type': "abc"})
+        self.assertSequenceEqual(response.context['object_list'],
+                                 [resources[1]])
+
+    def test_community_resource_list_view_queries(self):
+        """Test that a page of resources costs a fixed number of queries"""
+        def create_resource(i):
+            resource_type = ResourceType.objects.create(
+                name="Type{0}".format(i))
+            resource = Resource.objects.create(
+                slug="bar{0}".format(i), title="Bar",
+                author=self.create_author(i), content="Hi there!",
+                community=self.community, resource_type=resource_type)
+            resource.tags.add(Tag.objects.create(name="Tag{0}".format(i)),
+                              *Tag.objects.all())
+        url = reverse('view_community_resource_list', kwargs={'slug': 'foo'})
+        self.assertQueriesBudget(url, create_resource)
+
     def test_community_resource_sidebar(self):
         """Test the presence or the lack of a resource sidebar in the
         template"""
@@ -363,7 +481,7 @@ class CommunityResourceListViewTestCase(TestCase):
         self.assertNotContains(response, "Add resource")
 
 
-class CommunityResourceViewTestCase(TestCase):
+class CommunityResourceViewTestCase(PostQueriesBudgetMixin, TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
@@ -391,6 +509,19 @@ class CommunityResourceViewTestCase(TestCase):
         self.assertContains(response, "Bar")
         self.assertContains(response, "Hi there!")
 
+    def test_community_resource_view_queries(self):
+        """Test that a single resource costs a fixed number of queries"""
+        resource_type = ResourceType.objects.create(name="Type")
+        resource = Resource.objects.create(slug="bar", title="Bar",
+                                           author=self.systers_user,
+                                           content="Hi there!",
+                                           community=self.community,
+                                           resource_type=resource_type)
+        url = reverse('view_community_resource',
+                      kwargs={'slug': 'foo', 'resource_slug': 'bar'})
+        self.assertQueriesBudget(url, lambda i: resource.tags.add(
+            Tag.objects.create(name="Tag{0}".format(i))))
+
     def test_multiple_communities_same_slug_resource_view(self):
         """Test GET request to two resource objects with same slug, but
         belonging to two separate communities"""
@@ -577,6 +708,65 @@ class DeleteCommunityResourceViewTestCase(TestCase):
         self.assertSequenceEqual(Resource.objects.all(), [])
 
 
+class CommunityTagListViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+
+    def test_community_tag_list_view(self):
+        """Test GET request to the tags of a community"""
+        url = reverse('view_community_tag_list', kwargs={'slug': 'bar'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+        url = reverse('view_community_tag_list', kwargs={'slug': 'foo'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'blog/tag_list.html')
+        self.assertContains(response, "No posts of this community")
+
+        news = News.objects.create(slug="bar", title="Bar",
+                                   author=self.systers_user,
+                                   content="Hi there!",
+                                   community=self.community)
+        news.tags.add(Tag.objects.create(name="baz"))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['active_page'], 'tags')
+        self.assertContains(response, "/community/foo/news/?tag=baz")
+        self.assertNotContains(response, "/community/foo/resources/?tag=baz")
+
+
+class CommunityResourceTypeListViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+
+    def test_community_resource_type_list_view(self):
+        """Test GET request to the resource types of a community"""
+        url = reverse('view_community_resource_type_list',
+                      kwargs={'slug': 'foo'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'blog/resource_type_list.html')
+        self.assertContains(response, "No resources of this community")
+
+        resource_type = ResourceType.objects.create(name="abc")
+        Resource.objects.create(slug="bar", title="Bar",
+                                author=self.systers_user, content="Hi!",
+                                community=self.community,
+                                resource_type=resource_type)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "/community/foo/resources/?type=abc")
+
+
 class AddTagViewTestCase(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='foo', password='foobar')
@@ -1,12 +1,14 @@
 from django.conf.urls import url
 
+from blog.feeds import LatestPostsFeed, LatestPostsAtomFeed
 from blog.views import (CommunityNewsListView, CommunityNewsView,
                         AddCommunityNewsView, EditCommunityNewsView,
                         DeleteCommunityNewsView, CommunityResourceListView,
                         CommunityResourceView, AddCommunityResourceView,
                         EditCommunityResourcesView,
                         DeleteCommunityResourceView, AddTagView,
-                        AddResourceTypeView)
+                        AddResourceTypeView, CommunityTagListView,
+                        CommunityResourceTypeListView)
 
 urlpatterns = [
     url(r'^(?P<slug>[\w-]+)/news/$', CommunityNewsListView.as_view(),
@@ -30,8 +32,17 @@ urlpatterns = [
         name="delete_community_resource"),
     url(r'^(?P<slug>[\w-]+)/resources/(?P<resource_slug>\w+)/$',
         CommunityResourceView.as_view(), name="view_community_resource"),
+    url(r'^(?P<slug>[\w-]+)/tags/$', CommunityTagListView.as_view(),
+        name="view_community_tag_list"),
     url(r'^(?P<slug>[\w-]+)/tag/add/$', AddTagView.as_view(),
         name="add_tag"),
+    url(r'^(?P<slug>[\w-]+)/resource_types/$',
+        CommunityResourceTypeListView.as_view(),
+        name="view_community_resource_type_list"),
     url(r'^(?P<slug>[\w-]+)/resource_type/add/$',
         AddResourceTypeView.as_view(), name="add_resource_type"),
+    url(r'^(?P<slug>[\w-]+)/feed/rss/$', LatestPostsFeed(),
+        name="community_rss_feed"),
+    url(r'^(?P<slug>[\w-]+)/feed/atom/$', LatestPostsAtomFeed(),
+        name="community_atom_feed"),
 ]
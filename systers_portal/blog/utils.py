@@ -0,0 +1,107 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+from blog.constants import (POSTS_COUNTS_VERSION_KEY, TAG_COUNTS_CACHE_KEY,
+                            RESOURCE_TYPE_COUNTS_CACHE_KEY, TAG_CLOUD_WEIGHTS)
+from blog.models import News, Resource, ResourceType, Tag
+from community.utils import get_cache_version, bump_cache_version
+
+
+TagCount = namedtuple('TagCount', ['pk', 'name', 'news_count',
+                                   'resources_count', 'weight'])
+
+ResourceTypeCount = namedtuple('ResourceTypeCount',
+                               ['pk', 'name', 'resources_count'])
+
+
+def get_weight(count, max_count):
+    """Get the weight of a tag in the tag cloud
+
+    :param count: integer number of posts with the tag
+    :param max_count: integer highest number of posts with a tag
+    :return: integer from 1 to TAG_CLOUD_WEIGHTS
+    """
+    if max_count <= 1:
+        return 1
+    return 1 + (count - 1) * (TAG_CLOUD_WEIGHTS - 1) // (max_count - 1)
+
+
+def get_tag_counts(community):
+    """Get a snapshot of the tags of the news and resources of a community,
+    used to render the tag cloud. The counts are computed by a single
+    GROUP BY query, kept in cache and computed again after a post of the
+    community or its tags changed, or once the cache timeout expires.
+
+    :param community: Community object
+    :return: list of TagCount tuples ordered by tag name, where weight ranges
+             from 1 to TAG_CLOUD_WEIGHTS according to the number of posts
+    """
+    version = get_cache_version(
+        POSTS_COUNTS_VERSION_KEY.format(community.pk))
+    cache_key = TAG_COUNTS_CACHE_KEY.format(community.pk)
+    tag_counts = cache.get(cache_key, version=version)
+    if tag_counts is None:
+        qn = connection.ops.quote_name
+        query = (
+            "SELECT t.id, t.name, COUNT(pt.news_id), COUNT(pt.resource_id) "
+            "FROM {0} t INNER JOIN ("
+            "SELECT nt.tag_id, nt.news_id, NULL::integer AS resource_id "
+            "FROM {1} nt INNER JOIN {2} n ON n.id = nt.news_id "
+            "WHERE n.community_id = %s "
+            "UNION ALL "
+            "SELECT rt.tag_id, NULL::integer, rt.resource_id "
+            "FROM {3} rt INNER JOIN {4} r ON r.id = rt.resource_id "
+            "WHERE r.community_id = %s"
+            ") pt ON pt.tag_id = t.id "
+            "GROUP BY t.id, t.name ORDER BY t.name"
+        ).format(qn(Tag._meta.db_table),
+                 qn(News.tags.through._meta.db_table),
+                 qn(News._meta.db_table),
+                 qn(Resource.tags.through._meta.db_table),
+                 qn(Resource._meta.db_table))
+        with connection.cursor() as cursor:
+            cursor.execute(query, [community.pk, community.pk])
+            rows = cursor.fetchall()
+        totals = [news + resources for _, _, news, resources in rows]
+        max_count = max(totals) if totals else 0
+        tag_counts = [
+            TagCount(pk, name, news, resources,
+                     get_weight(news + resources, max_count))
+            for pk, name, news, resources in rows]
+        cache.set(cache_key, tag_counts, version=version)
+    return tag_counts
+
+
+def get_resource_type_counts(community):
+    """Get a snapshot of the types of the resources of a community. The
+    counts are computed by a single GROUP BY query, kept in cache and
+    computed again after a resource of the community changed, or once the
+    cache timeout expires.
+
+    :param community: Community object
+    :return: list of ResourceTypeCount tuples ordered by resource type name
+    """
+    version = get_cache_version(
+        POSTS_COUNTS_VERSION_KEY.format(community.pk))
+    cache_key = RESOURCE_TYPE_COUNTS_CACHE_KEY.format(community.pk)
+    resource_type_counts = cache.get(cache_key, version=version)
+    if resource_type_counts is None:
+        rows = ResourceType.objects.filter(
+            resource__community=community).annotate(
+            resources_count=Count('resource')).order_by('name').values_list(
+            'pk', 'name', 'resources_count')
+        resource_type_counts = [ResourceTypeCount(*row) for row in rows]
+        cache.set(cache_key, resource_type_counts, version=version)
+    return resource_type_counts
+
+
+def invalidate_posts_counts(community_ids):
+    """Invalidate cached tag and resource type counts of communities
+
+    :param community_ids: iterable of integer Community primary keys
+    """
+    for community_id in set(community_ids):
+        bump_cache_version(POSTS_COUNTS_VERSION_KEY.format(community_id))
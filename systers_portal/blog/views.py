@@ -8,13 +8,14 @@ from braces.views import LoginRequiredMixin, PermissionRequiredMixin
 from common.mixins import UserDetailsMixin
 from community.mixins import CommunityMenuMixin
 from community.models import Community
+from community.utils import has_community_perm
 from blog.forms import (AddNewsForm, EditNewsForm, AddResourceForm,
                         EditResourceForm, TagForm, ResourceTypeForm)
-from blog.mixins import ResourceTypesMixin
+from blog.mixins import ResourceTypesMixin, TagsMixin
 from blog.models import News, Resource, ResourceType, Tag
 
 
-class CommunityNewsListView(UserDetailsMixin, CommunityMenuMixin,
+class CommunityNewsListView(UserDetailsMixin, CommunityMenuMixin, TagsMixin,
                             SingleObjectMixin, ListView):
     """List of Community news view"""
     template_name = "blog/post_list.html"
@@ -33,7 +34,13 @@ class CommunityNewsListView(UserDetailsMixin, CommunityMenuMixin,
         return context
 
     def get_queryset(self):
-        return News.objects.filter(community=self.object)
+        """Get the list of News objects filtered or not by their tag"""
+        news = News.objects.filter(community=self.object).with_related().\
+            defer('content')
+        tag = self.get_active_tag()
+        if tag is not None:
+            return news.filter(tags=tag.pk)
+        return news
 
     def get_community(self):
         """Overrides the method from CommunityMenuMixin to extract the current
@@ -56,7 +63,8 @@ class CommunityNewsView(UserDetailsMixin, CommunityMenuMixin, DetailView):
         context["community"] = self.object
 
         news_slug = self.kwargs['news_slug']
-        context['post'] = get_object_or_404(News, community=self.object,
+        context['post'] = get_object_or_404(News.objects.with_related(),
+                                            community=self.object,
                                             slug=news_slug)
         context["post_type"] = "news"
         return context
@@ -107,7 +115,8 @@ class AddCommunityNewsView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to add new community
         news. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("add_community_news", self.community)
+        return has_community_perm(request, "add_community_news",
+                                  self.community)
 
 
 class EditCommunityNewsView(LoginRequiredMixin, PermissionRequiredMixin,
@@ -137,7 +146,8 @@ class EditCommunityNewsView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to edit community
         news. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("change_community_news", self.community)
+        return has_community_perm(request, "change_community_news",
+                                  self.community)
 
 
 class DeleteCommunityNewsView(LoginRequiredMixin, PermissionRequiredMixin,
@@ -167,12 +177,13 @@ class DeleteCommunityNewsView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to delete community
         news. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("delete_community_news", self.community)
+        return has_community_perm(request, "delete_community_news",
+                                  self.community)
 
 
 class CommunityResourceListView(UserDetailsMixin, CommunityMenuMixin,
-                                ResourceTypesMixin, SingleObjectMixin,
-                                ListView):
+                                ResourceTypesMixin, TagsMixin,
+                                SingleObjectMixin, ListView):
     """List of Community resources view"""
     template_name = "blog/post_list.html"
     page_slug = 'resources'
@@ -193,14 +204,16 @@ class CommunityResourceListView(UserDetailsMixin, CommunityMenuMixin,
 
     def get_queryset(self):
         """Get the list of Resource objects filtered or not by their resource
-        type"""
-        type_query = self.request.GET.get("type", "")
-        if type_query:
-            resource_type = ResourceType.objects.filter(name=type_query)
-            if resource_type:
-                return Resource.objects.filter(community=self.object,
-                                               resource_type=resource_type[0])
-        return Resource.objects.filter(community=self.object)
+        type and their tag"""
+        resources = Resource.objects.filter(
+            community=self.object).with_related().defer('content')
+        resource_type = self.get_active_resource_type()
+        if resource_type is not None:
+            resources = resources.filter(resource_type=resource_type.pk)
+        tag = self.get_active_tag()
+        if tag is not None:
+            resources = resources.filter(tags=tag.pk)
+        return resources
 
     def get_community(self):
         """Overrides the method from CommunityMenuMixin to extract the current
@@ -224,7 +237,8 @@ class CommunityResourceView(UserDetailsMixin, CommunityMenuMixin, DetailView):
         context["community"] = self.object
 
         resource_slug = self.kwargs['resource_slug']
-        context["post"] = get_object_or_404(Resource, community=self.object,
+        context["post"] = get_object_or_404(Resource.objects.with_related(),
+                                            community=self.object,
                                             slug=resource_slug)
         context["post_type"] = "resource"
         return context
@@ -275,7 +289,8 @@ class AddCommunityResourceView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to add new community
         resource. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("add_community_resource", self.community)
+        return has_community_perm(request, "add_community_resource",
+                                  self.community)
 
 
 class EditCommunityResourcesView(LoginRequiredMixin, PermissionRequiredMixin,
@@ -306,8 +321,8 @@ class EditCommunityResourcesView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to edit community
         news. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("change_community_resource",
-                                     self.community)
+        return has_community_perm(request, "change_community_resource",
+                                  self.community)
 
 
 class DeleteCommunityResourceView(LoginRequiredMixin, PermissionRequiredMixin,
@@ -337,8 +352,8 @@ class DeleteCommunityResourceView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to delete community
         resource. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("delete_community_resource",
-                                     self.community)
+        return has_community_perm(request, "delete_community_resource",
+                                  self.community)
 
 
 class AddTagView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
@@ -388,3 +403,35 @@ class AddResourceTypeView(LoginRequiredMixin, PermissionRequiredMixin,
                                                  slug=self.kwargs['slug'])
         context['tag_type'] = "Resource Type"
         return context
+
+
+class CommunityTagListView(UserDetailsMixin, CommunityMenuMixin, TagsMixin,
+                           DetailView):
+    """Tags of the posts of a community view"""
+    template_name = "blog/tag_list.html"
+    model = Community
+    page_slug = 'tags'
+
+    def get_community(self):
+        """Overrides the method from CommunityMenuMixin to extract the current
+        community.
+
+        :return: Community object
+        """
+        return self.object
+
+
+class CommunityResourceTypeListView(UserDetailsMixin, CommunityMenuMixin,
+                                    ResourceTypesMixin, DetailView):
+    """Resource types of the resources of a community view"""
+    template_name = "blog/resource_type_list.html"
+    model = Community
+    page_slug = 'resources'
+
+    def get_community(self):
+        """Overrides the method from CommunityMenuMixin to extract the current
+        community.
+
+        :return: Community object
+        """
+        return self.object
@@ -0,0 +1,47 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import News, Resource
+from community.models import CommunityPage
+
+
+class Command(BaseCommand):
+    help = "Extract the excerpts of existing news, resources and community " \
+           "pages from their content, in batches."
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', dest='batch_size', type='int',
+                    default=500,
+                    help="Maximum number of posts updated in a batch."),
+    )
+
+    def handle(self, *args, **options):
+        for model in (News, Resource, CommunityPage):
+            updated = self.backfill(model, options['batch_size'])
+            self.stdout.write("Updated excerpts of {0} {1}.".format(
+                updated, model._meta.verbose_name_plural))
+
+    def backfill(self, model, batch_size):
+        """Update the excerpts of all objects of a post model. Objects are
+        read by primary key in batches, each updated in one transaction.
+
+        :param model: model class derived from Post
+        :param batch_size: maximum number of objects in a batch
+        :return: number of objects whose excerpt changed
+        """
+        updated = 0
+        last_pk = 0
+        posts = model.objects.only('pk', 'content', 'excerpt').order_by('pk')
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return updated
+            with transaction.atomic():
+                for post in batch:
+                    excerpt = post.get_excerpt()
+                    if excerpt != post.excerpt:
+                        model.objects.filter(pk=post.pk).update(
+                            excerpt=excerpt)
+                        updated += 1
+            last_pk = batch[-1].pk
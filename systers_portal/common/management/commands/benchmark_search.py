@@ -0,0 +1,123 @@
+import random
+import time
+from optparse import make_option
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+
+from blog.models import News
+from common.search import PostSearch
+from community.models import Community
+from users.models import SystersUser
+
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vi", "so", "de", "pa",
+             "shi", "gor", "len", "dra", "qui", "bel", "tor", "mun", "fas",
+             "zen"]
+
+
+class Command(BaseCommand):
+    help = "Measure the full-text search of posts over generated news. " \
+           "The news are created in a transaction that is rolled back, " \
+           "so the database is left unchanged."
+    args = "[<query> ...]"
+    option_list = BaseCommand.option_list + (
+        make_option('--posts', dest='posts', type='int', default=100000,
+                    help="Number of generated news."),
+        make_option('--repeat', dest='repeat', type='int', default=5,
+                    help="Number of runs of every query."),
+        make_option('--seed', dest='seed', type='int', default=0,
+                    help="Seed of the generated news."),
+    )
+
+    def handle(self, *queries, **options):
+        rand = random.Random(options['seed'])
+        vocabulary = self.get_vocabulary(rand)
+        if not queries:
+            # a frequent, an average and a rare word, and a phrase
+            queries = (vocabulary[0], vocabulary[100], vocabulary[1000],
+                       " ".join(vocabulary[10:12]))
+        with transaction.atomic():
+            community = self.create_news(options['posts'], vocabulary, rand)
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE {0}".format(
+                    connection.ops.quote_name(News._meta.db_table)))
+            self.stdout.write("Generated {0} news.".format(options['posts']))
+            for query in queries:
+                for scope in (None, community):
+                    self.benchmark(query, scope, options['repeat'])
+            transaction.set_rollback(True)
+
+    def get_vocabulary(self, rand, size=5000):
+        """Get distinct made-up words, used from the most to the least
+        frequent
+
+        :param rand: Random object
+        :param size: integer number of words
+        :return: list of strings
+        """
+        words = set()
+        while len(words) < size:
+            words.add("".join(rand.choice(SYLLABLES)
+                              for _ in range(rand.randint(2, 4))))
+        words = sorted(words)
+        rand.shuffle(words)
+        return words
+
+    def create_news(self, posts, vocabulary, rand, batch_size=1000):
+        """Create news with random titles and contents in a new community
+
+        :param posts: integer number of news
+        :param vocabulary: list of string words
+        :param rand: Random object
+        :param batch_size: integer number of news inserted at once
+        :return: Community object of the news
+        """
+        user = User.objects.create(username="search-benchmark")
+        systers_user = SystersUser.objects.get(user=user)
+        order = Community.objects.aggregate(Max('order'))['order__max']
+        community = Community.objects.create(
+            name="Search benchmark", slug="search-benchmark",
+            order=(order or 0) + 1, admin=systers_user)
+        communities = [community] + list(
+            Community.objects.exclude(pk=community.pk)[:9])
+
+        def text(words):
+            # skewed towards the beginning of the vocabulary
+            return " ".join(
+                vocabulary[min(int(rand.expovariate(0.01)),
+                               len(vocabulary) - 1)]
+                for _ in range(words))
+
+        for start in range(0, posts, batch_size):
+            News.objects.bulk_create([
+                News(slug="benchmark{0}".format(i), title=text(6),
+                     content="<p>{0}</p><p>{1}</p>".format(text(100),
+                                                           text(100)),
+                     author=systers_user,
+                     community=communities[i % len(communities)])
+                for i in range(start, min(start + batch_size, posts))])
+        return community
+
+    def benchmark(self, query, community, repeat):
+        """Run a search and print its fastest and median durations
+
+        :param query: string search query
+        :param community: Community object to search in, or None for all
+        :param repeat: integer number of runs
+        """
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            search = PostSearch(query, community=community)
+            count = search.count()
+            search[:10]
+            durations.append((time.perf_counter() - start) * 1000)
+        durations.sort()
+        self.stdout.write(
+            '"{0}" in {1}: {2} results, first page in {3:.1f} ms '
+            '(median {4:.1f} ms)'.format(
+                query, community or "all communities", count, durations[0],
+                durations[len(durations) // 2]))
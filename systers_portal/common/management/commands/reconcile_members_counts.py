@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from community.models import Community
+from meetup.models import MeetupLocation
+
+
+class Command(BaseCommand):
+    help = "Fix denormalized members counts of communities and meetup " \
+           "locations that drifted from the actual number of members."
+
+    def handle(self, *args, **options):
+        for model in (Community, MeetupLocation):
+            fixed = model.reconcile_members_count()
+            self.stdout.write("Fixed members count of {0} {1}.".format(
+                fixed, model._meta.verbose_name_plural))
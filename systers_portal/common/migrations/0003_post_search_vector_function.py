@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+# Kept in sync with common.search.SEARCH_CONFIG and with the vector expression
+# used to fill the existing rows in blog migration 0008_post_search_vector and
+# community migration 0015_communitypage_search_vector.
+CREATE_FUNCTION = """
+CREATE FUNCTION common_post_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english',
+                              coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english',
+                              coalesce(NEW.content, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+DROP_FUNCTION = "DROP FUNCTION common_post_search_vector_update()"
+
+
+def create_function(apps, schema_editor):
+    # RunSQL would split the function body on its semicolons.
+    schema_editor.execute(CREATE_FUNCTION)
+
+
+def drop_function(apps, schema_editor):
+    schema_editor.execute(DROP_FUNCTION)
+
+
+class Migration(migrations.Migration):
+    """Trigger function that computes the weighted full-text search vector
+    of a post, title over content. It is attached to the tables of the Post
+    models by their own migrations."""
+
+    dependencies = [
+        ('common', '0002_auto_20150420_1504'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_function, drop_function),
+    ]
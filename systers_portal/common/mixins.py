@@ -1,6 +1,7 @@
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.http import Http404
 
-from users.models import SystersUser
+from users.utils import get_membership
 
 
 class UserDetailsMixin(object):
@@ -16,10 +17,9 @@ class UserDetailsMixin(object):
         user = self.request.user
         if user.username:
             community = self.get_community()
-            systers_user = SystersUser.objects.get(user=user)
-            context['is_member'] = systers_user.is_member(community)
-            context['join_request'] = systers_user.get_last_join_request(
-                community)
+            membership = get_membership(self.request, community)
+            context['is_member'] = community.pk in membership.community_ids
+            context['join_request'] = membership.join_request
         return context
 
     def get_community(self):
@@ -35,3 +35,94 @@ class UserDetailsMixin(object):
                 .format(self.__class__.__name__)
             )
         return self.community
+
+
+class KeysetPaginationMixin(object):
+    """Mixin allows to paginate a ListView using keyset (seek) pagination.
+    Instead of an OFFSET, pages are selected by comparing the keyset field to
+    the last (or first) value of the current page, passed in the `after` (or
+    `before`) GET parameter. Hence every page costs the same regardless of its
+    depth. The following is added to the context:
+
+    * Objects of the current page as `object_list`
+    * Keyset values of the previous and next pages as `previous_key` and
+      `next_key`, or None if the page is the first or the last one
+
+    Prefix the keyset field with "-" to paginate in descending order.
+    """
+    keyset_field = None
+    keyset_page_size = 50
+
+    def get_context_data(self, **kwargs):
+        objects, previous_key, next_key = self.paginate_keyset(
+            kwargs.pop('object_list', self.object_list))
+        context = super(KeysetPaginationMixin, self).get_context_data(
+            object_list=objects, **kwargs)
+        context['previous_key'] = previous_key
+        context['next_key'] = next_key
+        context['is_paginated'] = previous_key is not None or \
+            next_key is not None
+        return context
+
+    def get_keyset_field(self):
+        """Get the name of the field used to order and paginate objects.
+
+        :return: string field name, which can span relationships
+        :raises ImproperlyConfigured: if keyset field is set to None
+        """
+        if self.keyset_field is None:
+            raise ImproperlyConfigured(
+                '{0} is missing a keyset_field property. Define '
+                '{0}.keyset_field or override {0}.get_keyset_field()'
+                .format(self.__class__.__name__)
+            )
+        return self.keyset_field
+
+    def get_keyset_value(self, obj):
+        """Get the keyset field value of an object.
+
+        :param obj: object from the paginated queryset
+        :return: keyset field value
+        """
+        for attribute in self.get_keyset_field().lstrip('-').split('__'):
+            obj = getattr(obj, attribute)
+        return obj
+
+    def paginate_keyset(self, queryset):
+        """Select a single page of objects from a queryset.
+
+        :param queryset: QuerySet of objects to paginate
+        :return: tuple (list of objects, previous page key, next page key)
+        :raises Http404: if the page key is not valid for the keyset field
+        """
+        order = self.get_keyset_field()
+        field = order.lstrip('-')
+        descending = order.startswith('-')
+        after_lookup = '__lt' if descending else '__gt'
+        before_lookup = '__gt' if descending else '__lt'
+        reverse_order = field if descending else '-' + field
+        size = self.keyset_page_size
+        before = self.request.GET.get('before')
+        after = self.request.GET.get('after')
+        try:
+            if before:
+                queryset = queryset.filter(
+                    **{field + before_lookup: before}).order_by(reverse_order)
+                objects = list(queryset[:size + 1])
+                has_previous, has_next = len(objects) > size, True
+                objects = objects[:size][::-1]
+            else:
+                queryset = queryset.order_by(order)
+                if after:
+                    queryset = queryset.filter(**{field + after_lookup: after})
+                objects = list(queryset[:size + 1])
+                has_previous, has_next = bool(after), len(objects) > size
+                objects = objects[:size]
+        except (ValueError, ValidationError):
+            raise Http404
+        if not objects:
+            return objects, None, None
+        previous_key = self.get_keyset_value(objects[0]) \
+            if has_previous else None
+        next_key = self.get_keyset_value(objects[-1]) if has_next else None
+        return objects, previous_key, next_key
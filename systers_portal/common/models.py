@@ -1,6 +1,11 @@
+from html import unescape
+
 from django.db import models
+from django.db.models import Count, F
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
 from ckeditor.fields import RichTextField
 
 from users.models import SystersUser
@@ -18,10 +23,109 @@ class Post(models.Model):
                                      verbose_name="Date last modified")
     author = models.ForeignKey(SystersUser, verbose_name="Author")
     content = RichTextField(verbose_name="Content")
+    excerpt = models.TextField(blank=True, editable=False,
+                               verbose_name="Excerpt")
+
+    excerpt_words = 50
 
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        """Extract the excerpt from the content before saving"""
+        self.excerpt = self.get_excerpt()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['excerpt']
+        super(Post, self).save(*args, **kwargs)
+
+    def get_excerpt(self):
+        """Get the beginning of the content as plain text
+
+        :return: string content stripped of HTML and limited to excerpt_words
+                 words
+        """
+        text = unescape(strip_tags(self.content))
+        return Truncator(text).words(self.excerpt_words)
+
+
+class MembersCountMixin(object):
+    """Mixin for models with a `members` relation to SystersUser and a
+    denormalized `members_count` column. The column is maintained with atomic
+    F() updates when members are added or removed, see
+    update_members_count(), and is never written when an existing object is
+    saved, so that a stale in-memory count can't overwrite it.
+    """
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert') and \
+                kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'members_count']
+        super(MembersCountMixin, self).save(*args, **kwargs)
+
+    @classmethod
+    def update_members_count(cls, instance, action, reverse, pk_set,
+                             **kwargs):
+        """Update members count according to a change of members, to be
+        connected to the m2m_changed signal of the members relation.
+
+        :param instance: object whose members changed, or SystersUser object
+                         whose memberships changed if reverse is True
+        :param action: string type of the change
+        :param reverse: True if the change was made from the SystersUser side
+        :param pk_set: set of added or removed primary keys
+        """
+        field = cls._meta.get_field('members')
+        memberships = field.rel.through.objects
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        if reverse:
+            objects = cls.objects.filter(pk__in=pk_set or [])
+            if action == 'post_add':
+                delta = 1
+            elif action == 'pre_remove':
+                objects = objects.filter(members=instance)
+                delta = -1
+            elif action == 'pre_clear':
+                objects = cls.objects.filter(members=instance)
+                delta = -1
+            else:
+                return
+            objects.update(members_count=F('members_count') + delta)
+            return
+
+        objects = cls.objects.filter(pk=instance.pk)
+        if action == 'post_add':
+            delta = len(pk_set)
+        elif action == 'pre_remove':
+            delta = -memberships.filter(**{
+                source: instance.pk, target + '__in': pk_set}).count()
+        elif action == 'post_clear':
+            objects.update(members_count=0)
+            instance.members_count = 0
+            return
+        else:
+            return
+        if delta:
+            objects.update(members_count=F('members_count') + delta)
+            instance.members_count += delta
+
+    @classmethod
+    def reconcile_members_count(cls):
+        """Fix members counts that drifted from the actual number of members.
+
+        :return: number of fixed objects
+        """
+        rows = cls.objects.annotate(actual_count=Count('members')).\
+            values_list('pk', 'members_count', 'actual_count')
+        fixed = 0
+        for pk, members_count, actual_count in rows:
+            if members_count != actual_count:
+                cls.objects.filter(pk=pk).update(members_count=actual_count)
+                fixed += 1
+        return fixed
+
 
 class Comment(models.Model):
     """Model to represent a comment to a generic model.
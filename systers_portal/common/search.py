@@ -0,0 +1,165 @@
+from collections import namedtuple
+from html import unescape
+
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from blog.models import News, Resource
+from community.models import Community, CommunityPage
+
+
+# Text search configuration of the search vectors, kept in sync with the
+# trigger function of common/migrations/0003_post_search_vector_function.py
+SEARCH_CONFIG = 'pg_catalog.english'
+
+# Private use characters delimiting the query terms in headlines, replaced by
+# HTML tags once the rest of the headline is escaped.
+HEADLINE_START = '\ue000'
+HEADLINE_STOP = '\ue001'
+HEADLINE_OPTIONS = ('StartSel="{0}", StopSel="{1}", MinWords=15, '
+                    'MaxWords=35, MaxFragments=2, FragmentDelimiter=" ... "'
+                    ).format(HEADLINE_START, HEADLINE_STOP)
+
+SearchSource = namedtuple('SearchSource',
+                          ['post_type', 'model', 'url_name', 'slug_kwarg'])
+
+SearchResult = namedtuple('SearchResult',
+                          ['post_type', 'title', 'url', 'community_name',
+                           'community_slug', 'headline', 'rank'])
+
+
+def highlight(headline):
+    """Turn a headline computed by PostgreSQL into HTML with the query terms
+    wrapped in mark tags.
+
+    :param headline: string headline delimited with HEADLINE_START and
+                     HEADLINE_STOP, which may contain HTML entities
+    :return: safe string HTML
+    """
+    html = escape(unescape(headline))
+    html = html.replace(HEADLINE_START, '<mark>')
+    return mark_safe(html.replace(HEADLINE_STOP, '</mark>'))
+
+
+class PostSearch(object):
+    """Ranked full-text search over news, resources and community pages,
+    optionally limited to a community. Titles weigh more than contents.
+
+    The object behaves like a sequence of SearchResult tuples and can be
+    paginated with Paginator: the count and every slice take one query each,
+    and headlines are only computed for the posts of the slice.
+    """
+    sources = (
+        SearchSource('news', News, 'view_community_news', 'news_slug'),
+        SearchSource('resource', Resource, 'view_community_resource',
+                     'resource_slug'),
+        SearchSource('page', CommunityPage, 'view_community_page',
+                     'page_slug'),
+    )
+
+    def __init__(self, query, community=None):
+        self.query = query.strip()
+        self.community = community
+        self._count = None
+
+    def get_matches_sql(self, columns):
+        """Get the SQL selecting the posts of all sources that match the
+        query, each row starting with the type of the post.
+
+        :param columns: string SQL columns of the post table `p` to select,
+                        which can use the `q` tsquery
+        :return: tuple of string SQL and list of params
+        """
+        qn = connection.ops.quote_name
+        selects = []
+        params = []
+        for source in self.sources:
+            sql = ("SELECT %s AS post_type, {0} FROM {1} p, "
+                   "plainto_tsquery(%s, %s) q WHERE p.search_vector @@ q"
+                   ).format(columns, qn(source.model._meta.db_table))
+            params.extend([source.post_type, SEARCH_CONFIG, self.query])
+            if self.community is not None:
+                sql += " AND p.community_id = %s"
+                params.append(self.community.pk)
+            selects.append(sql)
+        return " UNION ALL ".join(selects), params
+
+    def count(self):
+        """Get the number of posts matching the query
+
+        :return: integer count
+        """
+        if self._count is None:
+            if not self.query:
+                self._count = 0
+            else:
+                sql, params = self.get_matches_sql("p.id")
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM ({0}) matches".format(sql),
+                        params)
+                    self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        stop = self.count() if key.stop is None else key.stop
+        if key.step is not None or start < 0 or stop < 0:
+            raise ValueError("Only positive slices are supported.")
+        return self.fetch(start, stop - start)
+
+    def fetch(self, offset, limit):
+        """Get the matching posts in the order of their rank
+
+        :param offset: integer number of posts to skip
+        :param limit: integer maximum number of posts
+        :return: list of SearchResult tuples
+        """
+        if not self.query or limit <= 0:
+            return []
+        qn = connection.ops.quote_name
+        contents = []
+        params = [SEARCH_CONFIG]
+        for source in self.sources:
+            contents.append(
+                "WHEN %s THEN (SELECT content FROM {0} WHERE id = r.id)"
+                .format(qn(source.model._meta.db_table)))
+            params.append(source.post_type)
+        params.extend([SEARCH_CONFIG, self.query, HEADLINE_OPTIONS])
+        matches, matches_params = self.get_matches_sql(
+            "p.id, p.title, p.slug, p.community_id, "
+            "ts_rank(p.search_vector, q) AS rank")
+        params.extend(matches_params)
+        params.extend([limit, offset])
+        query = (
+            "SELECT r.post_type, r.title, r.slug, c.name, c.slug, r.rank, "
+            "ts_headline(%s, regexp_replace(CASE r.post_type {0} END, "
+            "'<[^>]*>', ' ', 'g'), plainto_tsquery(%s, %s), %s) "
+            "FROM ({1} ORDER BY rank DESC, post_type, id LIMIT %s OFFSET %s) "
+            "r INNER JOIN {2} c ON c.id = r.community_id "
+            "ORDER BY r.rank DESC, r.post_type, r.id"
+        ).format(" ".join(contents), matches,
+                 qn(Community._meta.db_table))
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        sources = {source.post_type: source for source in self.sources}
+        results = []
+        for (post_type, title, slug, community_name, community_slug, rank,
+             headline) in rows:
+            source = sources[post_type]
+            url = reverse(source.url_name,
+                          kwargs={'slug': community_slug,
+                                  source.slug_kwarg: slug})
+            results.append(SearchResult(post_type, title, url, community_name,
+                                        community_slug, highlight(headline),
+                                        rank))
+        return results
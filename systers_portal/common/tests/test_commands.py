@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from blog.models import News
+from community.models import Community, CommunityPage
+from users.models import SystersUser
+
+
+class ReconcileMembersCountsCommandTestCase(TestCase):
+    def test_reconcile_members_counts(self):
+        """Test fixing members counts with the management command"""
+        User.objects.create(username='foo', password='foobar')
+        systers_user = SystersUser.objects.get()
+        community = Community.objects.create(name="Foo", slug="foo", order=1,
+                                             admin=systers_user)
+        Community.objects.update(members_count=5)
+        out = StringIO()
+        call_command('reconcile_members_counts', stdout=out)
+        self.assertIn("Fixed members count of 1 communities.",
+                      out.getvalue())
+        self.assertEqual(Community.objects.get().members_count,
+                         community.members.count())
+
+
+class BackfillExcerptsCommandTestCase(TestCase):
+    def test_backfill_excerpts(self):
+        """Test extracting excerpts of existing posts with the management
+        command"""
+        User.objects.create(username='foo', password='foobar')
+        systers_user = SystersUser.objects.get()
+        community = Community.objects.create(name="Foo", slug="foo", order=1,
+                                             admin=systers_user)
+        for i in range(3):
+            News.objects.create(slug="news{0}".format(i), title="News",
+                                author=systers_user, community=community,
+                                content="<p>News {0}</p>".format(i))
+        CommunityPage.objects.create(slug="page", title="Page", order=1,
+                                     author=systers_user, community=community,
+                                     content="<h1>Page</h1>")
+        News.objects.update(excerpt="")
+        CommunityPage.objects.update(excerpt="")
+        out = StringIO()
+        call_command('backfill_excerpts', batch_size=2, stdout=out)
+        self.assertIn("Updated excerpts of 3 News.", out.getvalue())
+        self.assertIn("Updated excerpts of 0 resources.", out.getvalue())
+        self.assertEqual(
+            list(News.objects.order_by('pk').values_list('excerpt',
+                                                         flat=True)),
+            ["News 0", "News 1", "News 2"])
+        self.assertEqual(CommunityPage.objects.get().excerpt, "Page")
+
+
+class BenchmarkSearchCommandTestCase(TestCase):
+    def test_benchmark_search(self):
+        """Test measuring the search over generated news without keeping
+        them"""
+        out = StringIO()
+        call_command('benchmark_search', 'lomi', posts=30, repeat=1,
+                     stdout=out)
+        self.assertIn("Generated 30 news.", out.getvalue())
+        self.assertIn('"lomi" in all communities:', out.getvalue())
+        self.assertIn('"lomi" in Search benchmark:', out.getvalue())
+        self.assertEqual(News.objects.count(), 0)
+        self.assertEqual(Community.objects.count(), 0)
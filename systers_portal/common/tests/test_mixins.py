@@ -1,10 +1,11 @@
 from django.contrib.auth.models import User, AnonymousUser
 from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase, RequestFactory
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, ListView
 
-from common.mixins import UserDetailsMixin
+from common.mixins import UserDetailsMixin, KeysetPaginationMixin
 from community.models import Community
+from membership.models import JoinRequest
 from users.models import SystersUser
 
 
@@ -53,3 +54,102 @@ class UserDetailsMixinTestCase(TestCase):
         context = response.context_data
         self.assertTrue(context.get('is_member'))
         self.assertEqual(context.get('join_request'), None)
+
+    def test_get_context_data_join_request(self):
+        """Test mixin for a user that requested to join the community"""
+        class DummyView(UserDetailsMixin, TemplateView):
+            template_name = "dummy"
+            community = Community.objects.get()
+
+        user = User.objects.create_user(username='bar', password='foobar')
+        systers_user = SystersUser.objects.get(user=user)
+        JoinRequest.objects.create(user=systers_user, community=self.community,
+                                   is_approved=True)
+        join_request = JoinRequest.objects.create(user=systers_user,
+                                                  community=self.community)
+        request = self.factory.get('/dummy/')
+        request.user = user
+        view = DummyView.as_view()
+        with self.assertNumQueries(1):
+            response = view(request)
+        context = response.context_data
+        self.assertFalse(context.get('is_member'))
+        self.assertEqual(context.get('join_request'), join_request)
+        self.assertFalse(context.get('join_request').is_approved)
+
+
+class KeysetPaginationMixinTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        for username in ['foo', 'bar', 'baz', 'qux', 'quux']:
+            User.objects.create_user(username=username, password='foobar')
+
+    def get_context(self, order='user__username', **params):
+        class DummyView(KeysetPaginationMixin, ListView):
+            template_name = "dummy"
+            keyset_field = order
+            keyset_page_size = 2
+            queryset = SystersUser.objects.select_related('user')
+
+        request = self.factory.get('/dummy/', params)
+        response = DummyView.as_view()(request)
+        return response.context_data
+
+    def get_usernames(self, context):
+        return [systers_user.user.username
+                for systers_user in context['object_list']]
+
+    def test_get_context_data_first_page(self):
+        """Test mixin on the first page"""
+        context = self.get_context()
+        self.assertEqual(self.get_usernames(context), ['bar', 'baz'])
+        self.assertIsNone(context['previous_key'])
+        self.assertEqual(context['next_key'], 'baz')
+        self.assertTrue(context['is_paginated'])
+
+    def test_get_context_data_after(self):
+        """Test mixin on the next pages"""
+        context = self.get_context(after='baz')
+        self.assertEqual(self.get_usernames(context), ['foo', 'quux'])
+        self.assertEqual(context['previous_key'], 'foo')
+        self.assertEqual(context['next_key'], 'quux')
+        context = self.get_context(after='quux')
+        self.assertEqual(self.get_usernames(context), ['qux'])
+        self.assertEqual(context['previous_key'], 'qux')
+        self.assertIsNone(context['next_key'])
+
+    def test_get_context_data_before(self):
+        """Test mixin on the previous pages"""
+        context = self.get_context(before='qux')
+        self.assertEqual(self.get_usernames(context), ['foo', 'quux'])
+        self.assertEqual(context['previous_key'], 'foo')
+        self.assertEqual(context['next_key'], 'quux')
+        context = self.get_context(before='foo')
+        self.assertEqual(self.get_usernames(context), ['bar', 'baz'])
+        self.assertIsNone(context['previous_key'])
+        self.assertEqual(context['next_key'], 'baz')
+
+    def test_get_context_data_descending(self):
+        """Test mixin with keyset field in descending order"""
+        order = '-user__username'
+        context = self.get_context(order)
+        self.assertEqual(self.get_usernames(context), ['qux', 'quux'])
+        self.assertIsNone(context['previous_key'])
+        self.assertEqual(context['next_key'], 'quux')
+        context = self.get_context(order, after='quux')
+        self.assertEqual(self.get_usernames(context), ['foo', 'baz'])
+        self.assertEqual(context['previous_key'], 'foo')
+        self.assertEqual(context['next_key'], 'baz')
+        context = self.get_context(order, before='foo')
+        self.assertEqual(self.get_usernames(context), ['qux', 'quux'])
+        self.assertIsNone(context['previous_key'])
+        self.assertEqual(context['next_key'], 'quux')
+
+    def test_get_context_data_no_keyset_field(self):
+        """Test mixin with no keyset field set"""
+        class DummyView(KeysetPaginationMixin, ListView):
+            template_name = "dummy"
+            model = SystersUser
+
+        request = self.factory.get('/dummy/')
+        self.assertRaises(ImproperlyConfigured, DummyView.as_view(), request)
@@ -28,3 +28,57 @@ class CommentModelTestCase(TestCase):
                                          content_type=related_object_type)
         self.assertEqual(str(comment),
                          "Comment by foo to Bar of Foo Community")
+
+
+class MembersCountMixinTestCase(TestCase):
+    def setUp(self):
+        self.users = []
+        for username in ['foo', 'bar', 'baz']:
+            user = User.objects.create(username=username, password='foobar')
+            self.users.append(SystersUser.objects.get(user=user))
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.users[0])
+        self.community.members.clear()
+
+    def assertMembersCount(self, count):
+        community = Community.objects.get(pk=self.community.pk)
+        self.assertEqual(community.members_count, count)
+        self.assertEqual(community.members.count(), count)
+
+    def test_update_members_count(self):
+        """Test that members count follows changes of members"""
+        self.assertMembersCount(0)
+        self.community.add_member(self.users[0])
+        self.community.members.add(*self.users)
+        self.assertMembersCount(3)
+        self.assertEqual(self.community.members_count, 3)
+        self.community.remove_member(self.users[0])
+        self.community.remove_member(self.users[0])
+        self.assertMembersCount(2)
+        self.users[1].communities.remove(self.community)
+        self.assertMembersCount(1)
+        self.users[0].communities.add(self.community)
+        self.assertMembersCount(2)
+        self.users[0].communities.clear()
+        self.assertMembersCount(1)
+        self.community.members.clear()
+        self.assertMembersCount(0)
+
+    def test_save_keeps_members_count(self):
+        """Test that saving a stale object doesn't overwrite members count"""
+        stale_community = Community.objects.get(pk=self.community.pk)
+        self.community.members.add(*self.users)
+        stale_community.name = "Bar"
+        stale_community.save()
+        community = Community.objects.get(pk=self.community.pk)
+        self.assertEqual(community.name, "Bar")
+        self.assertEqual(community.members_count, 3)
+
+    def test_reconcile_members_count(self):
+        """Test fixing members count that drifted"""
+        self.community.members.add(*self.users)
+        Community.objects.filter(pk=self.community.pk).update(members_count=7)
+        self.assertEqual(Community.reconcile_members_count(), 1)
+        self.assertMembersCount(3)
+        self.assertEqual(Community.reconcile_members_count(), 0)
@@ -0,0 +1,112 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from blog.models import News, Resource
+from common.search import (PostSearch, highlight, HEADLINE_START,
+                           HEADLINE_STOP)
+from community.models import Community, CommunityPage
+from users.models import SystersUser
+
+
+class PostSearchTestCase(TestCase):
+    def setUp(self):
+        User.objects.create(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+        self.other_community = Community.objects.create(
+            name="Bar", slug="bar", order=2, admin=self.systers_user)
+
+    def create_news(self, slug, title, content, community=None):
+        return News.objects.create(slug=slug, title=title, content=content,
+                                   author=self.systers_user,
+                                   community=community or self.community)
+
+    def test_search_ranking(self):
+        """Test that posts matching the query in the title rank first"""
+        self.create_news("content", "Meeting", "<p>Python workshops</p>")
+        self.create_news("title", "Python workshop", "<p>Meeting</p>")
+        self.create_news("other", "Other", "<p>Nothing to see</p>")
+        search = PostSearch("workshop")
+        self.assertEqual(search.count(), 2)
+        results = search[:10]
+        self.assertEqual([result.title for result in results],
+                         ["Python workshop", "Meeting"])
+        self.assertEqual(results[1].url, "/community/foo/news/content/")
+        self.assertEqual(results[1].community_name, "Foo")
+
+    def test_search_sources(self):
+        """Test searching news, resources and community pages"""
+        self.create_news("news", "Mentorship news", "<p>Content</p>")
+        Resource.objects.create(slug="resource", title="Mentorship guide",
+                                content="<p>Content</p>",
+                                author=self.systers_user,
+                                community=self.community)
+        CommunityPage.objects.create(slug="page", title="Mentorship", order=1,
+                                     content="<p>Content</p>",
+                                     author=self.systers_user,
+                                     community=self.community)
+        results = PostSearch("mentorship")[:10]
+        self.assertCountEqual([result.post_type for result in results],
+                              ["news", "resource", "page"])
+        self.assertCountEqual(
+            [result.url for result in results],
+            ["/community/foo/news/news/", "/community/foo/resources/resource/",
+             "/community/foo/p/page/"])
+
+    def test_search_community(self):
+        """Test limiting the search to a community"""
+        self.create_news("foo", "Hackathon", "<p>Foo</p>")
+        self.create_news("bar", "Hackathon", "<p>Bar</p>",
+                         community=self.other_community)
+        self.assertEqual(PostSearch("hackathon").count(), 2)
+        search = PostSearch("hackathon", community=self.other_community)
+        self.assertEqual(search.count(), 1)
+        self.assertEqual(search[0].community_slug, "bar")
+
+    def test_search_vector_update(self):
+        """Test that the search vector follows changes of the posts"""
+        news = self.create_news("news", "Title", "<p>Conference</p>")
+        self.assertEqual(PostSearch("conference").count(), 1)
+        news.content = "<p>Workshop</p>"
+        news.save()
+        self.assertEqual(PostSearch("conference").count(), 0)
+        News.objects.filter(pk=news.pk).update(title="Conference")
+        self.assertEqual(PostSearch("conference").count(), 1)
+
+    def test_search_pagination(self):
+        """Test slicing the search results"""
+        for i in range(5):
+            self.create_news("news{0}".format(i), "Meetup {0}".format(i),
+                             "<p>Meetup</p>")
+        search = PostSearch("meetup")
+        self.assertEqual(len(search), 5)
+        with self.assertNumQueries(1):
+            page = search[2:4]
+        self.assertEqual(len(page), 2)
+        self.assertEqual(len(search[4:10]), 1)
+        self.assertEqual(search[10:20], [])
+
+    def test_search_empty_query(self):
+        """Test that an empty query matches no posts without querying"""
+        self.create_news("news", "Title", "<p>Content</p>")
+        with self.assertNumQueries(0):
+            self.assertEqual(PostSearch("  ").count(), 0)
+            self.assertEqual(PostSearch("").fetch(0, 10), [])
+
+    def test_search_headline(self):
+        """Test that the snippets highlight the query terms"""
+        self.create_news("news", "Title",
+                         "<p>Learn <b>Django</b> &amp; Python</p>")
+        result = PostSearch("django")[0]
+        self.assertIn("<mark>Django</mark>", result.headline)
+        self.assertIn("&amp; Python", result.headline)
+        self.assertNotIn("<b>", result.headline)
+
+    def test_highlight(self):
+        """Test turning a headline into safe HTML"""
+        headline = "<i>a</i> &amp; {0}b{1}".format(HEADLINE_START,
+                                                   HEADLINE_STOP)
+        self.assertEqual(highlight(headline),
+                         "&lt;i&gt;a&lt;/i&gt; &amp; <mark>b</mark>")
@@ -1,6 +1,11 @@
+from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django.test import TestCase, Client
 
+from blog.models import News
+from community.models import Community
+from users.models import SystersUser
+
 
 class CommonViewsTestCase(TestCase):
     def setUp(self):
@@ -26,3 +31,55 @@ class CommonViewsTestCase(TestCase):
         response = self.client.get(about_us_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'common/about_us.html')
+
+    def test_search_page(self):
+        """Test searching posts of all communities"""
+        User.objects.create(username='foo', password='foobar')
+        systers_user = SystersUser.objects.get()
+        for i, slug in enumerate(["foo", "bar"]):
+            community = Community.objects.create(name=slug, slug=slug,
+                                                 order=i, admin=systers_user)
+            News.objects.create(slug="news", title="Summit", content="Text",
+                                author=systers_user, community=community)
+        url = reverse('search')
+        response = self.client.get(url, {'q': "summit"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'common/search.html')
+        self.assertEqual(response.context['query'], "summit")
+        self.assertEqual(len(response.context['object_list']), 2)
+        self.assertContains(response, "/community/bar/news/news/")
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['object_list']), [])
+
+    def test_community_search_page(self):
+        """Test searching posts of a community"""
+        User.objects.create(username='foo', password='foobar')
+        systers_user = SystersUser.objects.get()
+        community = Community.objects.create(name="Foo", slug="foo", order=1,
+                                             admin=systers_user)
+        other_community = Community.objects.create(
+            name="Bar", slug="bar", order=2, admin=systers_user)
+        for i in range(12):
+            News.objects.create(slug="news{0}".format(i), title="Summit",
+                                content="Text", author=systers_user,
+                                community=community)
+        News.objects.create(slug="news", title="Summit", content="Text",
+                            author=systers_user, community=other_community)
+        url = reverse('search_community', kwargs={'slug': 'foo'})
+        response = self.client.get(url, {'q': "summit"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'common/community_search.html')
+        self.assertEqual(response.context['community'], community)
+        self.assertEqual(response.context['active_page'], 'search')
+        self.assertEqual(response.context['paginator'].count, 12)
+        self.assertEqual(len(response.context['object_list']), 10)
+        self.assertContains(response, "?q=summit&amp;page=2")
+
+        response = self.client.get(url, {'q': "summit", 'page': 2})
+        self.assertEqual(len(response.context['object_list']), 2)
+
+        url = reverse('search_community', kwargs={'slug': 'baz'})
+        response = self.client.get(url, {'q': "summit"})
+        self.assertEqual(response.status_code, 404)
@@ -1,4 +1,10 @@
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, ListView
+from django.views.generic.detail import SingleObjectMixin
+
+from common.mixins import UserDetailsMixin
+from common.search import PostSearch
+from community.mixins import CommunityMenuMixin
+from community.models import Community
 
 
 class IndexView(TemplateView):
@@ -15,3 +21,50 @@ class AboutUsView(TemplateView):
 
 class NewCommunityProposalView(TemplateView):
     template_name = "common/new_community_proposal.html"
+
+
+class SearchView(ListView):
+    """Search news, resources and community pages of all communities"""
+    template_name = "common/search.html"
+    paginate_by = 10
+
+    def get_context_data(self, **kwargs):
+        """Add the search query to the context"""
+        context = super(SearchView, self).get_context_data(**kwargs)
+        context['query'] = self.get_query()
+        return context
+
+    def get_query(self):
+        """Get the search query from the `q` GET parameter"""
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return PostSearch(self.get_query())
+
+
+class CommunitySearchView(UserDetailsMixin, CommunityMenuMixin,
+                          SingleObjectMixin, SearchView):
+    """Search news, resources and pages of a community"""
+    template_name = "common/community_search.html"
+    page_slug = 'search'
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object(queryset=Community.objects.all())
+        return super(CommunitySearchView, self).get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        """Add Community object to the context"""
+        context = super(CommunitySearchView, self).get_context_data(**kwargs)
+        context['community'] = self.object
+        return context
+
+    def get_queryset(self):
+        return PostSearch(self.get_query(), community=self.object)
+
+    def get_community(self):
+        """Overrides the method from CommunityMenuMixin to extract the current
+        community.
+
+        :return: Community object
+        """
+        return self.object
@@ -4,5 +4,17 @@ CONTENT_MANAGER = "{0}: Content Manager"
 USER_CONTENT_MANAGER = "{0}: User and Content Manager"
 COMMUNITY_ADMIN = "{0}: Community Admin"
 
+# user group roles
+CONTENT_CONTRIBUTOR_ROLE = "content_contributor"
+CONTENT_MANAGER_ROLE = "content_manager"
+USER_CONTENT_MANAGER_ROLE = "user_content_manager"
+COMMUNITY_ADMIN_ROLE = "community_admin"
+
 # community
 DEFAULT_COMMUNITY_ACTIVE_PAGE = 'news'
+
+# cache
+COMMUNITIES_NAVBAR_CACHE_KEY = "community:navbar"
+COMMUNITIES_NAVBAR_VERSION_KEY = "community:navbar:version"
+COMMUNITY_PAGES_CACHE_KEY = "community:{0}:pages"
+COMMUNITY_PAGES_VERSION_KEY = "community:{0}:pages:version"
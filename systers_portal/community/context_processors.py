@@ -1,9 +1,10 @@
-from community.models import Community
+from community.utils import get_navbar_communities
 
 
 def communities_processor(request):
     """Custom template context preprocessor that allows to inject into every
     request the list of all communities. This is necessary in order to display
-    the list of communities in the navigation bar."""
-    communities = Community.objects.all().order_by("order")
+    the list of communities in the navigation bar. The list is served from
+    cache and costs no queries once the cache is warm."""
+    communities = get_navbar_communities()
     return {'communities': communities}
@@ -1,11 +1,13 @@
 from django import forms
-from django.contrib.auth.models import Group
+from django.db import transaction
 
 from common.forms import ModelFormWithHelper
 from common.helpers import SubmitCancelFormHelper
-from community.constants import COMMUNITY_ADMIN
+from community.constants import COMMUNITY_ADMIN_ROLE
 from community.models import Community, CommunityPage
 from community.utils import get_groups
+from membership.constants import GROUP_JOINED, GROUP_LEFT
+from membership.models import MembershipEvent
 from users.models import SystersUser
 
 
@@ -64,15 +66,13 @@ class PermissionGroupsForm(forms.Form):
     """Form to manage (select/deselect) user permission groups"""
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop('user')
-        community = kwargs.pop('community')
+        self.actor = kwargs.pop('actor', None)
+        self.community = community = kwargs.pop('community')
         super(PermissionGroupsForm, self).__init__(*args, **kwargs)
 
-        # get all community groups and remove community admin group
-        # from the list of choices
-        self.groups = list(get_groups(community.name))
-        admin_group = Group.objects.get(
-            name=COMMUNITY_ADMIN.format(community.name))
-        self.groups.remove(admin_group)
+        # get all community groups except the community admin group
+        self.groups = list(get_groups(community).exclude(
+            community_group__role=COMMUNITY_ADMIN_ROLE).order_by('pk'))
         choices = [(group.pk, group.name) for group in self.groups]
         self.fields['groups'] = forms.\
             MultipleChoiceField(choices=choices, label="", required=False,
@@ -85,13 +85,36 @@ class PermissionGroupsForm(forms.Form):
             self, cancel_href="{% url 'community_users' community.slug %}")
 
     def save(self):
-        """Update the groups of which the user is member of"""
-        group_pks = [int(pk) for pk in self.cleaned_data['groups']]
-        for member_group in self.member_groups:
-            if member_group.pk not in group_pks:
-                self.user.leave_group(member_group)
-
-        for pk in group_pks:
-            group = Group.objects.get(pk=pk)
-            if not self.user.is_group_member(group.name):
-                self.user.join_group(group)
+        """Update the groups of which the user is member of and record the
+        changes as membership events. The joined and left groups are the
+        differences between the selected and the current groups, and are
+        applied with a single add and a single remove in one transaction."""
+        groups = dict((group.pk, group) for group in self.groups)
+        selected_pks = set(int(pk) for pk in self.cleaned_data['groups'])
+        member_pks = set(group.pk for group in self.member_groups)
+        left_groups = [groups[pk] for pk in sorted(member_pks - selected_pks)]
+        joined_groups = [groups[pk] for pk in
+                         sorted(selected_pks - member_pks)]
+        with transaction.atomic():
+            if left_groups:
+                self.user.user.groups.remove(*left_groups)
+            if joined_groups:
+                self.user.user.groups.add(*joined_groups)
+            events = [self.get_event(GROUP_LEFT, group)
+                      for group in left_groups]
+            events += [self.get_event(GROUP_JOINED, group)
+                       for group in joined_groups]
+            if events:
+                MembershipEvent.objects.bulk_create(events)
+        self.member_groups = [groups[pk] for pk in sorted(selected_pks)]
+
+    def get_event(self, action, group):
+        """Get a not yet saved membership event about a group change
+
+        :param action: string action, GROUP_JOINED or GROUP_LEFT
+        :param group: Group object
+        :return: MembershipEvent object
+        """
+        return MembershipEvent(action=action, subject=self.user,
+                               actor=self.actor, community=self.community,
+                               details=group.name)
@@ -0,0 +1,268 @@
+from collections import Counter, OrderedDict
+import csv
+import itertools
+import json
+import os
+from optparse import make_option
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from community.constants import COMMUNITY_ADMIN_ROLE
+from community.models import Community
+from community.permissions import group_roles
+from community.utils import get_group
+from membership.constants import GROUP_JOINED, MEMBER_ADDED
+from membership.models import MembershipEvent
+from users.models import SystersUser
+
+
+class Command(BaseCommand):
+    args = "<file>"
+    help = "Import users and make them members of communities from a CSV " \
+           "or JSONL file with username, email, first_name, last_name, " \
+           "community (slug) and role (optional group role) fields. Rows " \
+           "are imported in batches, each in its own transaction. Users, " \
+           "memberships and group memberships that already exist are left " \
+           "as they are, hence importing a file again is harmless."
+    option_list = BaseCommand.option_list + (
+        make_option('--format', dest='format', choices=['csv', 'jsonl'],
+                    help="Format of the file, by default guessed from the "
+                         "file extension."),
+        make_option('--batch-size', dest='batch_size', type='int',
+                    default=1000,
+                    help="Maximum number of rows imported in a batch."),
+        make_option('--checkpoint', dest='checkpoint',
+                    help="File storing the number of imported rows after "
+                         "each batch. If it exists, the import resumes after "
+                         "these rows. It is removed once the import ends."),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError("Specify the file to import.")
+        path = args[0]
+        file_format = options['format'] or \
+            os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format not in ('csv', 'jsonl'):
+            raise CommandError("Unknown file format, use --format.")
+        checkpoint = options['checkpoint']
+        imported = self.read_checkpoint(checkpoint)
+        self.communities = {}
+        self.groups = {}
+        self.stats = Counter(users=0, members=0, groups=0)
+
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = csv.DictReader(f) if file_format == 'csv' else \
+                (json.loads(line) for line in f if line.strip())
+            rows = itertools.islice(rows, imported, None)
+            while True:
+                batch = list(itertools.islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                self.import_batch(batch, imported)
+                imported += len(batch)
+                self.write_checkpoint(checkpoint, imported)
+
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(
+            "Imported {0} rows: {users} users created, {members} "
+            "memberships and {groups} group memberships added.".format(
+                imported, **self.stats))
+
+    def read_checkpoint(self, checkpoint):
+        """Get the number of rows imported before, according to a checkpoint.
+
+        :param checkpoint: string path of the checkpoint file or None
+        :return: number of already imported rows
+        """
+        if not checkpoint or not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint) as f:
+            return int(f.read().strip() or 0)
+
+    def write_checkpoint(self, checkpoint, imported):
+        """Store the number of imported rows in a checkpoint file.
+
+        :param checkpoint: string path of the checkpoint file or None
+        :param imported: number of imported rows
+        """
+        if checkpoint:
+            with open(checkpoint, 'w') as f:
+                f.write(str(imported))
+
+    def import_batch(self, rows, offset):
+        """Import a batch of rows in a single transaction with a constant
+        number of queries, except for communities and groups seen for the
+        first time.
+
+        :param rows: list of dicts with the fields of the imported rows
+        :param offset: number of rows in the file before the batch
+        :raises CommandError: if a row is not valid
+        """
+        members = []
+        for number, row in enumerate(rows, start=offset + 1):
+            members.append(self.clean_row(number, row))
+
+        with transaction.atomic():
+            users = self.create_users(OrderedDict(
+                (member['username'], member) for member in members))
+            systers_users = self.create_systers_users(users.values())
+
+            memberships = set()
+            user_groups = set()
+            for member in members:
+                user_pk = users[member['username']]
+                memberships.add((systers_users[user_pk],
+                                 member['community'].pk))
+                if member['group'] is not None:
+                    user_groups.add((user_pk, member['group'].pk))
+            new_memberships = self.add_memberships(memberships)
+            new_user_groups = self.add_user_groups(user_groups)
+
+            community_of_group = dict(
+                (group.pk, community_pk)
+                for (community_pk, role), group in self.groups.items())
+            group_names = dict((group.pk, group.name)
+                               for group in self.groups.values())
+            events = [
+                MembershipEvent(action=MEMBER_ADDED, subject_id=subject_pk,
+                                community_id=community_pk)
+                for subject_pk, community_pk in new_memberships]
+            events += [
+                MembershipEvent(action=GROUP_JOINED,
+                                subject_id=systers_users[user_pk],
+                                community_id=community_of_group[group_pk],
+                                details=group_names[group_pk])
+                for user_pk, group_pk in new_user_groups]
+            MembershipEvent.objects.bulk_create(events)
+
+    def clean_row(self, number, row):
+        """Validate a row and resolve its community and group.
+
+        :param number: number of the row in the file
+        :param row: dict with the fields of the row
+        :return: dict with username, email, first_name, last_name, community
+                 (Community object) and group (Group object or None)
+        :raises CommandError: if the row is not valid
+        """
+        username = (row.get('username') or '').strip()
+        slug = (row.get('community') or '').strip()
+        role = (row.get('role') or '').strip()
+        if not username or not slug:
+            raise CommandError("Row {0}: username and community are "
+                               "required.".format(number))
+        community = self.get_community(number, slug)
+        group = None
+        if role:
+            if role == COMMUNITY_ADMIN_ROLE or \
+                    role not in dict(group_roles):
+                raise CommandError("Row {0}: unknown role {1}.".format(
+                    number, role))
+            key = (community.pk, role)
+            if key not in self.groups:
+                self.groups[key] = get_group(community, role)
+            group = self.groups[key]
+        return {
+            'username': username,
+            'email': (row.get('email') or '').strip(),
+            'first_name': (row.get('first_name') or '').strip(),
+            'last_name': (row.get('last_name') or '').strip(),
+            'community': community,
+            'group': group,
+        }
+
+    def get_community(self, number, slug):
+        """Get a community by its slug, fetching it once per import.
+
+        :param number: number of the row in the file
+        :param slug: string Community slug
+        :return: Community object
+        :raises CommandError: if the community doesn't exist
+        """
+        if slug not in self.communities:
+            try:
+                self.communities[slug] = Community.objects.get(slug=slug)
+            except Community.DoesNotExist:
+                raise CommandError("Row {0}: unknown community {1}.".format(
+                    number, slug))
+        return self.communities[slug]
+
+    def create_users(self, members):
+        """Create the users that don't exist yet. Imported users have no
+        usable password until they reset it.
+
+        :param members: dict mapping usernames to cleaned rows
+        :return: dict mapping usernames to User primary keys
+        """
+        existing = set(User.objects.filter(
+            username__in=members.keys()).values_list('username', flat=True))
+        new_users = [
+            User(username=username, email=member['email'],
+                 first_name=member['first_name'],
+                 last_name=member['last_name'], password=make_password(None))
+            for username, member in members.items()
+            if username not in existing]
+        User.objects.bulk_create(new_users)
+        self.stats['users'] += len(new_users)
+        return dict(User.objects.filter(
+            username__in=members.keys()).values_list('username', 'pk'))
+
+    def create_systers_users(self, user_pks):
+        """Create the SystersUser objects that the post_save signal of User
+        model didn't create, since users were created in bulk.
+
+        :param user_pks: list of User primary keys
+        :return: dict mapping User primary keys to SystersUser primary keys
+        """
+        systers_users = SystersUser.objects.filter(user__in=user_pks)
+        existing = set(systers_users.values_list('user_id', flat=True))
+        SystersUser.objects.bulk_create([
+            SystersUser(user_id=pk) for pk in user_pks if pk not in existing])
+        return dict(systers_users.values_list('user_id', 'pk'))
+
+    def add_memberships(self, memberships):
+        """Add the community memberships that don't exist yet and update the
+        members counts of the communities.
+
+        :param memberships: set of (SystersUser pk, Community pk) tuples
+        :return: list of added (SystersUser pk, Community pk) tuples
+        """
+        through = Community.members.through
+        existing = set(through.objects.filter(
+            systersuser__in=set(pk for pk, _ in memberships),
+            community__in=set(pk for _, pk in memberships)).values_list(
+            'systersuser_id', 'community_id'))
+        new_memberships = sorted(memberships - existing)
+        through.objects.bulk_create([
+            through(systersuser_id=systers_user_pk,
+                    community_id=community_pk)
+            for systers_user_pk, community_pk in new_memberships])
+        counts = Counter(community_pk for _, community_pk in new_memberships)
+        for community_pk, count in counts.items():
+            Community.objects.filter(pk=community_pk).update(
+                members_count=F('members_count') + count)
+        self.stats['members'] += len(new_memberships)
+        return new_memberships
+
+    def add_user_groups(self, user_groups):
+        """Add the group memberships that don't exist yet.
+
+        :param user_groups: set of (User pk, Group pk) tuples
+        :return: list of added (User pk, Group pk) tuples
+        """
+        through = User.groups.through
+        existing = set(through.objects.filter(
+            user__in=set(pk for pk, _ in user_groups),
+            group__in=set(pk for _, pk in user_groups)).values_list(
+            'user_id', 'group_id'))
+        new_user_groups = sorted(user_groups - existing)
+        through.objects.bulk_create([
+            through(user_id=user_pk, group_id=group_pk)
+            for user_pk, group_pk in new_user_groups])
+        self.stats['groups'] += len(new_user_groups)
+        return new_user_groups
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+GROUPS_TEMPLATES = {
+    'content_contributor': "{0}: Content Contributor",
+    'content_manager': "{0}: Content Manager",
+    'user_content_manager': "{0}: User and Content Manager",
+    'community_admin': "{0}: Community Admin",
+}
+
+
+def link_community_groups(apps, schema_editor):
+    """Link every existing community to its groups, found by their names"""
+    Community = apps.get_model('community', 'Community')
+    CommunityGroup = apps.get_model('community', 'CommunityGroup')
+    Group = apps.get_model('auth', 'Group')
+    names = {}
+    for community in Community.objects.all():
+        for role, group_name in GROUPS_TEMPLATES.items():
+            names[group_name.format(community.name)] = (community, role)
+    links = []
+    for group in Group.objects.filter(name__in=list(names)):
+        community, role = names[group.name]
+        links.append(CommunityGroup(community=community, group=group,
+                                    role=role))
+    CommunityGroup.objects.bulk_create(links)
+
+
+def unlink_community_groups(apps, schema_editor):
+    CommunityGroup = apps.get_model('community', 'CommunityGroup')
+    CommunityGroup.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0001_initial'),
+        ('community', '0011_auto_20150522_1233'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommunityGroup',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('role', models.CharField(db_index=True, max_length=50, verbose_name='Role', choices=[('content_contributor', 'Content Contributor'), ('content_manager', 'Content Manager'), ('user_content_manager', 'User and Content Manager'), ('community_admin', 'Community Admin')])),
+                ('community', models.ForeignKey(related_name='community_groups', verbose_name='Community', to='community.Community')),
+                ('group', models.OneToOneField(related_name='community_group', verbose_name='Group', to='auth.Group')),
+            ],
+            options={
+            },
+            bases=(models.Model,),
+        ),
+        migrations.AlterUniqueTogether(
+            name='communitygroup',
+            unique_together=set([('community', 'role')]),
+        ),
+        migrations.RunPython(link_community_groups, unlink_community_groups),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0013_community_members_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='communitypage',
+            name='excerpt',
+            field=models.TextField(verbose_name='Excerpt', editable=False, blank=True),
+            preserve_default=True,
+        ),
+    ]
@@ -1,14 +1,14 @@
 from django.core.exceptions import ImproperlyConfigured
 
 from community.constants import DEFAULT_COMMUNITY_ACTIVE_PAGE
-from community.models import CommunityPage
+from community.utils import get_menu_pages
 
 
 class CommunityMenuMixin(object):
     """Mixin allows to add to the context information required to render the
     Community menu:
 
-    * All community pages (CommunityPage objects) of a specific community
+    * All community pages (MenuPage tuples) of a specific community
     * Current active page slug
     """
     community = None
@@ -17,8 +17,7 @@ class CommunityMenuMixin(object):
     def get_context_data(self, **kwargs):
         context = super(CommunityMenuMixin, self).get_context_data(**kwargs)
         community = self.get_community()
-        pages = CommunityPage.objects.filter(community=community).\
-            order_by('order')
+        pages = get_menu_pages(community)
         context['pages'] = pages
 
         page_slug = self.get_page_slug()
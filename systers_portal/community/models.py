@@ -1,14 +1,17 @@
 from django.contrib.auth.models import Group
 from django.core.urlresolvers import reverse
-from django.db import models
-
-from common.models import Post
-from community.constants import COMMUNITY_ADMIN
-from membership.constants import NOT_MEMBER, OK
+from django.db import models, transaction
+
+from common.models import MembersCountMixin, Post
+from community.constants import COMMUNITY_ADMIN_ROLE
+from community.permissions import group_roles
+from community.utils import get_group
+from membership.constants import (NOT_MEMBER, OK, MEMBER_ADDED,
+                                  MEMBER_REMOVED, MEMBER_LEFT, ADMIN_CHANGED)
 from users.models import SystersUser
 
 
-class Community(models.Model):
+class Community(MembersCountMixin, models.Model):
     """Model to represent Systers community or subcommunity"""
     name = models.CharField(max_length=255, verbose_name="Name")
     slug = models.SlugField(max_length=150, unique=True, verbose_name="Slug")
@@ -19,6 +22,8 @@ class Community(models.Model):
     members = models.ManyToManyField(SystersUser, blank=True,
                                      related_name='communities',
                                      verbose_name="Members")
+    members_count = models.PositiveIntegerField(default=0, editable=False,
+                                                verbose_name="Members count")
     admin = models.ForeignKey(SystersUser, related_name='community',
                               verbose_name="Community admin")
     parent_community = models.ForeignKey('self', blank=True, null=True,
@@ -32,6 +37,7 @@ class Community(models.Model):
     twitter = models.URLField(max_length=255, blank=True,
                               verbose_name="Twitter")
     __original_name = None
+    __original_admin_id = None
     __original_admin = None
 
     class Meta:
@@ -61,15 +67,28 @@ class Community(models.Model):
     def __init__(self, *args, **kwargs):
         super(Community, self).__init__(*args, **kwargs)
         self.__original_name = self.name
-        if self.admin_id is not None:
-            self.__original_admin = self.admin
+        self.__original_admin_id = self.admin_id
 
     @property
     def original_name(self):
         return self.__original_name
 
+    @property
+    def original_admin_id(self):
+        return self.__original_admin_id
+
     @property
     def original_admin(self):
+        """The admin of the community at the time it was loaded. The
+        SystersUser object is fetched from the database only if the admin was
+        changed in the meantime."""
+        if self.__original_admin_id is None:
+            return None
+        if not self.has_changed_admin():
+            return self.admin
+        if self.__original_admin is None:
+            self.__original_admin = SystersUser.objects.get(
+                pk=self.__original_admin_id)
         return self.__original_admin
 
     def get_absolute_url(self):
@@ -88,22 +107,34 @@ class Community(models.Model):
 
         :return: True if community changed admin, False otherwise
         """
-        return self.admin != self.original_admin
+        return self.admin_id != self.original_admin_id
 
-    def add_member(self, systers_user):
-        """Add community member
+    def add_member(self, systers_user, actor=None):
+        """Add community member and record the membership event
 
         :param systers_user: SystersUser objects
+        :param actor: SystersUser object who added the member or None
         """
-        self.members.add(systers_user)
+        from membership.models import MembershipEvent
+        with transaction.atomic():
+            self.members.add(systers_user)
+            MembershipEvent.objects.log(MEMBER_ADDED, [systers_user],
+                                        actor=actor, community=self)
 
-    def remove_member(self, systers_user):
-        """Remove community member
+    def remove_member(self, systers_user, actor=None):
+        """Remove community member and record the membership event. The member
+        left the community if the actor is the member themselves.
 
         :param systers_user: SystersUser object
+        :param actor: SystersUser object who removed the member or None
         :return:
         """
-        self.members.remove(systers_user)
+        from membership.models import MembershipEvent
+        action = MEMBER_LEFT if actor == systers_user else MEMBER_REMOVED
+        with transaction.atomic():
+            self.members.remove(systers_user)
+            MembershipEvent.objects.log(action, [systers_user], actor=actor,
+                                        community=self)
 
     def get_fields(self):
         """Get model fields of a Community object
@@ -123,15 +154,35 @@ class Community(models.Model):
         """
         if not new_admin.is_member(self):
             return NOT_MEMBER
-        name = COMMUNITY_ADMIN.format(self.name)
-        admin_group = Group.objects.get(name=name)
-        self.admin.leave_group(admin_group)
-        new_admin.join_group(admin_group)
-        self.admin = new_admin
-        self.save()
+        from membership.models import MembershipEvent
+        admin_group = get_group(self, COMMUNITY_ADMIN_ROLE)
+        with transaction.atomic():
+            old_admin = self.admin
+            old_admin.leave_group(admin_group)
+            new_admin.join_group(admin_group)
+            self.admin = new_admin
+            self.save()
+            MembershipEvent.objects.log(ADMIN_CHANGED, [new_admin],
+                                        actor=old_admin, community=self)
         return OK
 
 
+class CommunityGroup(models.Model):
+    """Model to link a Community to one of its permission groups"""
+    community = models.ForeignKey(Community, related_name='community_groups',
+                                  verbose_name="Community")
+    group = models.OneToOneField(Group, related_name='community_group',
+                                 verbose_name="Group")
+    role = models.CharField(max_length=50, choices=group_roles,
+                            db_index=True, verbose_name="Role")
+
+    class Meta:
+        unique_together = ('community', 'role')
+
+    def __str__(self):
+        return "{0} of {1}".format(self.get_role_display(), self.community)
+
+
 class CommunityPage(Post):
     """Model to represent an arbitrary community page"""
     order = models.IntegerField(verbose_name="Order")
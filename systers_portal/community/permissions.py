@@ -1,10 +1,10 @@
 from community.constants import *
 
 
-groups_templates = {"content_contributor": CONTENT_CONTRIBUTOR,
-                    "content_manager": CONTENT_MANAGER,
-                    "user_content_manager": USER_CONTENT_MANAGER,
-                    "community_admin": COMMUNITY_ADMIN}
+groups_templates = {CONTENT_CONTRIBUTOR_ROLE: CONTENT_CONTRIBUTOR,
+                    CONTENT_MANAGER_ROLE: CONTENT_MANAGER,
+                    USER_CONTENT_MANAGER_ROLE: USER_CONTENT_MANAGER,
+                    COMMUNITY_ADMIN_ROLE: COMMUNITY_ADMIN}
 
 content_contributor_permissions = [
     "add_tag",
@@ -41,8 +41,15 @@ community_admin_permissions = user_content_manager_permissions + [
 ]
 
 group_permissions = {
-    "content_contributor": content_contributor_permissions,
-    "content_manager": content_manager_permissions,
-    "user_content_manager": user_content_manager_permissions,
-    "community_admin": community_admin_permissions
+    CONTENT_CONTRIBUTOR_ROLE: content_contributor_permissions,
+    CONTENT_MANAGER_ROLE: content_manager_permissions,
+    USER_CONTENT_MANAGER_ROLE: user_content_manager_permissions,
+    COMMUNITY_ADMIN_ROLE: community_admin_permissions
 }
+
+group_roles = (
+    (CONTENT_CONTRIBUTOR_ROLE, "Content Contributor"),
+    (CONTENT_MANAGER_ROLE, "Content Manager"),
+    (USER_CONTENT_MANAGER_ROLE, "User and Content Manager"),
+    (COMMUNITY_ADMIN_ROLE, "Community Admin"),
+)
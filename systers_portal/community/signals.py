@@ -1,11 +1,13 @@
-from django.contrib.auth.models import Group
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import (post_save, pre_delete, post_delete,
+                                      m2m_changed)
 from django.dispatch import receiver
-from django.shortcuts import get_object_or_404
 
-from community.constants import COMMUNITY_ADMIN
+from community.constants import (COMMUNITY_ADMIN_ROLE,
+                                 COMMUNITIES_NAVBAR_VERSION_KEY,
+                                 COMMUNITY_PAGES_VERSION_KEY)
+from community.models import Community
 from community.utils import (create_groups, assign_permissions, remove_groups,
-                             rename_groups)
+                             rename_groups, get_group, bump_cache_version)
 
 
 @receiver(post_save, sender='community.Community',
@@ -14,20 +16,17 @@ def manage_community_groups(sender, instance, created, **kwargs):
     """Manage user groups and user permissions for a particular Community"""
     name = instance.name
     if created:
-        groups = create_groups(name)
+        groups = create_groups(instance)
         assign_permissions(instance, groups)
-        community_admin_group = next(
-            g for g in groups if g.name == COMMUNITY_ADMIN.format(name))
+        community_admin_group = groups[COMMUNITY_ADMIN_ROLE]
         instance.admin.join_group(community_admin_group)
         instance.add_member(instance.admin)
-        instance.save()
     else:
         if name != instance.original_name and instance.original_name:
-            rename_groups(instance.original_name, instance.name)
-        if instance.admin != instance.original_admin and \
-           instance.original_admin is not None:
-            community_admin_group = \
-                get_object_or_404(Group, name=COMMUNITY_ADMIN.format(name))
+            rename_groups(instance)
+        if instance.has_changed_admin() and \
+           instance.original_admin_id is not None:
+            community_admin_group = get_group(instance, COMMUNITY_ADMIN_ROLE)
             instance.original_admin.leave_group(
                 community_admin_group)
             instance.admin.join_group(community_admin_group)
@@ -36,8 +35,32 @@ def manage_community_groups(sender, instance, created, **kwargs):
                 instance.save()
 
 
-@receiver(post_delete, sender='community.Community',
+@receiver(pre_delete, sender='community.Community',
           dispatch_uid="remove_groups")
 def remove_community_groups(sender, instance, **kwargs):
-    """Remove user groups for a particular Community"""
-    remove_groups(instance.name)
+    """Remove user groups for a particular Community. The groups are removed
+    before the community itself, while they are still linked to it."""
+    remove_groups(instance)
+
+
+@receiver([post_save, post_delete], sender='community.Community',
+          dispatch_uid="invalidate_navbar_communities")
+def invalidate_navbar_communities(sender, **kwargs):
+    """Invalidate the cached list of communities shown in the navigation bar
+    """
+    bump_cache_version(COMMUNITIES_NAVBAR_VERSION_KEY)
+
+
+@receiver([post_save, post_delete], sender='community.CommunityPage',
+          dispatch_uid="invalidate_menu_pages")
+def invalidate_menu_pages(sender, instance, **kwargs):
+    """Invalidate cached menu pages of the community of a CommunityPage"""
+    bump_cache_version(
+        COMMUNITY_PAGES_VERSION_KEY.format(instance.community_id))
+
+
+@receiver(m2m_changed, sender=Community.members.through,
+          dispatch_uid="update_community_members_count")
+def update_community_members_count(sender, **kwargs):
+    """Keep the members count of a Community in sync with its members"""
+    Community.update_members_count(**kwargs)
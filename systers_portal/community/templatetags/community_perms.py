@@ -0,0 +1,20 @@
+from django import template
+
+from community.utils import get_community_perms, load_community_perms
+
+
+register = template.Library()
+
+
+@register.assignment_tag(takes_context=True)
+def community_perms(context, community):
+    """Returns the row-level permissions the current user has towards a
+    community. Permissions are loaded at most once per request.
+
+    :param community: Community object
+    :returns: set of string permission codenames
+    """
+    request = context.get('request')
+    if request is None:
+        return load_community_perms(context['user'], community)
+    return get_community_perms(request, community)
@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from community.constants import CONTENT_MANAGER
+from community.models import Community
+from membership.models import MembershipEvent
+from users.models import SystersUser
+
+
+class ImportMembersCommandTestCase(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def import_members(self, path, **options):
+        out = StringIO()
+        call_command('import_members', path, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_members_csv(self):
+        """Test importing members from a CSV file in batches"""
+        path = self.write_file(
+            'members.csv',
+            "username,email,first_name,last_name,community,role\n"
+            "bar,bar@example.com,Bar,,foo,content_manager\n"
+            "baz,baz@example.com,,Baz,foo,\n"
+            "foo,,,,foo,content_manager\n")
+        out = self.import_members(path, batch_size=2)
+        self.assertIn("Imported 3 rows: 2 users created, 2 memberships and "
+                      "2 group memberships added.", out)
+        bar = SystersUser.objects.get(user__username='bar')
+        self.assertEqual(bar.user.email, 'bar@example.com')
+        self.assertFalse(bar.user.has_usable_password())
+        community = Community.objects.get()
+        self.assertCountEqual(
+            [member.user.username for member in community.members.all()],
+            ['foo', 'bar', 'baz'])
+        self.assertEqual(community.members_count, 3)
+        group_name = CONTENT_MANAGER.format("Foo")
+        self.assertTrue(bar.is_group_member(group_name))
+        self.assertTrue(self.systers_user.is_group_member(group_name))
+        self.assertEqual(MembershipEvent.objects.filter(
+            action="member_added", community=community).count(), 3)
+        self.assertEqual(MembershipEvent.objects.filter(
+            action="group_joined", details=group_name).count(), 2)
+
+        out = self.import_members(path)
+        self.assertIn("Imported 3 rows: 0 users created, 0 memberships and "
+                      "0 group memberships added.", out)
+        self.assertEqual(Community.objects.get().members_count, 3)
+
+    def test_import_members_jsonl_checkpoint(self):
+        """Test resuming an import of a JSONL file from a checkpoint"""
+        rows = [{'username': 'bar', 'community': 'foo'},
+                {'username': 'baz', 'community': 'foo'}]
+        path = self.write_file(
+            'members.jsonl', "\n".join(json.dumps(row) for row in rows))
+        checkpoint = self.write_file('checkpoint', "1")
+        out = self.import_members(path, checkpoint=checkpoint)
+        self.assertIn("Imported 2 rows: 1 users created", out)
+        self.assertFalse(User.objects.filter(username='bar').exists())
+        self.assertTrue(SystersUser.objects.get(
+            user__username='baz').is_member(self.community))
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_import_members_invalid(self):
+        """Test that importing stops at an invalid row and keeps a
+        checkpoint of the imported batches"""
+        path = self.write_file(
+            'members.csv',
+            "username,community,role\nbar,foo,\nbaz,qux,\n")
+        checkpoint = os.path.join(self.directory, 'checkpoint')
+        self.assertRaises(CommandError, self.import_members, path,
+                          batch_size=1, checkpoint=checkpoint)
+        self.assertTrue(User.objects.filter(username='bar').exists())
+        with open(checkpoint) as f:
+            self.assertEqual(f.read(), "1")
+
+        path = self.write_file('members.csv',
+                               "username,community,role\n"
+                               "bar,foo,community_admin\n")
+        self.assertRaises(CommandError, self.import_members, path)
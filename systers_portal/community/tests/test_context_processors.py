@@ -1,16 +1,20 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
-from django.test import TestCase, Client
+from django.test import TestCase, Client, RequestFactory
 
 from users.models import SystersUser
+from community.context_processors import communities_processor
 from community.models import Community
 
 
 class CommunitiesProcessorTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         User.objects.create(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
         self.client = Client()
+        self.factory = RequestFactory()
 
     def test_communities_processor(self):
         """Test the rendering of all communities in the templates"""
@@ -24,3 +28,25 @@ class CommunitiesProcessorTestCase(TestCase):
                                       'href="/community/foo/">Foo</a>')
         self.assertContains(response, '<a role="menuitem" tabindex="-1" '
                                       'href="/community/boo/">Boo</a>')
+
+    def test_communities_processor_cache(self):
+        """Test that the communities list is served from cache and rebuilt
+        when a community is saved or deleted"""
+        community = Community.objects.create(name="Foo", slug="foo", order=1,
+                                             admin=self.systers_user)
+        request = self.factory.get('/')
+        context = communities_processor(request)
+        self.assertEqual([c.name for c in context['communities']], ["Foo"])
+        self.assertEqual(context['communities'][0].url, "/community/foo/")
+
+        with self.assertNumQueries(0):
+            communities_processor(request)
+
+        community.name = "Bar"
+        community.save()
+        context = communities_processor(request)
+        self.assertEqual([c.name for c in context['communities']], ["Bar"])
+
+        community.delete()
+        context = communities_processor(request)
+        self.assertEqual(context['communities'], [])
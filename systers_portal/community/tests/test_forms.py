@@ -4,6 +4,7 @@ from django.test import TestCase
 from community.forms import (CommunityForm, AddCommunityPageForm,
                              EditCommunityPageForm, PermissionGroupsForm)
 from community.models import Community, CommunityPage
+from membership.models import MembershipEvent
 from users.models import SystersUser
 
 
@@ -139,3 +140,25 @@ class PermissionGroupsFormTestCase(TestCase):
         self.assertTrue(self.systers_user.is_group_member(groups[0]))
         self.assertFalse(self.systers_user.is_group_member(groups[1]))
         self.assertFalse(self.systers_user.is_group_member(groups[2]))
+
+    def test_permission_groups_form_query_count(self):
+        """Test that editing groups costs a fixed number of queries"""
+        groups = list(Group.objects.filter(
+            community_group__community=self.community).exclude(
+            community_group__role="community_admin").order_by('pk'))
+        self.systers_user.join_group(groups[0])
+        with self.assertNumQueries(2):
+            form = PermissionGroupsForm(user=self.systers_user,
+                                        community=self.community,
+                                        data={'groups': [groups[1].pk,
+                                                         groups[2].pk]})
+        self.assertTrue(form.is_valid())
+        # one remove, one add (select and insert), one events insert and
+        # the savepoint and its release
+        with self.assertNumQueries(6):
+            form.save()
+        self.assertCountEqual(self.systers_user.get_member_groups(groups),
+                              groups[1:])
+        self.assertEqual(MembershipEvent.objects.filter(
+            subject=self.systers_user,
+            action__in=["group_joined", "group_left"]).count(), 3)
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 from django.views.generic import TemplateView
@@ -10,6 +11,7 @@ from users.models import SystersUser
 
 class CommunityMenuMixinTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
         self.community = Community.objects.create(name="Foo", slug="foo",
@@ -32,7 +34,7 @@ class CommunityMenuMixinTestCase(TestCase):
 
         view = DummyView()
         context = view.get_context_data()
-        self.assertQuerysetEqual(context['pages'], [])
+        self.assertEqual(context['pages'], [])
         self.assertEqual(context['active_page'], 'news')
 
     def test_get_context_data_pages(self):
@@ -53,7 +55,8 @@ class CommunityMenuMixinTestCase(TestCase):
 
         view = DummyView()
         context = view.get_context_data()
-        self.assertEqual(list(context["pages"]), [page1, page2])
+        self.assertEqual([page.slug for page in context["pages"]],
+                         [page1.slug, page2.slug])
         self.assertEqual(context['active_page'], 'page1')
 
     def test_get_context_data_with_page(self):
@@ -73,7 +76,8 @@ class CommunityMenuMixinTestCase(TestCase):
 
         view = DummyView()
         context = view.get_context_data()
-        self.assertEqual(list(context['pages']), [page1])
+        self.assertEqual([page.slug for page in context['pages']],
+                         [page1.slug])
         self.assertEqual(context['active_page'], 'page1')
 
     def test_get_context_data_news(self):
@@ -85,3 +89,26 @@ class CommunityMenuMixinTestCase(TestCase):
         view = DummyView()
         context = view.get_context_data()
         self.assertEqual(context['active_page'], 'news')
+
+    def test_get_context_data_cached_pages(self):
+        """Test that the menu pages are cached and refreshed on page changes"""
+        page = CommunityPage.objects.create(slug="page1", title="Page",
+                                            order=1, author=self.systers_user,
+                                            community=self.community)
+
+        class DummyView(CommunityMenuMixin, TemplateView):
+            community = self.community
+
+        view = DummyView()
+        view.get_context_data()
+        with self.assertNumQueries(0):
+            context = view.get_context_data()
+        self.assertEqual(context['pages'], [("Page", "page1", 1)])
+        page.title = "New Page"
+        page.save()
+        context = view.get_context_data()
+        self.assertEqual(context['pages'], [("New Page", "page1", 1)])
+        page.delete()
+        context = view.get_context_data()
+        self.assertEqual(context['pages'], [])
+        self.assertEqual(context['active_page'], 'news')
@@ -1,10 +1,11 @@
 from django.contrib.auth.models import User, Group
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, pre_delete
 from django.test import TestCase
 
 from community.constants import COMMUNITY_ADMIN
 from community.models import Community, CommunityPage
 from community.signals import manage_community_groups, remove_community_groups
+from membership.models import MembershipEvent
 from users.models import SystersUser
 
 
@@ -12,8 +13,8 @@ class CommunityModelTestCase(TestCase):
     def setUp(self):
         post_save.disconnect(manage_community_groups, sender=Community,
                              dispatch_uid="manage_groups")
-        post_delete.disconnect(remove_community_groups, sender=Community,
-                               dispatch_uid="remove_groups")
+        pre_delete.disconnect(remove_community_groups, sender=Community,
+                              dispatch_uid="remove_groups")
         User.objects.create(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
         self.community = Community.objects.create(name="Foo", slug="foo",
@@ -53,6 +54,31 @@ class CommunityModelTestCase(TestCase):
         self.community.save()
         self.assertTrue(self.community.has_changed_admin())
 
+    def test_original_admin_lazy_loading(self):
+        """Test that the original admin is fetched only when the admin
+        changed"""
+        community = Community.objects.get()
+        with self.assertNumQueries(0):
+            self.assertFalse(community.has_changed_admin())
+        user = User.objects.create(username="bar", password="barfoo")
+        systers_user2 = SystersUser.objects.get(user=user)
+        community.admin = systers_user2
+        with self.assertNumQueries(0):
+            self.assertTrue(community.has_changed_admin())
+        with self.assertNumQueries(1):
+            self.assertEqual(community.original_admin, self.systers_user)
+            self.assertEqual(community.original_admin, self.systers_user)
+
+    def test_load_communities_query_count(self):
+        """Test that loading many communities costs a single query"""
+        Community.objects.bulk_create([
+            Community(name="Foo{0}".format(i), slug="foo{0}".format(i),
+                      order=i + 2, admin=self.systers_user)
+            for i in range(500)])
+        with self.assertNumQueries(1):
+            communities = list(Community.objects.all())
+        self.assertEqual(len(communities), 501)
+
     def test_add_remove_member(self):
         """Test adding and removing Community members"""
         self.assertQuerysetEqual(self.community.members.all(), [])
@@ -64,6 +90,24 @@ class CommunityModelTestCase(TestCase):
         self.community.save()
         self.assertQuerysetEqual(self.community.members.all(), [])
 
+    def test_add_remove_member_events(self):
+        """Test that adding and removing members records membership events"""
+        user = User.objects.create(username='bar', password='foobar')
+        actor = SystersUser.objects.get(user=user)
+        self.community.add_member(self.systers_user, actor=actor)
+        self.community.remove_member(self.systers_user, actor=actor)
+        self.community.add_member(self.systers_user)
+        self.community.remove_member(self.systers_user,
+                                     actor=self.systers_user)
+        events = MembershipEvent.objects.filter(
+            community=self.community).order_by('pk')
+        self.assertEqual(
+            [(event.action, event.actor) for event in events],
+            [("member_added", actor), ("member_removed", actor),
+             ("member_added", None), ("member_left", self.systers_user)])
+        for event in events:
+            self.assertEqual(event.subject, self.systers_user)
+
     def test_get_fields(self):
         """Test getting Community fields"""
         fields = self.community.get_fields()
@@ -74,8 +118,8 @@ class CommunityModelTestCase(TestCase):
         """Test setting a new admin to a community"""
         post_save.connect(manage_community_groups, sender=Community,
                           dispatch_uid="manage_groups")
-        post_delete.connect(remove_community_groups, sender=Community,
-                            dispatch_uid="remove_groups")
+        pre_delete.connect(remove_community_groups, sender=Community,
+                           dispatch_uid="remove_groups")
         community = Community.objects.create(name="Bar", slug="bar",
                                              order=2,
                                              admin=self.systers_user)
@@ -93,6 +137,10 @@ class CommunityModelTestCase(TestCase):
         self.assertSequenceEqual(bar_systers_user.user.groups.all(),
                                  [admin_group])
         self.assertSequenceEqual(self.systers_user.user.groups.all(), [])
+        event = MembershipEvent.objects.get(action="admin_changed")
+        self.assertEqual(event.subject, bar_systers_user)
+        self.assertEqual(event.actor, self.systers_user)
+        self.assertEqual(event.community, community)
 
 
 class CommunityPageModelTestCase(TestCase):
@@ -1,10 +1,17 @@
+from itertools import filterfalse
+from unittest.mock import patch
+
 from django.test import TestCase
 from django.contrib.auth.models import Group, User
-from django.db.models.signals import post_save, post_delete
+from django.db import connection
+from django.db.models.signals import post_save, pre_delete
+from django.test.utils import CaptureQueriesContext
 
 from community.constants import COMMUNITY_ADMIN
 from community.models import Community
+from community.permissions import group_permissions
 from community.signals import manage_community_groups, remove_community_groups
+from community.utils import is_global_permission
 from users.models import SystersUser
 
 
@@ -12,8 +19,8 @@ class SignalsTestCase(TestCase):
     def setUp(self):
         post_save.connect(manage_community_groups, sender=Community,
                           dispatch_uid="manage_groups")
-        post_delete.connect(remove_community_groups, sender=Community,
-                            dispatch_uid="remove_groups")
+        pre_delete.connect(remove_community_groups, sender=Community,
+                           dispatch_uid="remove_groups")
 
     def test_manage_community_groups(self):
         """Test handling of operations required when saving a Community
@@ -58,3 +65,28 @@ class SignalsTestCase(TestCase):
         community.delete()
         groups_count = Group.objects.count()
         self.assertEqual(groups_count, 0)
+
+    def test_manage_community_groups_query_count(self):
+        """Test that creating a community takes a constant number of queries,
+        independent of the number of community permissions"""
+        User.objects.create(username='foo', password='foobar')
+        systers_user = SystersUser.objects.get()
+        Community.objects.create(name="Foo", slug="foo", order=1,
+                                 admin=systers_user)
+        # a single global and a single row-level permission per role
+        few_permissions = {}
+        for role, perms in group_permissions.items():
+            few_permissions[role] = [
+                perm for perm in (
+                    next(filter(is_global_permission, perms), None),
+                    next(filterfalse(is_global_permission, perms), None))
+                if perm is not None]
+        with patch.dict(group_permissions, few_permissions):
+            with CaptureQueriesContext(connection) as few_queries:
+                Community.objects.create(name="Bar", slug="bar", order=2,
+                                         admin=systers_user)
+        with CaptureQueriesContext(connection) as queries:
+            Community.objects.create(name="Baz", slug="baz", order=3,
+                                     admin=systers_user)
+        self.assertEqual(len(queries), len(few_queries))
+        self.assertEqual(Group.objects.count(), 12)
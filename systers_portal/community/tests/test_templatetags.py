@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.template import Context, Template
+from django.test import TestCase, RequestFactory
+
+from community.models import Community
+from community.signals import manage_community_groups
+from users.models import SystersUser
+
+
+class CommunityPermsTemplateTagTestCase(TestCase):
+    def setUp(self):
+        post_save.connect(manage_community_groups, sender=Community,
+                          dispatch_uid="manage_groups")
+        self.user = User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+
+    def test_community_perms(self):
+        """Test community_perms template tag loads permissions once per
+        request"""
+        template = Template(
+            "{% load community_perms %}"
+            "{% community_perms community as community_perms %}"
+            "{% if 'change_community' in community_perms %}edit{% endif %}"
+            "{% community_perms community as community_perms %}"
+            "{% if 'delete_community_page' in community_perms %}"
+            "delete{% endif %}")
+        request = RequestFactory().get('/')
+        request.user = self.user
+        context = Context({'community': self.community, 'request': request})
+        with self.assertNumQueries(1):
+            self.assertEqual(template.render(context), "editdelete")
+
+        other_user = User.objects.create_user(username='bar',
+                                              password='foobar')
+        request.user = other_user
+        request._community_perms = {}
+        self.assertEqual(template.render(context), "")
@@ -1,82 +1,190 @@
-from django.test import TestCase
-from django.contrib.auth.models import Group, User
-from guardian.shortcuts import get_perms
+from django.test import TestCase, RequestFactory
+from django.contrib.auth.models import Group, User, AnonymousUser
+from django.db.models.signals import post_save, pre_delete
+from guardian.models import GroupObjectPermission
+from guardian.shortcuts import get_perms, assign_perm
 
-from community.models import Community
+from community.constants import COMMUNITY_ADMIN_ROLE
+from community.models import Community, CommunityGroup
 from community.permissions import groups_templates, group_permissions
+from community.signals import manage_community_groups, remove_community_groups
 from community.utils import (create_groups, assign_permissions, remove_groups,
-                             rename_groups, get_groups)
+                             rename_groups, get_groups, get_group,
+                             load_community_perms, get_community_perms,
+                             has_community_perm, is_global_permission,
+                             filter_communities_by_perm)
 from users.models import SystersUser
 
 
 class UtilsTestCase(TestCase):
+    def setUp(self):
+        post_save.disconnect(manage_community_groups, sender=Community,
+                             dispatch_uid="manage_groups")
+        pre_delete.disconnect(remove_community_groups, sender=Community,
+                              dispatch_uid="remove_groups")
+        User.objects.create(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+
+    def tearDown(self):
+        post_save.connect(manage_community_groups, sender=Community,
+                          dispatch_uid="manage_groups")
+        pre_delete.connect(remove_community_groups, sender=Community,
+                           dispatch_uid="remove_groups")
+
     def test_create_groups(self):
-        """Test the creation of groups according to a name"""
-        name = "Foo"
-        groups = create_groups(name)
+        """Test the creation of groups of a community"""
+        groups = create_groups(self.community)
         expected_group_names = []
         for key, group_name in groups_templates.items():
-            expected_group_names.append(group_name.format(name))
+            expected_group_names.append(group_name.format("Foo"))
         group_names = []
-        for group in groups:
+        for group in groups.values():
             group_names.append(group.name)
         self.assertCountEqual(list(expected_group_names), group_names)
+        self.assertCountEqual(groups.keys(), groups_templates.keys())
 
-        community_groups = Group.objects.filter(name__startswith=name)
-        self.assertCountEqual(community_groups, groups)
+        community_groups = Group.objects.filter(name__startswith="Foo")
+        self.assertCountEqual(community_groups, groups.values())
+        for role, group in groups.items():
+            link = CommunityGroup.objects.get(group=group)
+            self.assertEqual(link.community, self.community)
+            self.assertEqual(link.role, role)
+
+    def test_create_groups_twice(self):
+        """Test that creating groups again reuses the existing groups"""
+        groups = create_groups(self.community)
+        self.assertEqual(create_groups(self.community), groups)
+        self.assertEqual(Group.objects.count(), 4)
+        self.assertEqual(CommunityGroup.objects.count(), 4)
 
     def test_remove_groups(self):
-        """Test the removal of groups according to a name"""
-        name = "Foo"
-        create_groups(name)
-        remove_groups(name)
-        community_groups = Group.objects.filter(name__startswith=name)
+        """Test the removal of groups of a community"""
+        create_groups(self.community)
+        remove_groups(self.community)
+        community_groups = Group.objects.filter(name__startswith="Foo")
         self.assertEqual(list(community_groups), [])
+        self.assertEqual(CommunityGroup.objects.count(), 0)
 
     def test_get_groups(self):
-        """Test getting groups according to community name"""
-        groups = get_groups("Foo")
+        """Test getting groups of a community"""
+        groups = get_groups(self.community)
         self.assertSequenceEqual(groups, [])
-        name = "Bar"
-        create_groups(name)
+        create_groups(self.community)
         community_groups = Group.objects.all()
-        groups = get_groups("Bar")
+        groups = get_groups(self.community)
         self.assertCountEqual(community_groups, groups)
-        create_groups("New")
-        groups = get_groups("Bar")
+        community = Community.objects.create(name="Foo Bar", slug="foo-bar",
+                                             order=2, admin=self.systers_user)
+        create_groups(community)
+        groups = get_groups(self.community)
         self.assertCountEqual(community_groups, groups)
 
+    def test_get_group(self):
+        """Test getting the group of a community by its role"""
+        groups = create_groups(self.community)
+        self.assertEqual(get_group(self.community, COMMUNITY_ADMIN_ROLE),
+                         groups[COMMUNITY_ADMIN_ROLE])
+
     def test_rename_groups(self):
         """Test the renaming of groups according to a new name"""
-        old_name = "Foo"
-        new_name = "Bar"
-        create_groups(old_name)
-        groups = rename_groups(old_name, new_name)
+        create_groups(self.community)
+        other_group = Group.objects.create(name="Foo: Other")
+        self.community.name = "Bar"
+        groups = rename_groups(self.community)
         expected_group_names = []
         for key, group_name in groups_templates.items():
-            expected_group_names.append(group_name.format(new_name))
+            expected_group_names.append(group_name.format("Bar"))
         group_names = []
         for group in groups:
             group_names.append(group.name)
         self.assertCountEqual(expected_group_names, group_names)
 
-        community_groups = Group.objects.filter(name__startswith=new_name)
+        community_groups = Group.objects.filter(name__startswith="Bar")
         self.assertCountEqual(community_groups, groups)
-        old_community_groups = Group.objects.filter(name__startswith=old_name)
-        self.assertSequenceEqual(old_community_groups, [])
+        self.assertEqual(Group.objects.get(pk=other_group.pk).name,
+                         "Foo: Other")
+
+        # renaming again doesn't change the names
+        self.assertCountEqual(rename_groups(self.community), groups)
 
     def test_assign_permissions(self):
         """Test assignment of permissions to community groups"""
-        User.objects.create(username='foo', password='foobar')
-        systers_user = SystersUser.objects.get()
-        community = Community.objects.create(name="Foo", slug="foo", order=1,
-                                             admin=systers_user)
-        name = community.name
-        groups = create_groups(name)
-        assign_permissions(community, groups)
+        groups = create_groups(self.community)
+        assign_permissions(self.community, groups)
         for key, value in group_permissions.items():
-            group = Group.objects.get(name=groups_templates[key].format(name))
+            group = groups[key]
             group_perms = [p.codename for p in
                            list(group.permissions.all())]
-            group_perms += get_perms(group, community)
+            group_perms += get_perms(group, self.community)
             self.assertCountEqual(group_perms, value)
+
+    def test_assign_permissions_twice(self):
+        """Test that assigning permissions again doesn't create duplicates"""
+        groups = create_groups(self.community)
+        assign_permissions(self.community, groups)
+        group_perms_count = Group.permissions.through.objects.count()
+        object_perms_count = GroupObjectPermission.objects.count()
+        assign_permissions(self.community, groups)
+        self.assertEqual(Group.permissions.through.objects.count(),
+                         group_perms_count)
+        self.assertEqual(GroupObjectPermission.objects.count(),
+                         object_perms_count)
+
+    def test_load_community_perms(self):
+        """Test loading all permissions of a user towards a community"""
+        groups = create_groups(self.community)
+        assign_permissions(self.community, groups)
+        user = self.systers_user.user
+        self.assertEqual(load_community_perms(user, self.community), set())
+        self.systers_user.join_group(groups[COMMUNITY_ADMIN_ROLE])
+        with self.assertNumQueries(1):
+            perms = load_community_perms(user, self.community)
+        self.assertCountEqual(
+            perms, [perm for perm in group_permissions[COMMUNITY_ADMIN_ROLE]
+                    if not is_global_permission(perm)])
+        self.assertEqual(load_community_perms(AnonymousUser(),
+                                              self.community), set())
+        user.is_superuser = True
+        self.assertIn("approve_community_joinrequest",
+                      load_community_perms(user, self.community))
+
+    def test_get_community_perms(self):
+        """Test that permissions are loaded once per request"""
+        groups = create_groups(self.community)
+        assign_permissions(self.community, groups)
+        self.systers_user.join_group(groups[COMMUNITY_ADMIN_ROLE])
+        request = RequestFactory().get('/')
+        request.user = self.systers_user.user
+        with self.assertNumQueries(1):
+            perms = get_community_perms(request, self.community)
+            self.assertTrue(has_community_perm(request, "change_community",
+                                               self.community))
+            self.assertTrue(has_community_perm(
+                request, "approve_community_joinrequest", self.community))
+        self.assertIn("change_community", perms)
+
+    def test_filter_communities_by_perm(self):
+        """Test filtering communities by a row-level permission of a user"""
+        groups = create_groups(self.community)
+        assign_permissions(self.community, groups)
+        other_community = Community.objects.create(
+            name="Bar", slug="bar", order=2, admin=self.systers_user)
+        user = self.systers_user.user
+        communities = Community.objects.all()
+        perm = "change_community_systersuser"
+        self.assertSequenceEqual(
+            filter_communities_by_perm(user, perm, communities), [])
+        self.systers_user.join_group(groups[COMMUNITY_ADMIN_ROLE])
+        self.assertSequenceEqual(
+            filter_communities_by_perm(user, perm, communities),
+            [self.community])
+        assign_perm(perm, user, other_community)
+        self.assertCountEqual(
+            filter_communities_by_perm(user, perm, communities),
+            [self.community, other_community])
+        self.assertSequenceEqual(
+            filter_communities_by_perm(user, "delete_community", communities),
+            [])
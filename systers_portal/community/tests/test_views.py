@@ -1,11 +1,14 @@
+import json
+
 from django.contrib.auth.models import User, Group
 from django.core.urlresolvers import reverse
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, pre_delete
 from django.test import TestCase
 
 from community.constants import USER_CONTENT_MANAGER
 from community.models import Community, CommunityPage
 from community.signals import manage_community_groups, remove_community_groups
+from community.views import CommunityUsersExportView
 from membership.models import JoinRequest
 from users.models import SystersUser
 
@@ -36,8 +39,8 @@ class EditCommunityProfileViewTestCase(TestCase):
     def setUp(self):
         post_save.connect(manage_community_groups, sender=Community,
                           dispatch_uid="manage_groups")
-        post_delete.connect(remove_community_groups, sender=Community,
-                            dispatch_uid="remove_groups")
+        pre_delete.connect(remove_community_groups, sender=Community,
+                           dispatch_uid="remove_groups")
         self.user = User.objects.create_user(username='foo', password='foobar')
         self.systers_user = SystersUser.objects.get()
         self.community = Community.objects.create(name="Foo", slug="foo",
@@ -425,6 +428,118 @@ class CommunityUsersViewTestCase(TestCase):
         self.assertContains(response, 'Remove')
         self.assertContains(response, 'Transfer ownership')
 
+    def test_community_users_view_pagination(self):
+        """Test GET request to list community members page by page"""
+        for username in ['bar', 'baz', 'qux']:
+            user = User.objects.create_user(username=username,
+                                            password='foobar')
+            self.community.add_member(SystersUser.objects.get(user=user))
+        url = reverse('community_users', kwargs={'slug': 'foo'})
+        self.client.login(username='foo', password='foobar')
+        response = self.client.get(url, {'after': 'baz'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [systers_user.user.username
+             for systers_user in response.context['object_list']],
+            ['foo', 'qux'])
+        self.assertNotContains(response, '<td><a href="/users/bar/">')
+        self.assertIsNone(response.context['next_key'])
+        self.assertEqual(response.context['previous_key'], 'foo')
+        self.assertContains(response, '?before=foo')
+
+
+class CommunityUsersExportViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='foo', password='foobar',
+                                             email='foo@example.com')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+
+    def test_community_users_export_view(self):
+        """Test streaming the export of community members"""
+        url = reverse('export_community_users', kwargs={'slug': 'foo'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+
+        new_user = User.objects.create_user(username='baz', password='foobar',
+                                            first_name="Baz")
+        new_systers_user = SystersUser.objects.get(user=new_user)
+        self.community.add_member(new_systers_user)
+        self.client.login(username='baz', password='foobar')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+
+        self.client.login(username='foo', password='foobar')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], "text/csv")
+        self.assertIn('filename="foo-users.csv"',
+                      response['Content-Disposition'])
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "username,first_name,last_name,email,"
+                                   "country,date_joined,roles")
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("foo,,,foo@example.com,,"))
+        self.assertTrue(lines[1].endswith(",community_admin"))
+        self.assertTrue(lines[2].startswith("baz,Baz,,,,"))
+
+        response = self.client.get(url, {'format': 'jsonl'})
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line.decode()) for line
+                in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row['username'] for row in rows], ['foo', 'baz'])
+        self.assertEqual(rows[0]['roles'], ['community_admin'])
+        self.assertEqual(rows[1]['roles'], [])
+        self.assertNotEqual(rows[1]['date_joined'], "")
+
+        response = self.client.get(url, {'format': 'xml'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_community_users_export_join_date_fallback(self):
+        """Test that members who joined before membership events were
+        recorded are exported with the date of their approved join request"""
+        for username in ['bar', 'baz']:
+            user = User.objects.create_user(username=username,
+                                            password='foobar')
+            # members added before events were recorded have no event
+            self.community.members.add(SystersUser.objects.get(user=user))
+        join_request = JoinRequest.objects.create(
+            user=SystersUser.objects.get(user__username='bar'),
+            community=self.community)
+        join_request.approve()
+        self.client.login(username='foo', password='foobar')
+        url = reverse('export_community_users', kwargs={'slug': 'foo'})
+        response = self.client.get(url, {'format': 'jsonl'})
+        rows = [json.loads(line.decode()) for line
+                in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row['username'] for row in rows],
+                         ['foo', 'bar', 'baz'])
+        self.assertEqual(rows[1]['date_joined'],
+                         join_request.date_approved.isoformat())
+        self.assertEqual(rows[2]['date_joined'], "")
+
+    def test_community_users_export_chunks(self):
+        """Test that members are exported in chunks"""
+        for username in ['bar', 'baz', 'qux']:
+            user = User.objects.create_user(username=username,
+                                            password='foobar')
+            self.community.add_member(SystersUser.objects.get(user=user))
+        self.client.login(username='foo', password='foobar')
+        url = reverse('export_community_users', kwargs={'slug': 'foo'})
+        CommunityUsersExportView.chunk_size = 2
+        try:
+            response = self.client.get(url, {'format': 'jsonl'})
+            content = b"".join(response.streaming_content)
+        finally:
+            CommunityUsersExportView.chunk_size = 2000
+        self.assertEqual(
+            [json.loads(line.decode())['username']
+             for line in content.splitlines()],
+            ['foo', 'bar', 'baz', 'qux'])
+
 
 class UserPermissionGroupsViewTestCase(TestCase):
     def setUp(self):
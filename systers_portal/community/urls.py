@@ -1,9 +1,11 @@
 from django.conf.urls import url
 
+from common.views import CommunitySearchView
 from community.views import (CommunityLandingView, EditCommunityProfileView,
                              ViewCommunityProfileView, CommunityPageView,
                              AddCommunityPageView, EditCommunityPageView,
                              DeleteCommunityPageView, CommunityUsersView,
+                             CommunityUsersExportView,
                              UserPermissionGroupsView)
 
 urlpatterns = [
@@ -23,6 +25,10 @@ urlpatterns = [
         CommunityPageView.as_view(), name="view_community_page"),
     url(r'^(?P<slug>[\w-]+)/users/$', CommunityUsersView.as_view(),
         name="community_users"),
+    url(r'^(?P<slug>[\w-]+)/users/export/$',
+        CommunityUsersExportView.as_view(), name="export_community_users"),
     url(r'^(?P<slug>[\w-]+)/user/(?P<username>[\w.@+-]+)/permissions/$',
         UserPermissionGroupsView.as_view(), name="user_permission_groups"),
+    url(r'^(?P<slug>[\w-]+)/search/$', CommunitySearchView.as_view(),
+        name="search_community"),
 ]
@@ -1,76 +1,338 @@
+from collections import namedtuple
+import time
+
 from django.contrib.auth.models import Group, Permission
-from django.db import transaction
-from guardian.shortcuts import assign_perm
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import connection, transaction
+from django.db.models import Q
+from guardian.models import GroupObjectPermission, UserObjectPermission
 
+from community.constants import (COMMUNITIES_NAVBAR_CACHE_KEY,
+                                 COMMUNITIES_NAVBAR_VERSION_KEY,
+                                 COMMUNITY_PAGES_CACHE_KEY,
+                                 COMMUNITY_PAGES_VERSION_KEY)
 from community.permissions import groups_templates, group_permissions
 
 
-@transaction.atomic
-def create_groups(community_name):
-    """Create groups for a particular Community instance using its name
+MenuPage = namedtuple('MenuPage', ['title', 'slug', 'order'])
+
+NavbarCommunity = namedtuple('NavbarCommunity',
+                             ['name', 'slug', 'order', 'url'])
+
+
+def get_group_names(community_name):
+    """Get the names of the groups of a particular Community instance
 
     :param community_name: string name of community
-    :return: list of community Group objects
+    :return: dict with roles as keys and string Group names as values
     """
-    community_groups = []
-    for key, group_name in groups_templates.items():
-        group, created = Group.objects.get_or_create(
-            name=group_name.format(community_name))
-        community_groups.append(group)
-    return community_groups
+    return dict((role, group_name.format(community_name)) for
+                role, group_name in groups_templates.items())
 
 
 @transaction.atomic
-def remove_groups(community_name):
-    """Remove groups for a particular Community instance using its name
+def create_groups(community):
+    """Create groups for a particular Community instance and link them to the
+    community through CommunityGroup objects
 
-    :param community_name: string name of community
+    :param community: Community object
+    :return: dict with roles as keys and community Group objects as values
+    """
+    from community.models import CommunityGroup
+    names = get_group_names(community.name)
+    existing_names = set(Group.objects.filter(
+        name__in=names.values()).values_list('name', flat=True))
+    missing_names = [name for name in names.values()
+                     if name not in existing_names]
+    if missing_names:
+        Group.objects.bulk_create([Group(name=name) for name in missing_names])
+    groups = dict((group.name, group) for group in
+                  Group.objects.filter(name__in=names.values()))
+    linked_roles = set(CommunityGroup.objects.filter(
+        community=community).values_list('role', flat=True))
+    CommunityGroup.objects.bulk_create([
+        CommunityGroup(community=community, group=groups[name], role=role)
+        for role, name in names.items() if role not in linked_roles])
+    return dict((role, groups[name]) for role, name in names.items())
+
+
+@transaction.atomic
+def remove_groups(community):
+    """Remove groups of a particular Community instance
+
+    :param community: Community object
     """
-    name = "{0}:".format(community_name)
-    Group.objects.filter(name__startswith=name).delete()
+    get_groups(community).delete()
 
 
-def get_groups(community_name):
-    """Get groups of a particular Community instance using its name
+def get_groups(community):
+    """Get groups of a particular Community instance
 
-    :param community_name: string name of Community
+    :param community: Community object
     :return: list of Group objects
     """
-    name = "{0}:".format(community_name)
-    return Group.objects.filter(name__startswith=name)
+    return Group.objects.filter(community_group__community=community)
+
+
+def get_group(community, role):
+    """Get the group of a particular Community instance that has a role
+
+    :param community: Community object
+    :param role: string group role
+    :return: Group object
+    :raises Group.DoesNotExist: if the community has no group with such role
+    """
+    return Group.objects.get(community_group__community=community,
+                             community_group__role=role)
 
 
 @transaction.atomic
-def rename_groups(old_community_name, new_community_name):
-    """Rename groups bound to a Community instance
+def rename_groups(community):
+    """Rename groups bound to a Community instance according to the current
+    community name. All the group names are rewritten by a single UPDATE
+    statement.
 
-    :param old_community_name: string old name of the community
-    :param new_community_name: string new name of the community
+    :param community: Community object
     :return: list of community new Group objects
     """
-    name = "{0}:".format(old_community_name)
-    groups = Group.objects.filter(name__startswith=name)
-    new_community_groups = []
-    for group in groups:
-        old_name, group_name = group.name.rsplit(":", 1)
-        group.name = "{0}:{1}".format(new_community_name, group_name)
-        group.save()
-        new_community_groups.append(group)
-    return new_community_groups
+    from community.models import CommunityGroup
+    names = get_group_names(community.name)
+    quote_name = connection.ops.quote_name
+    group_table = quote_name(Group._meta.db_table)
+    link_table = quote_name(CommunityGroup._meta.db_table)
+    cases = " ".join(["WHEN %s THEN %s"] * len(names))
+    sql = "UPDATE {0} SET {1} = (SELECT CASE {2} {3} END FROM {4} " \
+          "WHERE {4}.{5} = {0}.{6}) " \
+          "WHERE {6} IN (SELECT {5} FROM {4} WHERE {7} = %s)".format(
+              group_table, quote_name('name'), quote_name('role'), cases,
+              link_table, quote_name('group_id'), quote_name('id'),
+              quote_name('community_id'))
+    params = [param for role, name in names.items() for param in (role, name)]
+    params.append(community.pk)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+    return list(get_groups(community))
+
+
+def is_global_permission(codename):
+    """Check if a permission is a global one (related to tags and resource
+    types) rather than a row-level permission towards a community.
+
+    :param codename: string permission codename
+    :return: True if the permission is global, False otherwise
+    """
+    return codename.endswith('tag') or codename.endswith('resourcetype')
 
 
+@transaction.atomic
 def assign_permissions(community, groups):
-    """Assign row-level permissions to community groups and community object
+    """Assign row-level permissions to community groups and community object.
+    All the permissions are resolved with a single query and the missing
+    group permissions and group object permissions are inserted in bulk.
 
     :param community: Community object
-    :param groups: list of Group objects
-    """
-    for key, group_name in groups_templates.items():
-        group = next(
-            g for g in groups if g.name == group_name.format(community.name))
-        for perm in group_permissions[key]:
-            if perm.endswith('tag') or perm.endswith('resourcetype'):
-                group.permissions.add(Permission.objects.get(codename=perm))
-                group.save()
+    :param groups: dict with roles as keys and Group objects as values
+    """
+    community_type = ContentType.objects.get_for_model(community)
+    codenames = set(perm for perms in group_permissions.values()
+                    for perm in perms)
+    global_permissions = {}
+    object_permissions = {}
+    for permission in Permission.objects.filter(
+            codename__in=codenames).select_related('content_type'):
+        if is_global_permission(permission.codename):
+            if permission.content_type.app_label == 'blog':
+                global_permissions[permission.codename] = permission
+        elif permission.content_type_id == community_type.pk:
+            object_permissions[permission.codename] = permission
+
+    group_ids = [group.pk for group in groups.values()]
+    GroupPermission = Group.permissions.through
+    existing_global = set(GroupPermission.objects.filter(
+        group__in=group_ids).values_list('group_id', 'permission_id'))
+    existing_object = set(GroupObjectPermission.objects.filter(
+        group__in=group_ids, content_type=community_type,
+        object_pk=str(community.pk)).values_list('group_id',
+                                                 'permission_id'))
+
+    new_global = []
+    new_object = []
+    for role, group in groups.items():
+        for perm in group_permissions[role]:
+            if is_global_permission(perm):
+                permission = global_permissions[perm]
+                if (group.pk, permission.pk) not in existing_global:
+                    new_global.append(GroupPermission(
+                        group_id=group.pk, permission_id=permission.pk))
             else:
-                assign_perm(perm, group, community)
+                permission = object_permissions[perm]
+                if (group.pk, permission.pk) not in existing_object:
+                    new_object.append(GroupObjectPermission(
+                        group_id=group.pk, permission_id=permission.pk,
+                        content_type=community_type,
+                        object_pk=str(community.pk)))
+    if new_global:
+        GroupPermission.objects.bulk_create(new_global)
+    if new_object:
+        GroupObjectPermission.objects.bulk_create(new_object)
+
+
+def load_community_perms(user, community):
+    """Load all the row-level permissions a user has towards a community,
+    either directly or through the user groups, with a single query.
+
+    :param user: User object
+    :param community: Community object
+    :return: set of string permission codenames
+    """
+    if not user.is_active:
+        return set()
+    community_type = ContentType.objects.get_for_model(community)
+    permissions = Permission.objects.filter(content_type=community_type)
+    if not user.is_superuser:
+        object_pk = str(community.pk)
+        user_perms = Q(userobjectpermission__user=user,
+                       userobjectpermission__object_pk=object_pk)
+        group_perms = Q(groupobjectpermission__group__user=user,
+                        groupobjectpermission__object_pk=object_pk)
+        permissions = permissions.filter(user_perms | group_perms)
+    return set(permissions.values_list('codename', flat=True).distinct())
+
+
+def get_community_perms(request, community):
+    """Get all the row-level permissions the request user has towards a
+    community. The permissions are loaded once per request and then served
+    from the request object.
+
+    :param request: HttpRequest object
+    :param community: Community object
+    :return: set of string permission codenames
+    """
+    if not hasattr(request, '_community_perms'):
+        request._community_perms = {}
+    if community.pk not in request._community_perms:
+        request._community_perms[community.pk] = load_community_perms(
+            request.user, community)
+    return request._community_perms[community.pk]
+
+
+def has_community_perm(request, perm, community):
+    """Check if the request user has a row-level permission towards a
+    community. The permission holds true for superusers.
+
+    :param request: HttpRequest object
+    :param perm: string permission codename
+    :param community: Community object
+    :return: True if the user has the permission, False otherwise
+    """
+    return perm in get_community_perms(request, community)
+
+
+def filter_communities_by_perm(user, perm, communities):
+    """Filter communities to the ones towards which a user holds a row-level
+    permission, either directly or through the user groups. The permission
+    check is added to the communities query, so no extra queries are run.
+
+    :param user: User object
+    :param perm: string permission codename
+    :param communities: QuerySet of Community objects
+    :return: QuerySet of filtered Community objects
+    """
+    qn = connection.ops.quote_name
+    community_type = ContentType.objects.get_for_model(communities.model)
+    object_pk = "CAST({0}.{1} AS VARCHAR(255))".format(
+        qn(communities.model._meta.db_table), qn('id'))
+    user_groups_table = qn(user.groups.through._meta.db_table)
+    permission_table = qn(Permission._meta.db_table)
+    subquery = "EXISTS (SELECT 1 FROM {0} obj_perm {1} " \
+               "INNER JOIN {2} perm ON obj_perm.permission_id = perm.id " \
+               "WHERE {3} AND perm.codename = %s AND " \
+               "obj_perm.content_type_id = %s AND obj_perm.object_pk = {4})"
+    group_perm = subquery.format(
+        qn(GroupObjectPermission._meta.db_table),
+        "INNER JOIN {0} user_group ON obj_perm.group_id = "
+        "user_group.group_id".format(user_groups_table),
+        permission_table, "user_group.user_id = %s", object_pk)
+    user_perm = subquery.format(
+        qn(UserObjectPermission._meta.db_table), "", permission_table,
+        "obj_perm.user_id = %s", object_pk)
+    params = [user.pk, perm, community_type.pk]
+    return communities.extra(
+        where=["{0} OR {1}".format(group_perm, user_perm)],
+        params=params + params)
+
+
+def get_cache_version(version_key):
+    """Get the current version of a versioned cache entry. If the version is
+    missing from the cache (never set or evicted), a new one is started from
+    the current timestamp, so that stale entries stored under older versions
+    are never read again.
+
+    :param version_key: string cache key holding the version number
+    :return: integer version
+    """
+    version = cache.get(version_key)
+    if version is None:
+        version = int(time.time() * 1000)
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key, version)
+    return version
+
+
+def bump_cache_version(version_key):
+    """Invalidate all the entries stored under the current version of a
+    versioned cache entry.
+
+    :param version_key: string cache key holding the version number
+    """
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, int(time.time() * 1000), None)
+
+
+def get_navbar_communities():
+    """Get a snapshot of all communities, used to render the navigation bar.
+    The snapshot is kept in cache and rebuilt after a Community object was
+    saved or deleted, or once the cache timeout expires.
+
+    :return: list of NavbarCommunity tuples ordered by community order
+    """
+    from community.models import Community
+    version = get_cache_version(COMMUNITIES_NAVBAR_VERSION_KEY)
+    communities = cache.get(COMMUNITIES_NAVBAR_CACHE_KEY, version=version)
+    if communities is None:
+        rows = Community.objects.order_by('order').values_list(
+            'name', 'slug', 'order')
+        communities = [
+            NavbarCommunity(name, slug, order,
+                            reverse('view_community_landing',
+                                    kwargs={'slug': slug}))
+            for name, slug, order in rows]
+        cache.set(COMMUNITIES_NAVBAR_CACHE_KEY, communities,
+                  version=version)
+    return communities
+
+
+def get_menu_pages(community):
+    """Get a snapshot of the pages of a community, used to render the
+    community menu. The snapshot is kept in cache and rebuilt after a
+    CommunityPage object of the community was saved or deleted, or once the
+    cache timeout expires.
+
+    :param community: Community object
+    :return: list of MenuPage tuples ordered by page order
+    """
+    from community.models import CommunityPage
+    version = get_cache_version(
+        COMMUNITY_PAGES_VERSION_KEY.format(community.pk))
+    cache_key = COMMUNITY_PAGES_CACHE_KEY.format(community.pk)
+    pages = cache.get(cache_key, version=version)
+    if pages is None:
+        rows = CommunityPage.objects.filter(community=community).order_by(
+            'order').values_list('title', 'slug', 'order')
+        pages = [MenuPage(*row) for row in rows]
+        cache.set(cache_key, pages, version=version)
+    return pages
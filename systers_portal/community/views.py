@@ -1,15 +1,26 @@
+from collections import OrderedDict
+import csv
+import json
+
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.views.generic import DetailView, RedirectView, ListView, FormView
+from django.views.generic import (DetailView, RedirectView, ListView, FormView,
+                                  View)
 from django.views.generic.edit import UpdateView, CreateView, DeleteView
 from braces.views import LoginRequiredMixin, PermissionRequiredMixin
 
-from common.mixins import UserDetailsMixin
+from common.mixins import UserDetailsMixin, KeysetPaginationMixin
 from community.forms import (CommunityForm, AddCommunityPageForm,
                              EditCommunityPageForm, PermissionGroupsForm)
 from community.mixins import CommunityMenuMixin
-from community.models import Community, CommunityPage
+from community.models import Community, CommunityGroup, CommunityPage
+from community.utils import (get_community_perms, has_community_perm,
+                             get_menu_pages)
+from membership.constants import MEMBER_ADDED
+from membership.models import JoinRequest, MembershipEvent
 from users.models import SystersUser
 
 
@@ -26,9 +37,8 @@ class CommunityLandingView(RedirectView):
           lowest order (aka first page)
         """
         community = get_object_or_404(Community, slug=kwargs['slug'])
-        community_pages = CommunityPage.objects.filter(
-            community=community).order_by('order')
-        if community_pages.exists():
+        community_pages = get_menu_pages(community)
+        if community_pages:
             community_page_slug = community_pages[0].slug
             return reverse("view_community_page",
                            kwargs={"slug": community.slug,
@@ -63,7 +73,7 @@ class EditCommunityProfileView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to change community
         profile. The permission holds true for superusers."""
         community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("change_community", community)
+        return has_community_perm(request, "change_community", community)
 
 
 class CommunityPageView(UserDetailsMixin, CommunityMenuMixin, DetailView):
@@ -133,7 +143,8 @@ class AddCommunityPageView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to add new community
         page. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("add_community_page", self.community)
+        return has_community_perm(request, "add_community_page",
+                                  self.community)
 
 
 class EditCommunityPageView(LoginRequiredMixin, PermissionRequiredMixin,
@@ -163,8 +174,8 @@ class EditCommunityPageView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to edit community
         news. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("change_community_page",
-                                     self.community)
+        return has_community_perm(request, "change_community_page",
+                                  self.community)
 
 
 class DeleteCommunityPageView(LoginRequiredMixin, PermissionRequiredMixin,
@@ -194,21 +205,22 @@ class DeleteCommunityPageView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permissions to delete community
         page. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("delete_community_page", self.community)
+        return has_community_perm(request, "delete_community_page",
+                                  self.community)
 
 
 class CommunityUsersView(LoginRequiredMixin, PermissionRequiredMixin,
-                         ListView):
+                         KeysetPaginationMixin, ListView):
     """Manage Community users view"""
     template_name = "community/users.html"
-    paginate_by = 50
+    keyset_field = 'user__username'
     raise_exception = True
     # TODO: add `redirect_unauthenticated_users = True` when django-braces will
     # reach version 1.5
 
     def get_queryset(self):
         """Set ListView queryset to all the members of the community"""
-        return self.community.members.all()
+        return self.community.members.select_related('user')
 
     def get_context_data(self, **kwargs):
         """Add Community object to the context"""
@@ -221,12 +233,131 @@ class CommunityUsersView(LoginRequiredMixin, PermissionRequiredMixin,
         users (add, change, delete). The permission holds true for
         superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        add_perm = request.user.has_perm("add_community_systersuser",
-                                         self.community)
-        change_perm = request.user.has_perm("change_community_systersuser",
-                                            self.community)
-        delete_perm = request.user.has_perm("delete_community_systersuser",
-                                            self.community)
+        community_perms = get_community_perms(request, self.community)
+        add_perm = "add_community_systersuser" in community_perms
+        change_perm = "change_community_systersuser" in community_perms
+        delete_perm = "delete_community_systersuser" in community_perms
+        return add_perm and change_perm and delete_perm
+
+
+class Echo(object):
+    """File-like object that returns what is written to it instead of
+    buffering it, used to stream the lines of a csv.writer"""
+    def write(self, value):
+        return value
+
+
+class CommunityUsersExportView(LoginRequiredMixin, PermissionRequiredMixin,
+                               View):
+    """Export Community users as a CSV or JSONL (with `?format=jsonl`) file.
+    The file is streamed while the members are read in chunks, hence memory
+    use doesn't depend on the number of members."""
+    chunk_size = 2000
+    fields = ['username', 'first_name', 'last_name', 'email', 'country',
+              'date_joined', 'roles']
+    content_types = {'csv': "text/csv", 'jsonl': "application/x-jsonlines"}
+    raise_exception = True
+    # TODO: add `redirect_unauthenticated_users = True` when django-braces will
+    # reach version 1.5
+
+    def get(self, request, *args, **kwargs):
+        """Stream the members of the community in the requested format"""
+        file_format = request.GET.get('format', 'csv')
+        if file_format not in self.content_types:
+            raise Http404
+        lines = self.get_csv_lines() if file_format == 'csv' else \
+            self.get_jsonl_lines()
+        response = StreamingHttpResponse(
+            lines, content_type=self.content_types[file_format])
+        response['Content-Disposition'] = \
+            'attachment; filename="{0}-users.{1}"'.format(self.community.slug,
+                                                          file_format)
+        return response
+
+    def get_csv_lines(self):
+        """Yield the CSV header and a CSV line per member"""
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.fields)
+        for row in self.get_rows():
+            row['roles'] = ";".join(row['roles'])
+            yield writer.writerow(list(row.values()))
+
+    def get_jsonl_lines(self):
+        """Yield a JSON object line per member"""
+        for row in self.get_rows():
+            yield json.dumps(row) + "\n"
+
+    def get_queryset(self):
+        """Get the community members together with their user, country, the
+        date they joined the community and the roles of their community
+        groups, all in a single query.
+
+        The join date is the date the member was last recorded as added to
+        the community, or, for members who joined before membership events
+        were recorded, the date their join request was approved. It is empty for members who joined
+        before events were recorded without a join request."""
+        qn = connection.ops.quote_name
+        systers_user_table = qn(SystersUser._meta.db_table)
+        select = OrderedDict([
+            ('date_joined_community',
+             "COALESCE((SELECT MAX(e.date_created) FROM {0} e "
+             "WHERE e.subject_id = {1}.id AND e.community_id = %s "
+             "AND e.action = %s), "
+             "(SELECT MAX(COALESCE(jr.date_approved, jr.date_created)) "
+             "FROM {2} jr WHERE jr.user_id = {1}.id "
+             "AND jr.community_id = %s AND jr.is_approved))".format(
+                 qn(MembershipEvent._meta.db_table), systers_user_table,
+                 qn(JoinRequest._meta.db_table))),
+            ('community_roles',
+             "ARRAY(SELECT cg.role FROM {0} ug INNER JOIN {1} cg ON "
+             "cg.group_id = ug.group_id WHERE ug.user_id = {2}.user_id AND "
+             "cg.community_id = %s ORDER BY cg.role)".format(
+                 qn(User.groups.through._meta.db_table),
+                 qn(CommunityGroup._meta.db_table), systers_user_table)),
+        ])
+        return self.community.members.select_related('user', 'country').\
+            extra(select=select, select_params=[
+                self.community.pk, MEMBER_ADDED, self.community.pk,
+                self.community.pk]).\
+            order_by('pk')
+
+    def get_rows(self):
+        """Yield an ordered dict of exported fields per member. Members are
+        read in chunks by primary key, since iterating a single query would
+        still load all rows in the database client.
+        """
+        queryset = self.get_queryset()
+        last_pk = 0
+        while True:
+            count = 0
+            chunk = queryset.filter(pk__gt=last_pk)[:self.chunk_size]
+            for systers_user in chunk.iterator():
+                count += 1
+                last_pk = systers_user.pk
+                user = systers_user.user
+                date_joined = systers_user.date_joined_community
+                yield OrderedDict([
+                    ('username', user.username),
+                    ('first_name', user.first_name),
+                    ('last_name', user.last_name),
+                    ('email', user.email),
+                    ('country', str(systers_user.country or "")),
+                    ('date_joined',
+                     date_joined.isoformat() if date_joined else ""),
+                    ('roles', systers_user.community_roles),
+                ])
+            if count < self.chunk_size:
+                break
+
+    def check_permissions(self, request):
+        """Check if the request user has the permission to manage community
+        users (add, change, delete). The permission holds true for
+        superusers."""
+        self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
+        community_perms = get_community_perms(request, self.community)
+        add_perm = "add_community_systersuser" in community_perms
+        change_perm = "change_community_systersuser" in community_perms
+        delete_perm = "delete_community_systersuser" in community_perms
         return add_perm and change_perm and delete_perm
 
 
@@ -251,6 +382,7 @@ class UserPermissionGroupsView(LoginRequiredMixin, PermissionRequiredMixin,
         user = User.objects.get(username=username)
         self.systersuser = SystersUser.objects.get(user=user)
         kwargs['user'] = self.systersuser
+        kwargs['actor'] = SystersUser.objects.get(user=self.request.user)
         return kwargs
 
     def get_context_data(self, **kwargs):
@@ -271,5 +403,5 @@ class UserPermissionGroupsView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permission to change user
         permission groups. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("change_community_systersuser",
-                                     self.community)
+        return has_community_perm(request, "change_community_systersuser",
+                                  self.community)
@@ -0,0 +1 @@
+import meetup.signals  # NOQA
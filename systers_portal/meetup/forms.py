@@ -1,11 +1,14 @@
 from django import forms
 from django.utils import timezone
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from common.forms import ModelFormWithHelper
 from common.helpers import SubmitCancelFormHelper
 from meetup.models import Meetup, MeetupLocation
+from membership.constants import MEMBER_ADDED
+from membership.models import MembershipEvent
 from users.models import SystersUser
 
 
@@ -65,7 +68,11 @@ class EditMeetupForm(ModelFormWithHelper):
 
 
 class AddMeetupLocationMemberForm(ModelFormWithHelper):
-    """Form for adding a new member to a meetup location"""
+    """Form for adding a new member to a meetup location. The user who adds the member can be
+    provided when initializing the form:
+
+    * actor - SystersUser object of the currently logged in user
+    """
     class Meta:
         model = User
         fields = ('username',)
@@ -73,19 +80,24 @@ class AddMeetupLocationMemberForm(ModelFormWithHelper):
         helper_cancel_href = "{% url 'members_meetup_location' meetup_location.slug %}"
 
     def __init__(self, *args, **kwargs):
+        self.actor = kwargs.pop('actor', None)
         super(AddMeetupLocationMemberForm, self).__init__(*args, **kwargs)
         self.meetup_location = kwargs.get('instance')
         if self.is_bound:
             self.username = kwargs['data']['username']
 
     def save(self, commit=True):
-        """Override save to map input username to User and append it to the meetup location."""
+        """Override save to map input username to User and append it to the meetup location.
+        The new membership is recorded as a membership event in the same transaction."""
         instance = super(AddMeetupLocationMemberForm, self).save(commit=False)
         instance.username = self.username
         user = get_object_or_404(User, username=instance.username)
         systersuser = get_object_or_404(SystersUser, user=user)
         if systersuser not in self.meetup_location.members.all():
-            self.meetup_location.members.add(systersuser)
+            with transaction.atomic():
+                self.meetup_location.members.add(systersuser)
+                MembershipEvent.objects.log(MEMBER_ADDED, [systersuser], actor=self.actor,
+                                            meetup_location=self.meetup_location)
         if commit:
             instance.save()
         return instance
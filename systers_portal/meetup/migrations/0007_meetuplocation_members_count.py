@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.db.models import Count
+
+
+def count_members(apps, schema_editor):
+    """Fill in the members count of every existing object"""
+    MeetupLocation = apps.get_model('meetup', 'MeetupLocation')
+    rows = MeetupLocation.objects.annotate(actual_count=Count('members')).values_list(
+        'pk', 'actual_count')
+    for pk, actual_count in rows:
+        MeetupLocation.objects.filter(pk=pk).update(members_count=actual_count)
+
+
+def reset_members_count(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetup', '0006_merge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meetuplocation',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Members count', editable=False),
+            preserve_default=True,
+        ),
+        migrations.RunPython(count_members, reset_members_count),
+    ]
@@ -2,11 +2,11 @@ from django.db import models
 from cities_light.models import City
 from ckeditor.fields import RichTextField
 
-
+from common.models import MembersCountMixin
 from users.models import SystersUser
 
 
-class MeetupLocation(models.Model):
+class MeetupLocation(MembersCountMixin, models.Model):
     """Manage details of Meetup Location groups"""
     name = models.CharField(max_length=255, unique=True, verbose_name="Name")
     slug = models.SlugField(max_length=150, unique=True, verbose_name="Slug")
@@ -19,6 +19,8 @@ class MeetupLocation(models.Model):
     members = models.ManyToManyField(SystersUser, blank=True,
                                      related_name="Members",
                                      verbose_name="Members")
+    members_count = models.PositiveIntegerField(default=0, editable=False,
+                                                verbose_name="Members count")
     sponsors = RichTextField(verbose_name="Sponsors", blank=True)
     join_requests = models.ManyToManyField(SystersUser,
                                            related_name="Join Requests",
@@ -0,0 +1,11 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from meetup.models import MeetupLocation
+
+
+@receiver(m2m_changed, sender=MeetupLocation.members.through,
+          dispatch_uid="update_meetup_location_members_count")
+def update_meetup_location_members_count(sender, **kwargs):
+    """Keep the members count of a MeetupLocation in sync with its members"""
+    MeetupLocation.update_members_count(**kwargs)
@@ -8,6 +8,7 @@ from cities_light.models import City, Country
 from meetup.forms import (AddMeetupForm, EditMeetupForm, AddMeetupLocationMemberForm,
                           AddMeetupLocationForm, EditMeetupLocationForm)
 from meetup.models import Meetup, MeetupLocation
+from membership.models import MembershipEvent
 from users.models import SystersUser
 
 
@@ -118,6 +119,9 @@ class AddMeetupLocationMemberFormTestCase(MeetupFormTestCaseBase, TestCase):
 
         members = self.meetup_location.members.all()
         self.assertTrue(self.systers_user2 in members)
+        event = MembershipEvent.objects.get(meetup_location=self.meetup_location)
+        self.assertEqual(event.subject, self.systers_user2)
+        self.assertEqual(event.action, "member_added")
 
 
 class AddMeetupLocationFormTestCase(MeetupFormTestCaseBase, TestCase):
@@ -53,3 +53,11 @@ class RsvpTestCase(MeetupBaseTestCase, TestCase):
 
     def test_str(self):
         self.assertEqual(str(self.rsvp), "foo RSVP for meetup Test Meetup")
+
+    def test_members_count(self):
+        """Test that members count follows changes of members"""
+        self.meetup_location.members.add(self.systers_user)
+        meetup_location = MeetupLocation.objects.get()
+        self.assertEqual(meetup_location.members_count, 1)
+        meetup_location.members.remove(self.systers_user)
+        self.assertEqual(MeetupLocation.objects.get().members_count, 0)
@@ -5,6 +5,7 @@ from django.utils import timezone
 from cities_light.models import City, Country
 
 from meetup.models import Meetup, MeetupLocation
+from membership.models import MembershipEvent
 from users.models import SystersUser
 
 
@@ -357,6 +358,21 @@ class AddMeetupLocationMemberViewTestCase(MeetupLocationViewBaseTestCase, TestCa
         self.assertTrue(response.url.endswith('/meetup/foo/members/'))
         self.assertEqual(response.status_code, 302)
 
+    def test_post_add_meetup_location_member_view_event(self):
+        """Test that adding a member records a membership event"""
+        url = reverse("add_member_meetup_location", kwargs={'slug': 'foo'})
+        self.client.login(username='foo', password='foobar')
+        self.client.post(url, data={'username': 'baz'})
+        self.assertTrue(self.systers_user2 in self.meetup_location.members.all())
+        event = MembershipEvent.objects.get(meetup_location=self.meetup_location,
+                                            action="member_added")
+        self.assertEqual(event.subject, self.systers_user2)
+        self.assertEqual(event.actor, self.systers_user)
+
+        self.client.post(url, data={'username': 'baz'})
+        self.assertEqual(MembershipEvent.objects.filter(
+            meetup_location=self.meetup_location).count(), 1)
+
 
 class RemoveMeetupLocationOrganizerViewTestCase(MeetupLocationViewBaseTestCase, TestCase):
     def setUp(self):
@@ -428,6 +444,10 @@ class MakeMeetupLocationOrganizerViewTestCase(MeetupLocationViewBaseTestCase, Te
         self.assertRedirects(response, 'meetup/foo/members/')
         self.assertEqual(len(self.meetup_location.members.all()), 2)
         self.assertEqual(len(self.meetup_location.organizers.all()), 2)
+        event = MembershipEvent.objects.get(meetup_location=self.meetup_location)
+        self.assertEqual(event.action, "organizer_added")
+        self.assertEqual(event.subject, self.systers_user2)
+        self.assertEqual(event.actor, self.systers_user)
 
 
 class JoinMeetupLocationViewTestCase(MeetupLocationViewBaseTestCase, TestCase):
@@ -1,6 +1,7 @@
 import datetime
 
 from django.core.urlresolvers import reverse
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.views.generic import DeleteView, TemplateView, RedirectView
 from django.views.generic.detail import DetailView
@@ -14,6 +15,9 @@ from meetup.forms import (AddMeetupForm, EditMeetupForm, AddMeetupLocationMember
                           AddMeetupLocationForm, EditMeetupLocationForm)
 from meetup.mixins import MeetupLocationMixin
 from meetup.models import Meetup, MeetupLocation
+from membership.constants import (MEMBER_ADDED, MEMBER_REMOVED, ORGANIZER_ADDED,
+                                  ORGANIZER_REMOVED)
+from membership.models import MembershipEvent
 from users.models import SystersUser
 
 
@@ -183,11 +187,17 @@ class RemoveMeetupLocationMemberView(LoginRequiredMixin, MeetupLocationMixin, Re
         self.meetup_location = get_object_or_404(MeetupLocation, slug=self.kwargs['slug'])
         user = get_object_or_404(User, username=self.kwargs.get('username'))
         systersuser = get_object_or_404(SystersUser, user=user)
+        actor = SystersUser.objects.get(user=self.request.user)
         organizers = self.meetup_location.organizers.all()
-        if systersuser in organizers and len(organizers) > 1:
-            self.meetup_location.organizers.remove(systersuser)
-        if systersuser not in self.meetup_location.organizers.all():
-            self.meetup_location.members.remove(systersuser)
+        with transaction.atomic():
+            if systersuser in organizers and len(organizers) > 1:
+                self.meetup_location.organizers.remove(systersuser)
+                MembershipEvent.objects.log(ORGANIZER_REMOVED, [systersuser], actor=actor,
+                                            meetup_location=self.meetup_location)
+            if systersuser not in self.meetup_location.organizers.all():
+                self.meetup_location.members.remove(systersuser)
+                MembershipEvent.objects.log(MEMBER_REMOVED, [systersuser], actor=actor,
+                                            meetup_location=self.meetup_location)
         return reverse('members_meetup_location', kwargs={'slug': self.meetup_location.slug})
 
     def get_meetup_location(self):
@@ -206,6 +216,12 @@ class AddMeetupLocationMemberView(LoginRequiredMixin, MeetupLocationMixin, Updat
         self.get_meetup_location()
         return reverse('members_meetup_location', kwargs={'slug': self.meetup_location.slug})
 
+    def get_form_kwargs(self):
+        """Add the request user to the form kwargs, to record who added the member"""
+        kwargs = super(AddMeetupLocationMemberView, self).get_form_kwargs()
+        kwargs.update({'actor': SystersUser.objects.get(user=self.request.user)})
+        return kwargs
+
     def get_meetup_location(self):
         self.meetup_location = get_object_or_404(MeetupLocation, slug=self.kwargs['slug'])
         return self.meetup_location
@@ -223,7 +239,11 @@ class RemoveMeetupLocationOrganizerView(LoginRequiredMixin, MeetupLocationMixin,
         systersuser = get_object_or_404(SystersUser, user=user)
         organizers = self.meetup_location.organizers.all()
         if systersuser in organizers and len(organizers) > 1:
-            self.meetup_location.organizers.remove(systersuser)
+            actor = SystersUser.objects.get(user=self.request.user)
+            with transaction.atomic():
+                self.meetup_location.organizers.remove(systersuser)
+                MembershipEvent.objects.log(ORGANIZER_REMOVED, [systersuser], actor=actor,
+                                            meetup_location=self.meetup_location)
         return reverse('members_meetup_location', kwargs={'slug': self.meetup_location.slug})
 
     def get_meetup_location(self):
@@ -242,7 +262,11 @@ class MakeMeetupLocationOrganizerView(LoginRequiredMixin, MeetupLocationMixin, R
         systersuser = get_object_or_404(SystersUser, user=user)
         organizers = self.meetup_location.organizers.all()
         if systersuser not in organizers:
-            self.meetup_location.organizers.add(systersuser)
+            actor = SystersUser.objects.get(user=self.request.user)
+            with transaction.atomic():
+                self.meetup_location.organizers.add(systersuser)
+                MembershipEvent.objects.log(ORGANIZER_ADDED, [systersuser], actor=actor,
+                                            meetup_location=self.meetup_location)
         return reverse('members_meetup_location', kwargs={'slug': self.meetup_location.slug})
 
     def get_meetup_location(self):
@@ -309,8 +333,12 @@ class ApproveMeetupLocationJoinRequestView(LoginRequiredMixin, MeetupLocationMix
         self.meetup_location = get_object_or_404(MeetupLocation, slug=self.kwargs['slug'])
         user = get_object_or_404(User, username=self.kwargs.get('username'))
         systersuser = get_object_or_404(SystersUser, user=user)
-        self.meetup_location.members.add(systersuser)
-        self.meetup_location.join_requests.remove(systersuser)
+        actor = SystersUser.objects.get(user=self.request.user)
+        with transaction.atomic():
+            self.meetup_location.members.add(systersuser)
+            self.meetup_location.join_requests.remove(systersuser)
+            MembershipEvent.objects.log(MEMBER_ADDED, [systersuser], actor=actor,
+                                        meetup_location=self.meetup_location)
         return reverse('join_requests_meetup_location', kwargs={'slug': self.meetup_location.slug})
 
     def get_meetup_location(self):
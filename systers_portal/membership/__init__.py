@@ -1 +1 @@
-__author__ = 'ana'
+import membership.signals  # NOQA
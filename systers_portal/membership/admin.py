@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from membership.models import JoinRequest
+from membership.models import JoinRequest, Notification
 
 
 admin.site.register(JoinRequest)
+admin.site.register(Notification)
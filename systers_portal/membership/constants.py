@@ -6,6 +6,39 @@ NO_PENDING_JOIN_REQUEST = "no_pending_join_request"
 NOT_MEMBER = "not_member"
 OK = "ok"
 
+# join requests moderation actions
+APPROVE = "approve"
+REJECT = "reject"
+
+# membership events actions
+MEMBER_ADDED = "member_added"
+MEMBER_REMOVED = "member_removed"
+MEMBER_LEFT = "member_left"
+ADMIN_CHANGED = "admin_changed"
+GROUP_JOINED = "group_joined"
+GROUP_LEFT = "group_left"
+ORGANIZER_ADDED = "organizer_added"
+ORGANIZER_REMOVED = "organizer_removed"
+membership_event_actions = (
+    (MEMBER_ADDED, "Became member"),
+    (MEMBER_REMOVED, "Removed from members"),
+    (MEMBER_LEFT, "Left"),
+    (ADMIN_CHANGED, "Became admin"),
+    (GROUP_JOINED, "Joined group"),
+    (GROUP_LEFT, "Left group"),
+    (ORGANIZER_ADDED, "Became organizer"),
+    (ORGANIZER_REMOVED, "No longer organizer"),
+)
+
+# notifications sent to the user
+JOIN_REQUEST_APPROVED_SUBJECT = "Welcome to {0} community"
+JOIN_REQUEST_APPROVED_BODY = "Your request to join {0} community was " \
+                             "approved. You are now a member of the " \
+                             "community."
+JOIN_REQUEST_REJECTED_SUBJECT = "Your request to join {0} community"
+JOIN_REQUEST_REJECTED_BODY = "Unfortunately, your request to join {0} " \
+                             "community was rejected."
+
 # messages displayed to the user
 USER_ALREADY_MEMBER_MSG = "{0} is already a member of {1} community."
 USER_MEMBER_SUCCESS_MSG = "{0} successfully became a member of {1} community."
@@ -30,6 +63,9 @@ NOT_MEMBER_MSG = "You are not a member of {0} community, hence you can't " \
                  "leave the community."
 NEW_ADMIN_SUCCESS_MSG = "The new {0} community admin is {1}. You no longer " \
                         "have any admin permissions in this community."
+JOIN_REQUEST_NOT_PENDING_MSG = "Join request #{0} is no longer pending."
+NO_JOIN_REQUESTS_SELECTED_MSG = "Select at least one join request to " \
+                                "approve or reject."
 REMOVE_OK_MSG = "{0} is no longer member of {1} community."
 REMOVE_NOT_MEMBER_MSG = "{0} is not a member of {1} community, hence the " \
                         "user can't be removed from the community members."
@@ -1,19 +1,47 @@
 from django import forms
 
 from common.helpers import SubmitCancelFormHelper
+from membership.constants import APPROVE, REJECT
+
+
+class MultipleIntegerField(forms.Field):
+    """Field that accepts a list of integers, e.g. the ids of the objects
+    selected with checkboxes"""
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        'invalid_list': "Enter a list of whole numbers.",
+    }
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted(set(int(item) for item in value))
+        except (TypeError, ValueError):
+            raise forms.ValidationError(self.error_messages['invalid_list'],
+                                        code='invalid_list')
 
 
 class TransferOwnershipForm(forms.Form):
-    """Form with a single field that allow a single choice out of a list of
-    members of a community. Used to select the new admin of a community."""
+    """Form with a single field that accepts the id of a member of a
+    community, other than the admin. Used to select the new admin of a
+    community, which is looked up with a member search instead of listing all
+    members."""
     def __init__(self, *args, **kwargs):
         self.community = kwargs.pop('community')
         super(TransferOwnershipForm, self).__init__(*args, **kwargs)
-        members = self.community.members.all()
-        members = members.exclude(pk=self.community.admin.pk)
-        choices = [(member.id, str(member)) for member in members]
-        self.fields['new_admin'] = forms.ChoiceField(
-            choices=choices, label="New community admin")
+        members = self.community.members.exclude(
+            pk=self.community.admin_id).select_related('user')
+        self.fields['new_admin'] = forms.ModelChoiceField(
+            queryset=members, label="New community admin",
+            widget=forms.HiddenInput)
 
         self.helper = SubmitCancelFormHelper(
             self, cancel_href="{% url 'user' user.username %}")
+
+
+class JoinRequestsModerationForm(forms.Form):
+    """Form to approve or reject multiple join requests at once"""
+    action = forms.ChoiceField(choices=((APPROVE, "Approve"),
+                                        (REJECT, "Reject")))
+    join_requests = MultipleIntegerField()
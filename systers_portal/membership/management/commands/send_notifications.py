@@ -0,0 +1,19 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from membership.models import Notification
+
+
+class Command(BaseCommand):
+    help = "Send pending notifications by email over a single connection " \
+           "of the configured email backend."
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', dest='batch_size', type='int',
+                    default=100,
+                    help="Maximum number of notifications read at once."),
+    )
+
+    def handle(self, *args, **options):
+        sent = Notification.objects.send_pending(options['batch_size'])
+        self.stdout.write("Sent {0} notifications.".format(sent))
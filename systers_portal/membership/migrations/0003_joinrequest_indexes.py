@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0002_joinrequest_date_approved'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='joinrequest',
+            index_together=set([('community', 'is_approved', 'date_created'),
+                                ('user', 'community', 'date_created')]),
+        ),
+        # keep only the latest pending join request of each user to each
+        # community before enforcing a single pending join request
+        migrations.RunSQL(
+            "DELETE FROM membership_joinrequest WHERE NOT is_approved AND "
+            "EXISTS (SELECT 1 FROM membership_joinrequest newer "
+            "WHERE newer.user_id = membership_joinrequest.user_id AND "
+            "newer.community_id = membership_joinrequest.community_id AND "
+            "NOT newer.is_approved AND "
+            "(newer.date_created > membership_joinrequest.date_created OR "
+            "(newer.date_created = membership_joinrequest.date_created AND "
+            "newer.id > membership_joinrequest.id)))",
+            reverse_sql="",
+        ),
+        migrations.RunSQL(
+            "CREATE UNIQUE INDEX membership_joinrequest_pending_uniq "
+            "ON membership_joinrequest (user_id, community_id) "
+            "WHERE NOT is_approved",
+            reverse_sql="DROP INDEX membership_joinrequest_pending_uniq",
+        ),
+    ]
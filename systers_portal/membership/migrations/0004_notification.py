@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_squashed_0003_auto_20160207_1550'),
+        ('membership', '0003_joinrequest_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_sent', models.DateTimeField(db_index=True, null=True, blank=True)),
+                ('recipient', models.ForeignKey(related_name='notifications', to='users.SystersUser')),
+            ],
+            options={
+            },
+            bases=(models.Model,),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_squashed_0003_auto_20160207_1550'),
+        ('community', '0013_community_members_count'),
+        ('meetup', '0007_meetuplocation_members_count'),
+        ('membership', '0004_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipEvent',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('action', models.CharField(max_length=32, choices=[('member_added', 'Became member'), ('member_removed', 'Removed from members'), ('member_left', 'Left'), ('admin_changed', 'Became admin'), ('group_joined', 'Joined group'), ('group_left', 'Left group'), ('organizer_added', 'Became organizer'), ('organizer_removed', 'No longer organizer')])),
+                ('details', models.CharField(max_length=255, blank=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(related_name='membership_actions', on_delete=django.db.models.deletion.SET_NULL, blank=True, to='users.SystersUser', null=True)),
+                ('community', models.ForeignKey(db_index=False, blank=True, to='community.Community', null=True)),
+                ('meetup_location', models.ForeignKey(db_index=False, blank=True, to='meetup.MeetupLocation', null=True)),
+                ('subject', models.ForeignKey(related_name='membership_events', to='users.SystersUser')),
+            ],
+            options={
+                'index_together': set([('community', 'id'), ('meetup_location', 'id')]),
+            },
+            bases=(models.Model,),
+        ),
+    ]
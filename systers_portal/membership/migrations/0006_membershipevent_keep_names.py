@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0005_membershipevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membershipevent',
+            name='community_name',
+            field=models.CharField(max_length=255, blank=True),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='membershipevent',
+            name='meetup_location_name',
+            field=models.CharField(max_length=255, blank=True),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='membershipevent',
+            name='subject_username',
+            field=models.CharField(max_length=30, blank=True),
+            preserve_default=True,
+        ),
+        migrations.AlterField(
+            model_name='membershipevent',
+            name='community',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.SET_NULL, db_index=False, blank=True, to='community.Community', null=True),
+            preserve_default=True,
+        ),
+        migrations.AlterField(
+            model_name='membershipevent',
+            name='meetup_location',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.SET_NULL, db_index=False, blank=True, to='meetup.MeetupLocation', null=True),
+            preserve_default=True,
+        ),
+        migrations.AlterField(
+            model_name='membershipevent',
+            name='subject',
+            field=models.ForeignKey(related_name='membership_events', on_delete=django.db.models.deletion.SET_NULL, blank=True, to='users.SystersUser', null=True),
+            preserve_default=True,
+        ),
+    ]
@@ -1,7 +1,15 @@
-from django.db import models
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 
 from community.models import Community
-from membership.constants import ALREADY_MEMBER, JOIN_REQUEST_EXISTS, OK
+from membership.constants import (ALREADY_MEMBER, JOIN_REQUEST_EXISTS,
+                                  NO_PENDING_JOIN_REQUEST, OK,
+                                  JOIN_REQUEST_APPROVED_SUBJECT,
+                                  JOIN_REQUEST_APPROVED_BODY,
+                                  JOIN_REQUEST_REJECTED_SUBJECT,
+                                  JOIN_REQUEST_REJECTED_BODY,
+                                  MEMBER_ADDED, membership_event_actions)
 from users.models import SystersUser
 
 
@@ -18,10 +26,14 @@ class JoinRequestManager(models.Manager):
         """
         if user.is_member(community):
             return None, ALREADY_MEMBER
-        if JoinRequest.objects.filter(user=user, community=community,
-                                      is_approved=False).exists():
+        # at most one pending join request per user and community is enforced
+        # by a partial unique index, see membership migration 0003
+        try:
+            with transaction.atomic():
+                join_request = self.create(user=user, community=community)
+        except IntegrityError:
             return None, JOIN_REQUEST_EXISTS
-        return JoinRequest.objects.create(user=user, community=community), OK
+        return join_request, OK
 
     def cancel_join_request(self, user, community):
         """Cancel a pending join request made by a user to a community.
@@ -36,7 +48,94 @@ class JoinRequestManager(models.Manager):
         if user.is_member(community):
             return ALREADY_MEMBER
 
-        return user.delete_all_join_requests(community)
+        if not user.delete_all_join_requests(community):
+            return NO_PENDING_JOIN_REQUEST
+        return OK
+
+    def approve_join_requests(self, community, join_request_ids,
+                              approved_by=None):
+        """Approve multiple join requests to a community in one transaction.
+        All pending join requests of the users who made the selected requests
+        are approved and the users become members of the community. Pending
+        join requests of users who are already members are deleted.
+
+        :param community: Community object
+        :param join_request_ids: list of JoinRequest ids
+        :param approved_by: SystersUser object of the approving user
+        :return: dict mapping each join request id to a tuple (SystersUser
+                 object or None, string status), where status is OK if the
+                 user became a member, ALREADY_MEMBER if the user was already
+                 a member and NO_PENDING_JOIN_REQUEST if the request doesn't
+                 exist or is not pending anymore
+        """
+        with transaction.atomic():
+            join_requests = self.pending_join_requests(community,
+                                                       join_request_ids)
+            users = dict((join_request.user_id, join_request.user)
+                         for join_request in join_requests)
+            members = set(community.members.filter(pk__in=users).values_list(
+                'pk', flat=True))
+            new_members = [user for pk, user in users.items()
+                           if pk not in members]
+            pending = self.filter(community=community, is_approved=False)
+            if members:
+                pending.filter(user__in=members).delete()
+            if new_members:
+                pending.filter(user__in=new_members).update(
+                    is_approved=True, approved_by=approved_by,
+                    date_approved=timezone.now())
+                community.members.add(*new_members)
+                MembershipEvent.objects.log(MEMBER_ADDED, new_members,
+                                            actor=approved_by,
+                                            community=community)
+                Notification.objects.notify_join_request_approved(
+                    new_members, community)
+        outcomes = dict((pk, (None, NO_PENDING_JOIN_REQUEST))
+                        for pk in join_request_ids)
+        for join_request in join_requests:
+            status = ALREADY_MEMBER if join_request.user_id in members else OK
+            outcomes[join_request.pk] = (join_request.user, status)
+        return outcomes
+
+    def reject_join_requests(self, community, join_request_ids):
+        """Reject multiple join requests to a community in one transaction.
+        All pending join requests of the users who made the selected requests
+        are deleted.
+
+        :param community: Community object
+        :param join_request_ids: list of JoinRequest ids
+        :return: dict mapping each join request id to a tuple (SystersUser
+                 object or None, string status), where status is OK if the
+                 request was rejected and NO_PENDING_JOIN_REQUEST if the
+                 request doesn't exist or is not pending anymore
+        """
+        with transaction.atomic():
+            join_requests = self.pending_join_requests(community,
+                                                       join_request_ids)
+            users = dict((join_request.user_id, join_request.user)
+                         for join_request in join_requests)
+            if users:
+                self.filter(community=community, is_approved=False,
+                            user__in=users).delete()
+                Notification.objects.notify_join_request_rejected(
+                    users.values(), community)
+        outcomes = dict((pk, (None, NO_PENDING_JOIN_REQUEST))
+                        for pk in join_request_ids)
+        for join_request in join_requests:
+            outcomes[join_request.pk] = (join_request.user, OK)
+        return outcomes
+
+    def pending_join_requests(self, community, join_request_ids):
+        """Get and lock pending join requests to a community together with
+        the users who made them. Must be called inside a transaction.
+
+        :param community: Community object
+        :param join_request_ids: list of JoinRequest ids
+        :return: list of JoinRequest objects
+        """
+        return list(self.select_for_update().select_related('user__user').
+                    filter(community=community, is_approved=False,
+                           pk__in=join_request_ids))
 
 
 class JoinRequest(models.Model):
@@ -47,16 +146,184 @@ class JoinRequest(models.Model):
     community = models.ForeignKey(Community)
     date_created = models.DateTimeField(auto_now_add=True)
     is_approved = models.BooleanField(default=False)
+    date_approved = models.DateTimeField(blank=True, null=True)
 
     objects = JoinRequestManager()
 
+    class Meta:
+        index_together = [('community', 'is_approved', 'date_created'),
+                          ('user', 'community', 'date_created')]
+
     def __str__(self):
         approval_status = "approved" if self.is_approved else "not approved"
         return "Join Request by {0} - {1}".format(self.user, approval_status)
 
-    def approve(self):
-        """Approve a join request."""
+    def approve(self, approved_by=None):
+        """Approve a join request.
+
+        :param approved_by: SystersUser object of the approving user
+        """
         if self.is_approved:
             return
         self.is_approved = True
+        self.approved_by = approved_by
+        self.date_approved = timezone.now()
         self.save()
+
+
+class NotificationManager(models.Manager):
+    """Model manager for Notification model"""
+    def notify_users(self, users, subject, body):
+        """Queue the same notification to multiple users. Must be called
+        inside the transaction of the operation that triggers it.
+
+        :param users: list of SystersUser objects
+        :param subject: string notification subject
+        :param body: string notification body
+        """
+        self.bulk_create([Notification(recipient=user, subject=subject,
+                                       body=body) for user in users])
+
+    def notify_join_request_approved(self, users, community):
+        """Queue notifications about approved join requests to a community.
+
+        :param users: list of SystersUser objects
+        :param community: Community object
+        """
+        self.notify_users(users,
+                          JOIN_REQUEST_APPROVED_SUBJECT.format(community),
+                          JOIN_REQUEST_APPROVED_BODY.format(community))
+
+    def notify_join_request_rejected(self, users, community):
+        """Queue notifications about rejected join requests to a community.
+
+        :param users: list of SystersUser objects
+        :param community: Community object
+        """
+        self.notify_users(users,
+                          JOIN_REQUEST_REJECTED_SUBJECT.format(community),
+                          JOIN_REQUEST_REJECTED_BODY.format(community))
+
+    def send_pending(self, batch_size=100):
+        """Send pending notifications by email over a single connection of the
+        configured email backend. Pending notifications are read in batches,
+        and each one is locked, sent and marked as sent in its own
+        transaction, so that a failure never sends already sent notifications
+        again. Notifications to users without an email address are marked as
+        sent without sending them.
+
+        :param batch_size: maximum number of notifications read at once
+        :return: number of sent emails
+        """
+        sent = 0
+        pending = self.filter(date_sent__isnull=True)
+        connection = get_connection()
+        connection.open()
+        try:
+            last_pk = 0
+            while True:
+                pks = list(pending.filter(pk__gt=last_pk).order_by(
+                    'pk').values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                last_pk = pks[-1]
+                for pk in pks:
+                    with transaction.atomic():
+                        try:
+                            notification = pending.select_for_update(
+                            ).select_related('recipient__user').get(pk=pk)
+                        except self.model.DoesNotExist:
+                            # sent meanwhile by another process
+                            continue
+                        email = notification.recipient.user.email
+                        if email:
+                            message = EmailMessage(notification.subject,
+                                                   notification.body,
+                                                   to=[email])
+                            if not connection.send_messages([message]):
+                                continue
+                            sent += 1
+                        self.filter(pk=pk).update(date_sent=timezone.now())
+        finally:
+            connection.close()
+        return sent
+
+
+class Notification(models.Model):
+    """Model to represent a notification to a user, waiting in the outbox
+    until it is sent by email"""
+    recipient = models.ForeignKey(SystersUser, related_name='notifications')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_sent = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    objects = NotificationManager()
+
+    def __str__(self):
+        return "Notification to {0} - {1}".format(self.recipient,
+                                                  self.subject)
+
+
+class MembershipEventManager(models.Manager):
+    """Model manager for MembershipEvent model"""
+    def log(self, action, subjects, actor=None, community=None,
+            meetup_location=None, details=""):
+        """Record the same membership change of multiple users with a single
+        insert. Must be called inside the transaction of the change.
+
+        :param action: string action, one of membership event actions
+        :param subjects: list of SystersUser objects whose membership changed
+        :param actor: SystersUser object who made the change or None
+        :param community: Community object or None
+        :param meetup_location: MeetupLocation object or None
+        :param details: string additional details, e.g. the group name
+        """
+        self.bulk_create([
+            MembershipEvent(action=action, subject=subject, actor=actor,
+                            community=community,
+                            meetup_location=meetup_location, details=details)
+            for subject in subjects])
+
+
+class MembershipEvent(models.Model):
+    """Model to represent a change of a user membership in a community or a
+    meetup location. Events are append-only: they are never changed or deleted
+    once recorded. When the subject, the community or the meetup location is
+    deleted, its name is kept in the event, see membership signals."""
+    actor = models.ForeignKey(SystersUser, blank=True, null=True,
+                              on_delete=models.SET_NULL,
+                              related_name='membership_actions')
+    subject = models.ForeignKey(SystersUser, blank=True, null=True,
+                                on_delete=models.SET_NULL,
+                                related_name='membership_events')
+    subject_username = models.CharField(max_length=30, blank=True)
+    community = models.ForeignKey(Community, blank=True, null=True,
+                                  on_delete=models.SET_NULL, db_index=False)
+    community_name = models.CharField(max_length=255, blank=True)
+    meetup_location = models.ForeignKey('meetup.MeetupLocation', blank=True,
+                                        null=True, on_delete=models.SET_NULL,
+                                        db_index=False)
+    meetup_location_name = models.CharField(max_length=255, blank=True)
+    action = models.CharField(max_length=32, choices=membership_event_actions)
+    details = models.CharField(max_length=255, blank=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    objects = MembershipEventManager()
+
+    class Meta:
+        index_together = [('community', 'id'), ('meetup_location', 'id')]
+
+    def __str__(self):
+        return "{0} - {1}".format(self.subject or self.subject_username,
+                                  self.get_action_display())
+
+    def save(self, *args, **kwargs):
+        """Record a new event. Changing a recorded event is not allowed."""
+        if self.pk is not None:
+            raise ValueError("Membership events can't be changed.")
+        super(MembershipEvent, self).save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Deleting a recorded event is not allowed."""
+        raise ValueError("Membership events can't be deleted.")
@@ -0,0 +1,31 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from membership.models import MembershipEvent
+
+
+@receiver(pre_delete, sender='users.SystersUser',
+          dispatch_uid="keep_membership_events_subject")
+def keep_membership_events_subject(sender, instance, **kwargs):
+    """Keep the username in the membership events of a deleted user, before
+    the events are detached from the user"""
+    MembershipEvent.objects.filter(subject=instance).update(
+        subject_username=instance.user.username)
+
+
+@receiver(pre_delete, sender='community.Community',
+          dispatch_uid="keep_membership_events_community")
+def keep_membership_events_community(sender, instance, **kwargs):
+    """Keep the community name in the membership events of a deleted
+    community, before the events are detached from the community"""
+    MembershipEvent.objects.filter(community=instance).update(
+        community_name=instance.name)
+
+
+@receiver(pre_delete, sender='meetup.MeetupLocation',
+          dispatch_uid="keep_membership_events_meetup_location")
+def keep_membership_events_meetup_location(sender, instance, **kwargs):
+    """Keep the meetup location name in the membership events of a deleted
+    meetup location, before the events are detached from it"""
+    MembershipEvent.objects.filter(meetup_location=instance).update(
+        meetup_location_name=instance.name)
@@ -0,0 +1,23 @@
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from membership.models import Notification
+from users.models import SystersUser
+
+
+class SendNotificationsCommandTestCase(TestCase):
+    def test_send_notifications(self):
+        """Test sending pending notifications with the management command"""
+        User.objects.create_user(username='foo', password='foobar',
+                                 email='foo@example.com')
+        systers_user = SystersUser.objects.get()
+        Notification.objects.notify_users([systers_user] * 3, "Hi", "Hello")
+        out = StringIO()
+        call_command('send_notifications', batch_size=2, stdout=out)
+        self.assertEqual(out.getvalue().strip(), "Sent 3 notifications.")
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(
+            Notification.objects.filter(date_sent__isnull=True).exists())
@@ -1,9 +1,10 @@
 from django import forms
 from django.contrib.auth.models import User
+from django.http import QueryDict
 from django.test import TestCase
 
 from community.models import Community
-from membership.forms import TransferOwnershipForm
+from membership.forms import TransferOwnershipForm, JoinRequestsModerationForm
 from users.models import SystersUser
 
 
@@ -18,15 +19,44 @@ class TransferOwnershipFormTestCase(TestCase):
     def test_transfer_ownership_form(self):
         """Test transferring ownership form"""
         form = TransferOwnershipForm(community=self.community)
-        self.assertIsInstance(form.fields['new_admin'], forms.ChoiceField)
-        self.assertSequenceEqual(form.fields['new_admin'].choices, [])
+        self.assertIsInstance(form.fields['new_admin'],
+                              forms.ModelChoiceField)
+        self.assertIsInstance(form.fields['new_admin'].widget,
+                              forms.HiddenInput)
 
         bar_user = User.objects.create_user(username="bar", password="foobar")
         bar_systers_user = SystersUser.objects.get(user=bar_user)
         self.community.add_member(bar_systers_user)
+        new_user = User.objects.create_user(username="new", password="foobar")
+        new_systers_user = SystersUser.objects.get(user=new_user)
 
-        User.objects.create_user(username="new", password="foobar")
+        form = TransferOwnershipForm(community=self.community,
+                                     data={'new_admin': bar_systers_user.pk})
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['new_admin'], bar_systers_user)
 
-        form = TransferOwnershipForm(community=self.community)
-        self.assertSequenceEqual(form.fields['new_admin'].choices,
-                                 [(bar_user.id, "bar")])
+        for pk in [new_systers_user.pk, self.systers_user.pk, 'bar']:
+            form = TransferOwnershipForm(community=self.community,
+                                         data={'new_admin': pk})
+            self.assertFalse(form.is_valid())
+
+
+class JoinRequestsModerationFormTestCase(TestCase):
+    def test_join_requests_moderation_form(self):
+        """Test moderation form of multiple join requests"""
+        data = QueryDict('action=approve&join_requests=2&join_requests=1'
+                         '&join_requests=2')
+        form = JoinRequestsModerationForm(data=data)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['join_requests'], [1, 2])
+        self.assertEqual(form.cleaned_data['action'], 'approve')
+
+        form = JoinRequestsModerationForm(
+            data=QueryDict('action=reject&join_requests=foo'))
+        self.assertFalse(form.is_valid())
+        form = JoinRequestsModerationForm(data=QueryDict('action=reject'))
+        self.assertFalse(form.is_valid())
+        form = JoinRequestsModerationForm(
+            data=QueryDict('action=delete&join_requests=1'))
+        self.assertFalse(form.is_valid())
@@ -1,8 +1,14 @@
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends import locmem
 
 from community.models import Community
-from membership.models import JoinRequest
+from membership.models import JoinRequest, MembershipEvent, Notification
 from users.models import SystersUser
 
 
@@ -31,10 +37,14 @@ class JoinRequestModelTestCase(TestCase):
         join_request = JoinRequest(user=self.systers_user,
                                    community=self.community)
         self.assertFalse(join_request.is_approved)
-        join_request.approve()
+        join_request.approve(self.systers_user)
         self.assertTrue(join_request.is_approved)
+        self.assertEqual(join_request.approved_by, self.systers_user)
+        date_approved = join_request.date_approved
+        self.assertIsNotNone(date_approved)
         join_request.approve()
         self.assertTrue(join_request.is_approved)
+        self.assertEqual(join_request.date_approved, date_approved)
 
     def test_create_join_request(self):
         """Test model manager method to create a join request"""
@@ -90,3 +100,187 @@ class JoinRequestModelTestCase(TestCase):
         status = JoinRequest.objects.cancel_join_request(systers_user,
                                                          self.community)
         self.assertEqual(status, "already_member")
+
+    def test_approve_join_requests(self):
+        """Test model manager method to approve multiple join requests"""
+        bar = SystersUser.objects.get(
+            user=User.objects.create(username="bar", password="foobar"))
+        baz = SystersUser.objects.get(
+            user=User.objects.create(username="baz", password="foobar"))
+        bar_join_request = JoinRequest.objects.create(user=bar,
+                                                      community=self.community)
+        baz_join_request = JoinRequest.objects.create(user=baz,
+                                                      community=self.community)
+        self.community.add_member(baz)
+        pks = [bar_join_request.pk, baz_join_request.pk, 0]
+        outcomes = JoinRequest.objects.approve_join_requests(
+            self.community, pks, self.systers_user)
+        self.assertEqual(outcomes, {bar_join_request.pk: (bar, "ok"),
+                                    baz_join_request.pk: (baz,
+                                                          "already_member"),
+                                    0: (None, "no_pending_join_request")})
+        notification = Notification.objects.get()
+        self.assertEqual(notification.recipient, bar)
+        self.assertEqual(notification.subject, "Welcome to Foo community")
+        self.assertTrue(bar.is_member(self.community))
+        join_request = JoinRequest.objects.get()
+        self.assertEqual(join_request, bar_join_request)
+        self.assertTrue(join_request.is_approved)
+        self.assertEqual(join_request.approved_by, self.systers_user)
+
+        outcomes = JoinRequest.objects.approve_join_requests(
+            self.community, [bar_join_request.pk])
+        self.assertEqual(outcomes, {
+            bar_join_request.pk: (None, "no_pending_join_request")})
+
+    def test_reject_join_requests(self):
+        """Test model manager method to reject multiple join requests"""
+        bar = SystersUser.objects.get(
+            user=User.objects.create(username="bar", password="foobar"))
+        baz = SystersUser.objects.get(
+            user=User.objects.create(username="baz", password="foobar"))
+        bar_join_request = JoinRequest.objects.create(user=bar,
+                                                      community=self.community)
+        baz_join_request = JoinRequest.objects.create(user=baz,
+                                                      community=self.community)
+        outcomes = JoinRequest.objects.reject_join_requests(
+            self.community, [bar_join_request.pk])
+        self.assertEqual(outcomes, {bar_join_request.pk: (bar, "ok")})
+        self.assertEqual(Notification.objects.get().recipient, bar)
+        self.assertSequenceEqual(JoinRequest.objects.all(), [baz_join_request])
+        self.assertFalse(bar.is_member(self.community))
+
+    def test_single_pending_join_request(self):
+        """Test that the database allows a single pending join request per
+        user and community"""
+        JoinRequest.objects.create(user=self.systers_user,
+                                   community=self.community, is_approved=True)
+        JoinRequest.objects.create(user=self.systers_user,
+                                   community=self.community)
+        with transaction.atomic():
+            self.assertRaises(IntegrityError, JoinRequest.objects.create,
+                              user=self.systers_user, community=self.community)
+        self.assertEqual(JoinRequest.objects.count(), 2)
+
+
+class NotificationTestCase(TestCase):
+    def setUp(self):
+        self.users = []
+        for username in ['foo', 'bar', 'baz']:
+            user = User.objects.create_user(
+                username=username, password='foobar',
+                email='{0}@example.com'.format(username))
+            self.users.append(SystersUser.objects.get(user=user))
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.users[0])
+
+    def test_str(self):
+        """Test Notification object string representation"""
+        notification = Notification(recipient=self.users[0], subject="Hi")
+        self.assertEqual(str(notification), "Notification to foo - Hi")
+
+    def test_notify_users(self):
+        """Test queuing notifications to multiple users"""
+        Notification.objects.notify_join_request_rejected(self.users[1:],
+                                                          self.community)
+        notifications = Notification.objects.order_by('pk')
+        self.assertEqual([n.recipient for n in notifications], self.users[1:])
+        for notification in notifications:
+            self.assertEqual(notification.subject,
+                             "Your request to join Foo community")
+            self.assertIsNone(notification.date_sent)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_pending(self):
+        """Test sending pending notifications read in batches"""
+        self.users[2].user.email = ''
+        self.users[2].user.save()
+        Notification.objects.notify_users(self.users * 2, "Hi", "Hello")
+        sent = Notification.objects.send_pending(batch_size=4)
+        self.assertEqual(sent, 4)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ['bar@example.com', 'bar@example.com', 'foo@example.com',
+             'foo@example.com'])
+        self.assertFalse(
+            Notification.objects.filter(date_sent__isnull=True).exists())
+        self.assertEqual(Notification.objects.send_pending(), 0)
+        self.assertEqual(len(mail.outbox), 4)
+
+    def test_send_pending_failure(self):
+        """Test that notifications sent before a failure are marked as sent
+        and not sent again"""
+        Notification.objects.notify_users(self.users, "Hi", "Hello")
+        send_messages = locmem.EmailBackend.send_messages
+
+        def fail_to_bar(backend, messages):
+            if messages[0].to == ['bar@example.com']:
+                raise SMTPException
+            return send_messages(backend, messages)
+
+        with patch.object(locmem.EmailBackend, 'send_messages', fail_to_bar):
+            self.assertRaises(SMTPException, Notification.objects.send_pending)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Notification.objects.filter(
+            date_sent__isnull=True).count(), 2)
+        self.assertEqual(Notification.objects.send_pending(), 2)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ['bar@example.com', 'baz@example.com', 'foo@example.com'])
+
+
+class MembershipEventTestCase(TestCase):
+    def setUp(self):
+        self.users = []
+        for username in ['foo', 'bar', 'baz']:
+            User.objects.create_user(username=username, password='foobar')
+            self.users.append(SystersUser.objects.get(user__username=username))
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.users[0])
+
+    def test_str(self):
+        """Test MembershipEvent object string representation"""
+        event = MembershipEvent(subject=self.users[1], action="member_left")
+        self.assertEqual(str(event), "bar - Left")
+
+    def test_log(self):
+        """Test recording the same event of multiple users in one query"""
+        with self.assertNumQueries(1):
+            MembershipEvent.objects.log("member_added", self.users[1:],
+                                        actor=self.users[0],
+                                        community=self.community)
+        events = MembershipEvent.objects.filter(
+            action="member_added", actor=self.users[0]).order_by('pk')
+        self.assertEqual([event.subject for event in events], self.users[1:])
+        for event in events:
+            self.assertEqual(event.community, self.community)
+            self.assertIsNone(event.meetup_location)
+
+    def test_append_only(self):
+        """Test that recorded events can't be changed or deleted"""
+        event = MembershipEvent.objects.create(subject=self.users[1],
+                                               community=self.community,
+                                               action="member_added")
+        event.action = "member_left"
+        self.assertRaises(ValueError, event.save)
+        self.assertRaises(ValueError, event.delete)
+        self.assertEqual(MembershipEvent.objects.get(pk=event.pk).action,
+                         "member_added")
+
+    def test_keep_deleted_names(self):
+        """Test that events outlive their subject and community, and keep
+        their names"""
+        event = MembershipEvent.objects.create(subject=self.users[1],
+                                               community=self.community,
+                                               action="member_added")
+        self.users[1].user.delete()
+        self.community.delete()
+        event = MembershipEvent.objects.get(pk=event.pk)
+        self.assertIsNone(event.subject)
+        self.assertEqual(event.subject_username, "bar")
+        self.assertIsNone(event.community)
+        self.assertEqual(event.community_name, "Foo")
+        self.assertEqual(str(event), "bar - Became member")
@@ -1,10 +1,14 @@
+import json
+
 from django.contrib.auth.models import User, Group
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from community.constants import USER_CONTENT_MANAGER
 from community.models import Community
-from membership.models import JoinRequest
+from membership.models import JoinRequest, MembershipEvent, Notification
 from users.models import SystersUser
 
 
@@ -27,17 +31,21 @@ class CommunityJoinRequestListViewTestCase(TestCase):
         self.client.login(username='foo', password='foobar')
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
-        self.assertNotContains(response, "<th>1</th>")
+        self.assertNotContains(response, 'name="join_requests"')
 
         user = User.objects.create_user(username="rainbow", password="foobar")
         systers_user = SystersUser.objects.get(user=user)
-        JoinRequest.objects.create(user=systers_user,
-                                   community=self.community)
+        join_request = JoinRequest.objects.create(user=systers_user,
+                                                  community=self.community)
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "<th>1</th>")
+        self.assertContains(response, 'name="join_requests" value="{0}"'
+                                      .format(join_request.pk))
         self.assertContains(response, 'rainbow')
 
+        response = self.client.get(url, {'after': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
 
 class ApproveCommunityJoinRequestViewTestCase(TestCase):
     def setUp(self):
@@ -92,15 +100,16 @@ class ApproveCommunityJoinRequestViewTestCase(TestCase):
                 in message.message)
         self.assertTrue(systers_user.is_member(self.community))
         self.assertTrue(JoinRequest.objects.get().is_approved)
+        self.assertEqual(Notification.objects.get().recipient, systers_user)
 
-    def test_approve_community_join_request_view_multiple(self):
-        """Test GET request to approve multiple community join request from a
-        user. This scenario might happen if the join requests are created
-        manually from the admin panel."""
+    def test_approve_community_join_request_view_former_member(self):
+        """Test GET request to approve a community join request from a user
+        who already had an approved join request, i.e. a former member."""
         self.client.login(username='foo', password='foobar')
         user = User.objects.create(username='bar', password='foobar')
         systers_user = SystersUser.objects.get(user=user)
-        JoinRequest.objects.create(user=systers_user, community=self.community)
+        JoinRequest.objects.create(user=systers_user, community=self.community,
+                                   is_approved=True)
         join_request = JoinRequest.objects.create(user=systers_user,
                                                   community=self.community)
         self.assertFalse(systers_user.is_member(self.community))
@@ -118,6 +127,101 @@ class ApproveCommunityJoinRequestViewTestCase(TestCase):
         join_requests = JoinRequest.objects.all()
         for join_request in join_requests:
             self.assertTrue(join_request.is_approved)
+        self.assertEqual(JoinRequest.objects.get(pk=join_request.pk)
+                         .approved_by, self.systers_user)
+
+    def test_approve_community_join_request_view_query_count(self):
+        """Test that approving join requests runs the same number of queries
+        regardless of the number of join requests made by the user"""
+        self.client.login(username='foo', password='foobar')
+        queries_counts = []
+        for username, requests_count in [('bar', 1), ('baz', 5)]:
+            user = User.objects.create(username=username, password='foobar')
+            systers_user = SystersUser.objects.get(user=user)
+            for i in range(requests_count):
+                join_request = JoinRequest.objects.create(
+                    user=systers_user, community=self.community,
+                    is_approved=i < requests_count - 1)
+            url = reverse("approve_community_join_request",
+                          kwargs={'slug': 'foo', 'pk': join_request.pk})
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(systers_user.is_member(self.community))
+            queries_counts.append(len(queries))
+        self.assertEqual(queries_counts[0], queries_counts[1])
+
+
+class ModerateCommunityJoinRequestsViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+        self.url = reverse("moderate_community_join_requests",
+                           kwargs={'slug': 'foo'})
+        self.join_requests = []
+        for username in ['bar', 'baz']:
+            user = User.objects.create(username=username, password='foobar')
+            systers_user = SystersUser.objects.get(user=user)
+            self.join_requests.append(JoinRequest.objects.create(
+                user=systers_user, community=self.community))
+
+    def test_moderate_community_join_requests_view_permissions(self):
+        """Test POST request to moderate join requests without the necessary
+        permissions and GET request to the view"""
+        data = {'action': 'approve',
+                'join_requests': [self.join_requests[0].pk]}
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 403)
+        self.client.login(username='foo', password='foobar')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_moderate_community_join_requests_view_approve(self):
+        """Test POST request to approve multiple join requests"""
+        self.client.login(username='foo', password='foobar')
+        pks = [join_request.pk for join_request in self.join_requests]
+        data = {'action': 'approve', 'join_requests': pks + [pks[-1] + 1]}
+        response = self.client.post(self.url, data, follow=True)
+        self.assertRedirects(response, 'community/foo/join_requests/')
+        messages = [message.message
+                    for message in response.context['messages']]
+        self.assertEqual(messages, [
+            "bar successfully became a member of Foo community.",
+            "baz successfully became a member of Foo community.",
+            "Join request #{0} is no longer pending.".format(pks[-1] + 1)])
+        for join_request in JoinRequest.objects.all():
+            self.assertTrue(join_request.is_approved)
+            self.assertEqual(join_request.approved_by, self.systers_user)
+            self.assertTrue(join_request.user.is_member(self.community))
+
+    def test_moderate_community_join_requests_view_reject(self):
+        """Test POST request to reject multiple join requests"""
+        self.client.login(username='foo', password='foobar')
+        data = {'action': 'reject',
+                'join_requests': [self.join_requests[0].pk]}
+        response = self.client.post(self.url, data, follow=True)
+        self.assertRedirects(response, 'community/foo/join_requests/')
+        for message in response.context['messages']:
+            self.assertEqual(
+                message.message, "bar was successfully rejected to become a "
+                                 "member of Foo community.")
+        self.assertSequenceEqual(JoinRequest.objects.all(),
+                                 [self.join_requests[1]])
+
+    def test_moderate_community_join_requests_view_invalid(self):
+        """Test POST request to moderate join requests without selecting any
+        of them"""
+        self.client.login(username='foo', password='foobar')
+        response = self.client.post(self.url, {'action': 'approve'},
+                                    follow=True)
+        self.assertRedirects(response, 'community/foo/join_requests/')
+        for message in response.context['messages']:
+            self.assertEqual(message.tags, "warning")
+        self.assertEqual(JoinRequest.objects.filter(is_approved=False).count(),
+                         2)
 
 
 class RejectCommunityJoinRequestViewTestCase(TestCase):
@@ -152,6 +256,7 @@ class RejectCommunityJoinRequestViewTestCase(TestCase):
             self.assertTrue(
                 'foo is already a member of Foo community.' in message.message)
         self.assertQuerysetEqual(JoinRequest.objects.all(), [])
+        self.assertFalse(Notification.objects.exists())
 
     def test_reject_community_join_request_view_multiple(self):
         """Test GET request to reject all community join requests"""
@@ -173,6 +278,7 @@ class RejectCommunityJoinRequestViewTestCase(TestCase):
                 ' community.' in message.message)
         self.assertFalse(systers_user.is_member(self.community))
         self.assertSequenceEqual(JoinRequest.objects.all(), [])
+        self.assertEqual(Notification.objects.get().recipient, systers_user)
 
 
 class RequestJoinCommunityViewTestCase(TestCase):
@@ -368,6 +474,56 @@ class TransferOwnershipViewTestCase(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_get_transfer_ownership_view_query_count(self):
+        """Test that rendering the transfer ownership page doesn't depend on
+        the number of community members"""
+        self.client.login(username="foo", password="foobar")
+        url = reverse('transfer_ownership', kwargs={'slug': 'foo'})
+        queries_counts = []
+        for username in ['bar', 'baz', 'qux']:
+            user = User.objects.create_user(username=username,
+                                            password="foobar")
+            self.community.add_member(SystersUser.objects.get(user=user))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            queries_counts.append(len(queries))
+        self.assertEqual(len(set(queries_counts)), 1)
+
+    def test_transfer_ownership_members_view(self):
+        """Test searching the members who can become the new admin"""
+        url = reverse('transfer_ownership_members', kwargs={'slug': 'foo'})
+        response = self.client.get(url, {'q': 'b'})
+        self.assertEqual(response.status_code, 403)
+
+        for username, first_name in [('bar', 'Rainbow'), ('baz', 'Bob'),
+                                     ('rain', ''), ('bolt', '')]:
+            user = User.objects.create_user(username=username,
+                                            password="foobar",
+                                            first_name=first_name)
+            if username != 'bolt':
+                self.community.add_member(SystersUser.objects.get(user=user))
+        self.client.login(username="bar", password="foobar")
+        response = self.client.get(url, {'q': 'b'})
+        self.assertEqual(response.status_code, 403)
+
+        self.client.login(username="foo", password="foobar")
+        response = self.client.get(url, {'q': 'B'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([member['username']
+                          for member in json.loads(response.content.decode())['members']],
+                         ['bar', 'baz'])
+        response = self.client.get(url, {'q': 'rain'})
+        self.assertEqual(json.loads(response.content.decode())['members'], [
+            {'id': SystersUser.objects.get(user__username='bar').pk,
+             'username': 'bar', 'name': 'Rainbow'},
+            {'id': SystersUser.objects.get(user__username='rain').pk,
+             'username': 'rain', 'name': ''}])
+        response = self.client.get(url, {'q': 'fo'})
+        self.assertEqual(json.loads(response.content.decode())['members'], [])
+        response = self.client.get(url)
+        self.assertEqual(json.loads(response.content.decode())['members'], [])
+
     def test_post_transfer_ownership_view(self):
         """Test POST request to transfer ownership of a community"""
         url = reverse('transfer_ownership', kwargs={'slug': 'foo'})
@@ -454,6 +610,9 @@ class RemoveCommunityMemberViewTestCase(TestCase):
             self.assertEqual(message.tags, "success")
             self.assertTrue("bar is no longer member of Foo community."
                             in message.message)
+        event = MembershipEvent.objects.get(action="member_removed")
+        self.assertEqual(event.subject, bar_systers_user)
+        self.assertEqual(event.actor, self.systers_user)
 
         self.client.login(username='bar', password='foobar')
         response = self.client.get(url)
@@ -468,3 +627,44 @@ class RemoveCommunityMemberViewTestCase(TestCase):
             self.assertEqual(message.tags, "success")
             self.assertTrue("You have successfully left Foo community."
                             in message.message)
+
+
+class CommunityMembershipHistoryViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+
+    def test_get_community_membership_history_view(self):
+        """Test GET to get the membership history of a community"""
+        url = reverse("community_membership_history", kwargs={'slug': 'foo'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+
+        user = User.objects.create_user(username="rainbow", password="foobar")
+        systers_user = SystersUser.objects.get(user=user)
+        self.community.add_member(systers_user, actor=self.systers_user)
+        self.community.remove_member(systers_user, actor=systers_user)
+        other_community = Community.objects.create(
+            name="Bar", slug="bar", order=2, admin=systers_user)
+
+        self.client.login(username='foo', password='foobar')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        events = MembershipEvent.objects.filter(
+            community=self.community).order_by('-pk')
+        self.assertSequenceEqual(response.context['object_list'], events)
+        self.assertEqual([event.action for event in events],
+                         ["member_left", "member_added", "member_added"])
+        self.assertNotIn(other_community,
+                         [event.community for event in events])
+        self.assertContains(response, "rainbow")
+
+        response = self.client.get(url, {'after': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+        self.client.login(username='rainbow', password='foobar')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
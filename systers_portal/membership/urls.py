@@ -3,10 +3,13 @@ from django.conf.urls import url
 from membership.views import (CommunityJoinRequestListView,
                               ApproveCommunityJoinRequestView,
                               RejectCommunityJoinRequestView,
+                              ModerateCommunityJoinRequestsView,
                               RequestJoinCommunityView,
                               CancelCommunityJoinRequestView,
                               LeaveCommunityView, TransferOwnershipView,
-                              RemoveCommunityMemberView)
+                              TransferOwnershipMembersView,
+                              RemoveCommunityMemberView,
+                              CommunityMembershipHistoryView)
 
 urlpatterns = [
     url(r'^(?P<slug>[\w-]+)/join_requests/$',
@@ -18,6 +21,9 @@ urlpatterns = [
     url(r'^(?P<slug>[\w-]+)/join_requests/reject/(?P<pk>\d+)$',
         RejectCommunityJoinRequestView.as_view(),
         name="reject_community_join_request"),
+    url(r'^(?P<slug>[\w-]+)/join_requests/moderate/$',
+        ModerateCommunityJoinRequestsView.as_view(),
+        name="moderate_community_join_requests"),
     url(r'^(?P<slug>[\w-]+)/join/$', RequestJoinCommunityView.as_view(),
         name="request_join_community"),
     url(r'^(?P<slug>[\w-]+)/cancel/$',
@@ -27,6 +33,12 @@ urlpatterns = [
         name="leave_community"),
     url(r'^(?P<slug>[\w-]+)/transfer_ownership/$',
         TransferOwnershipView.as_view(), name="transfer_ownership"),
+    url(r'^(?P<slug>[\w-]+)/transfer_ownership/members/$',
+        TransferOwnershipMembersView.as_view(),
+        name="transfer_ownership_members"),
     url(r'^(?P<slug>[\w-]+)/remove/(?P<username>[\w.@+-]+)/$',
         RemoveCommunityMemberView.as_view(), name="remove_member"),
+    url(r'^(?P<slug>[\w-]+)/history/$',
+        CommunityMembershipHistoryView.as_view(),
+        name="community_membership_history"),
 ]
@@ -1,22 +1,28 @@
 from django.contrib import messages
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
+from django.db import transaction
+from django.db.models import Q
+from django.http import HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404
-from django.views.generic import RedirectView, ListView, FormView
+from django.views.generic import RedirectView, ListView, FormView, View
 from django.views.generic.detail import SingleObjectMixin
 from braces.views import LoginRequiredMixin, PermissionRequiredMixin
 
+from common.mixins import KeysetPaginationMixin
 from community.models import Community
+from community.utils import has_community_perm
 from membership.constants import *  # NOQA
-from membership.forms import TransferOwnershipForm
-from membership.models import JoinRequest
+from membership.forms import TransferOwnershipForm, JoinRequestsModerationForm
+from membership.models import JoinRequest, MembershipEvent, Notification
 from users.models import SystersUser
 
 
 class CommunityJoinRequestListView(LoginRequiredMixin, PermissionRequiredMixin,
-                                   ListView):
+                                   KeysetPaginationMixin, ListView):
     """List of not yet approved JoinRequest(s) to a Community"""
     template_name = "membership/join_requests.html"
+    keyset_field = 'pk'
     raise_exception = True
     # TODO: add `redirect_unauthenticated_users = True` when django-braces will
     # reach version 1.5
@@ -29,15 +35,16 @@ class CommunityJoinRequestListView(LoginRequiredMixin, PermissionRequiredMixin,
         return context
 
     def get_queryset(self):
-        return JoinRequest.objects.filter(community=self.community,
-                                          is_approved=False)
+        return JoinRequest.objects.filter(
+            community=self.community,
+            is_approved=False).select_related('user__user')
 
     def check_permissions(self, request):
         """Check if the request user has the permissions to approve join
         requests. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("approve_community_joinrequest",
-                                     self.community)
+        return has_community_perm(request, "approve_community_joinrequest",
+                                  self.community)
 
 
 class ApproveCommunityJoinRequestView(LoginRequiredMixin,
@@ -57,7 +64,6 @@ class ApproveCommunityJoinRequestView(LoginRequiredMixin,
         """Add a message about the result of approving a join request"""
         message, level = self.process_join_request()
         messages.add_message(request, level, message)
-        # TODO: notify the user about the acceptance
         return super(ApproveCommunityJoinRequestView, self).get(request, *args,
                                                                 **kwargs)
 
@@ -66,15 +72,22 @@ class ApproveCommunityJoinRequestView(LoginRequiredMixin,
 
         :return: tuple containing a string message and a message level
         """
-        join_request = get_object_or_404(JoinRequest, community=self.community,
-                                         pk=self.kwargs['pk'])
-        user = join_request.user
-        if user.is_member(self.community):
-            join_request.delete()
-            return USER_ALREADY_MEMBER_MSG.format(
-                user, self.community), messages.INFO
-        user.approve_all_join_requests(self.community)
-        self.community.add_member(join_request.user)
+        approved_by = SystersUser.objects.get(user=self.request.user)
+        with transaction.atomic():
+            join_requests = JoinRequest.objects.select_for_update().\
+                select_related('user__user')
+            join_request = get_object_or_404(join_requests,
+                                             community=self.community,
+                                             pk=self.kwargs['pk'])
+            user = join_request.user
+            if user.is_member(self.community):
+                join_request.delete()
+                return USER_ALREADY_MEMBER_MSG.format(
+                    user, self.community), messages.INFO
+            user.approve_all_join_requests(self.community, approved_by)
+            self.community.add_member(user, actor=approved_by)
+            Notification.objects.notify_join_request_approved(
+                [user], self.community)
         return USER_MEMBER_SUCCESS_MSG.format(
             user, self.community), messages.SUCCESS
 
@@ -82,8 +95,65 @@ class ApproveCommunityJoinRequestView(LoginRequiredMixin,
         """Check if the request user has the permissions to approve join
         requests. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("approve_community_joinrequest",
-                                     self.community)
+        return has_community_perm(request, "approve_community_joinrequest",
+                                  self.community)
+
+
+class ModerateCommunityJoinRequestsView(LoginRequiredMixin,
+                                        PermissionRequiredMixin, FormView):
+    """Approve or reject multiple JoinRequest(s) to a Community at once"""
+    form_class = JoinRequestsModerationForm
+    http_method_names = ['post']
+    raise_exception = True
+    # TODO: add `redirect_unauthenticated_users = True` when django-braces will
+    # reach version 1.5
+
+    def get_success_url(self):
+        """Redirect to the list of join requests of the community"""
+        return reverse("view_community_join_request_list",
+                       kwargs={'slug': self.community.slug})
+
+    def form_valid(self, form):
+        """Process the selected join requests and add a message about the
+        result of each of them"""
+        join_request_ids = form.cleaned_data['join_requests']
+        if form.cleaned_data['action'] == APPROVE:
+            approved_by = SystersUser.objects.get(user=self.request.user)
+            outcomes = JoinRequest.objects.approve_join_requests(
+                self.community, join_request_ids, approved_by)
+            outcome_messages = {
+                OK: (USER_MEMBER_SUCCESS_MSG, messages.SUCCESS),
+                ALREADY_MEMBER: (USER_ALREADY_MEMBER_MSG, messages.INFO),
+            }
+        else:
+            outcomes = JoinRequest.objects.reject_join_requests(
+                self.community, join_request_ids)
+            outcome_messages = {
+                OK: (USER_MEMBER_REJECTED_MSG, messages.INFO),
+            }
+        for pk in join_request_ids:
+            user, status = outcomes[pk]
+            if status == NO_PENDING_JOIN_REQUEST:
+                messages.add_message(self.request, messages.WARNING,
+                                     JOIN_REQUEST_NOT_PENDING_MSG.format(pk))
+            else:
+                message, level = outcome_messages[status]
+                messages.add_message(self.request, level,
+                                     message.format(user, self.community))
+        return super(ModerateCommunityJoinRequestsView, self).form_valid(form)
+
+    def form_invalid(self, form):
+        """Redirect back to the list of join requests with a warning"""
+        messages.add_message(self.request, messages.WARNING,
+                             NO_JOIN_REQUESTS_SELECTED_MSG)
+        return HttpResponseRedirect(self.get_success_url())
+
+    def check_permissions(self, request):
+        """Check if the request user has the permissions to approve/reject join
+        requests. The permission holds true for superusers."""
+        self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
+        return has_community_perm(request, "approve_community_joinrequest",
+                                  self.community)
 
 
 class RejectCommunityJoinRequestView(LoginRequiredMixin,
@@ -103,7 +173,6 @@ class RejectCommunityJoinRequestView(LoginRequiredMixin,
         """Add a message about the result of rejecting a join request"""
         message, level = self.reject_join_request()
         messages.add_message(request, level, message)
-        # TODO: notify the user about the rejection
         return super(RejectCommunityJoinRequestView, self).get(request, *args,
                                                                **kwargs)
 
@@ -115,10 +184,14 @@ class RejectCommunityJoinRequestView(LoginRequiredMixin,
         join_request = get_object_or_404(JoinRequest, community=self.community,
                                          pk=self.kwargs['pk'])
         user = join_request.user
-        user.delete_all_join_requests(self.community)
-        if user.is_member(self.community):
-            return USER_ALREADY_MEMBER_MSG.format(
-                user, self.community), messages.INFO
+        with transaction.atomic():
+            rejected = user.delete_all_join_requests(self.community)
+            if user.is_member(self.community):
+                return USER_ALREADY_MEMBER_MSG.format(
+                    user, self.community), messages.INFO
+            if rejected:
+                Notification.objects.notify_join_request_rejected(
+                    [user], self.community)
         return USER_MEMBER_REJECTED_MSG.format(
             user, self.community), messages.INFO
 
@@ -126,8 +199,8 @@ class RejectCommunityJoinRequestView(LoginRequiredMixin,
         """Check if the request user has the permissions to approve/reject join
         requests. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm("approve_community_joinrequest",
-                                     self.community)
+        return has_community_perm(request, "approve_community_joinrequest",
+                                  self.community)
 
 
 class RequestJoinCommunityView(LoginRequiredMixin, SingleObjectMixin,
@@ -261,8 +334,7 @@ class TransferOwnershipView(LoginRequiredMixin, PermissionRequiredMixin,
     def form_valid(self, form):
         """Since the form is valid, set the new admin of the community"""
         community = self.community
-        new_admin_pk = form.cleaned_data['new_admin']
-        new_admin = get_object_or_404(SystersUser, pk=int(new_admin_pk))
+        new_admin = form.cleaned_data['new_admin']
         status = community.set_new_admin(new_admin)
         if status == OK:
             messages.add_message(self.request, messages.SUCCESS,
@@ -278,7 +350,45 @@ class TransferOwnershipView(LoginRequiredMixin, PermissionRequiredMixin,
         has the permission to transfer community ownership to another member
         of the community."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user == self.community.admin.user
+        return request.user.pk == self.community.admin.user_id
+
+
+class TransferOwnershipMembersView(LoginRequiredMixin,
+                                   PermissionRequiredMixin, View):
+    """Search community members, other than the admin, whose username, first
+    or last name starts with the `q` GET parameter. Used to pick the new admin
+    of a community."""
+    limit = 10
+    search_fields = ['user__username', 'user__first_name', 'user__last_name']
+    raise_exception = True
+    # TODO: add `redirect_unauthenticated_users = True` when django-braces will
+    # reach version 1.5
+
+    def get(self, request, *args, **kwargs):
+        """Respond with a JSON list of at most `limit` matching members"""
+        query = request.GET.get('q', '').strip()
+        members = []
+        if query:
+            # prefix lookups use the indexes of users migration 0004
+            matches = Q()
+            for field in self.search_fields:
+                matches |= Q(**{field + '__istartswith': query})
+            members = self.community.members.exclude(
+                pk=self.community.admin_id).filter(matches).order_by(
+                'user__username').values_list(
+                'pk', 'user__username', 'user__first_name',
+                'user__last_name')[:self.limit]
+        return JsonResponse({'members': [
+            {'id': pk, 'username': username,
+             'name': " ".join(filter(None, [first_name, last_name]))}
+            for pk, username, first_name, last_name in members]})
+
+    def check_permissions(self, request):
+        """Check if the request user is the community admin. Only the admin
+        has the permission to transfer community ownership to another member
+        of the community."""
+        self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
+        return request.user.pk == self.community.admin.user_id
 
 
 class RemoveCommunityMemberView(LoginRequiredMixin, PermissionRequiredMixin,
@@ -298,7 +408,8 @@ class RemoveCommunityMemberView(LoginRequiredMixin, PermissionRequiredMixin,
         status message to the user."""
         user = get_object_or_404(User, username=kwargs.get('username'))
         systersuser = get_object_or_404(SystersUser, user=user)
-        status = systersuser.leave_community(self.community)
+        actor = SystersUser.objects.get(user=request.user)
+        status = systersuser.leave_community(self.community, actor=actor)
         self.redirect_url = reverse('community_users',
                                     kwargs={'slug': self.community.slug})
         if status == OK:
@@ -329,5 +440,35 @@ class RemoveCommunityMemberView(LoginRequiredMixin, PermissionRequiredMixin,
         """Check if the request user has the permission to remove systers users
         from a community. The permission holds true for superusers."""
         self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
-        return request.user.has_perm('delete_community_systersuser',
-                                     self.community)
+        return has_community_perm(request, 'delete_community_systersuser',
+                                  self.community)
+
+
+class CommunityMembershipHistoryView(LoginRequiredMixin,
+                                     PermissionRequiredMixin,
+                                     KeysetPaginationMixin, ListView):
+    """List of membership events of a Community, latest first"""
+    template_name = "membership/history.html"
+    keyset_field = '-pk'
+    raise_exception = True
+    # TODO: add `redirect_unauthenticated_users = True` when django-braces will
+    # reach version 1.5
+
+    def get_context_data(self, **kwargs):
+        """Add Community object to the context"""
+        context = super(CommunityMembershipHistoryView,
+                        self).get_context_data(**kwargs)
+        context['community'] = self.community
+        return context
+
+    def get_queryset(self):
+        return MembershipEvent.objects.filter(
+            community=self.community).select_related('actor__user',
+                                                     'subject__user')
+
+    def check_permissions(self, request):
+        """Check if the request user has the permission to change community
+        users. The permission holds true for superusers."""
+        self.community = get_object_or_404(Community, slug=self.kwargs['slug'])
+        return has_community_perm(request, "change_community_systersuser",
+                                  self.community)
@@ -97,6 +97,18 @@ LANGUAGES = [
 ]
 
 
+# Cache shared by all the processes serving the portal, so that cached
+# snapshots are invalidated everywhere at once.
+# https://docs.djangoproject.com/en/1.7/topics/cache/
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+        'TIMEOUT': 300,
+    }
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/1.6/topics/i18n/
 LANGUAGE_CODE = 'en-us'
@@ -14,6 +14,8 @@ DATABASES = {
     }
 }
 
+CACHES['default']['LOCATION'] = 'memcached:11211'
+
 INTERNAL_IPS = ('127.0.0.1',)
 
 # Instead of sending out real email, during development the emails will be sent
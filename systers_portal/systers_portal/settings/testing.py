@@ -20,6 +20,13 @@ DATABASES = {
 
 INTERNAL_IPS = ('127.0.0.1',)
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'TIMEOUT': 300,
+    }
+}
+
 ROOT_URLCONF = 'systers_portal.systers_portal.urls'
 
 TEST_RUNNER = 'django_nose.NoseTestSuiteRunner'
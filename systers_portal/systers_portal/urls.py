@@ -5,10 +5,12 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import never_cache
 from ckeditor import views
 
+from blog.feeds import LatestPostsFeed, LatestPostsAtomFeed
 from common.views import IndexView
 from common.views import ContactView
 from common.views import AboutUsView
 from common.views import NewCommunityProposalView
+from common.views import SearchView
 
 try:
     admin.autodiscover()
@@ -33,6 +35,9 @@ urlpatterns = patterns(
     url(r'^about-us/$', AboutUsView.as_view(), name='about-us'),
     url(r'^propose/newcommunity/$', NewCommunityProposalView.as_view(),
         name='new-community-proposal'),
+    url(r'^search/$', SearchView.as_view(), name='search'),
+    url(r'^feed/rss/$', LatestPostsFeed(), name='rss_feed'),
+    url(r'^feed/atom/$', LatestPostsAtomFeed(), name='atom_feed'),
 )
 
 if settings.DEBUG:
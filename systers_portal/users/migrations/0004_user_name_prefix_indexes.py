@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+    """Index auth_user names for case-insensitive prefix searches, i.e.
+    `istartswith` lookups, which PostgreSQL runs as
+    UPPER(column::text) LIKE UPPER('prefix%')."""
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0001_squashed_0003_auto_20160207_1550'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX users_auth_user_username_upper_like "
+            "ON auth_user (UPPER(username::text) text_pattern_ops);"
+            "CREATE INDEX users_auth_user_first_name_upper_like "
+            "ON auth_user (UPPER(first_name::text) text_pattern_ops);"
+            "CREATE INDEX users_auth_user_last_name_upper_like "
+            "ON auth_user (UPPER(last_name::text) text_pattern_ops);",
+            reverse_sql="DROP INDEX users_auth_user_username_upper_like;"
+                        "DROP INDEX users_auth_user_first_name_upper_like;"
+                        "DROP INDEX users_auth_user_last_name_upper_like;"),
+    ]
@@ -1,15 +1,15 @@
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import connection, models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from cities_light.models import Country
 from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFill
 
 from community.utils import get_groups
-from membership.constants import (NO_PENDING_JOIN_REQUEST, OK, NOT_MEMBER,
-                                  IS_ADMIN)
+from membership.constants import OK, NOT_MEMBER, IS_ADMIN
 
 
 class SystersUser(models.Model):
@@ -48,14 +48,12 @@ class SystersUser(models.Model):
         """
         group.user_set.remove(self.user)
 
-    def leave_groups(self, community_name):
+    def leave_groups(self, community):
         """Leave all groups that are related to a community.
 
-        :param community: string name of Community
+        :param community: Community object
         """
-        groups = get_groups(community_name)
-        for group in groups:
-            self.leave_group(group)
+        self.user.groups.remove(*get_groups(community))
 
     def get_fields(self):
         """Get model fields of a SystersUser object
@@ -87,11 +85,10 @@ class SystersUser(models.Model):
         :param groups: list of Group objects
         :return: list of filtered Group object of which the user is a member
         """
-        member_groups = []
-        for group in groups:
-            if self.is_group_member(group.name):
-                member_groups.append(group)
-        return member_groups
+        group_pks = [group.pk for group in groups]
+        member_pks = set(self.user.groups.filter(
+            pk__in=group_pks).values_list('pk', flat=True))
+        return [group for group in groups if group.pk in member_pks]
 
     def get_last_join_request(self, community):
         """Get the last join request made by the user to a community
@@ -106,48 +103,42 @@ class SystersUser(models.Model):
         if join_requests:
             return join_requests[0]
 
-    def approve_all_join_requests(self, community):
+    def approve_all_join_requests(self, community, approved_by=None):
         """Approve all join requests of a user towards a community.
 
         :param community: Community object
-        :return: string approve status: OK if all approved,
-                 NO_PENDING_JOIN_REQUEST if no not approved join requests
+        :param approved_by: SystersUser object of the approving user
+        :return: number of approved join requests
         """
         from membership.models import JoinRequest
         join_requests = JoinRequest.objects.filter(user=self,
                                                    community=community,
                                                    is_approved=False)
-        if not join_requests.exists():
-            return NO_PENDING_JOIN_REQUEST
-
-        for join_request in join_requests:
-            join_request.approve()
-        return OK
+        return join_requests.update(is_approved=True, approved_by=approved_by,
+                                    date_approved=timezone.now())
 
     def delete_all_join_requests(self, community):
         """Delete all join request of a user towards a community, i.e. reject
         or cancel join requests.
 
         :param community: Community object
-        :return: string approve status: OK if all approved,
-                 NO_PENDING_JOIN_REQUEST if no not approved join requests
+        :return: number of deleted join requests
         """
         from membership.models import JoinRequest
-        join_requests = JoinRequest.objects.filter(user=self,
-                                                   community=community,
-                                                   is_approved=False)
-        if not join_requests.exists():
-            return NO_PENDING_JOIN_REQUEST
-
-        for join_request in join_requests:
-            join_request.delete()
-        return OK
-
-    def leave_community(self, community):
+        sql = "DELETE FROM {0} WHERE user_id = %s AND community_id = %s " \
+              "AND NOT is_approved".format(
+                  connection.ops.quote_name(JoinRequest._meta.db_table))
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.pk, community.pk])
+            return cursor.rowcount
+
+    def leave_community(self, community, actor=None):
         """Leave a community. That involves losing all permissions towards
          this community.
 
         :param community: Community object
+        :param actor: SystersUser object who removed the user from the
+                      community, None if the user leaves the community
         :return: string status: OK if left the community, NOT_MEMBER if the
                  user was not a member of the community in the first place,
                  IS_ADMIN if the user is community admin and can't just leave
@@ -157,8 +148,8 @@ class SystersUser(models.Model):
             return NOT_MEMBER
         if self == community.admin:
             return IS_ADMIN
-        self.leave_groups(community.name)
-        community.remove_member(self)
+        self.leave_groups(community)
+        community.remove_member(self, actor=actor or self)
         community.save()
         return OK
 
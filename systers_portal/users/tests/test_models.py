@@ -39,24 +39,28 @@ class SystersUserTestCase(TestCase):
 
     def test_leave_groups(self):
         """Test SystersUser leaving all Community groups"""
-        name = "Baz"
-        self.systers_user.leave_groups(name)
+        user = User.objects.create_user(username='bar', password='foobar')
+        admin = SystersUser.objects.get(user=user)
+        community = Community.objects.create(name="Baz", slug="baz", order=1,
+                                             admin=admin)
+        self.systers_user.leave_groups(community)
         self.assertSequenceEqual(self.systers_user.user.groups.all(), [])
-        create_groups(name)
+        create_groups(community)
         content_manager_group = Group.objects.get(name="Baz: Content Manager")
         self.systers_user.join_group(content_manager_group)
         self.assertSequenceEqual(self.systers_user.user.groups.all(),
                                  [content_manager_group])
-        self.systers_user.leave_groups(name)
+        self.systers_user.leave_groups(community)
         self.assertSequenceEqual(self.systers_user.user.groups.all(), [])
-        other_name = "Foo"
-        create_groups(other_name)
+        other_community = Community.objects.create(name="Foo", slug="foo",
+                                                   order=2, admin=admin)
+        create_groups(other_community)
         admin_group = Group.objects.get(name="Foo: Community Admin")
         self.systers_user.join_group(admin_group)
         self.systers_user.join_group(content_manager_group)
         self.assertCountEqual(list(self.systers_user.user.groups.all()),
                               [content_manager_group, admin_group])
-        self.systers_user.leave_groups(name)
+        self.systers_user.leave_groups(community)
         self.assertSequenceEqual(self.systers_user.user.groups.all(),
                                  [admin_group])
 
@@ -81,7 +85,10 @@ class SystersUserTestCase(TestCase):
 
     def test_get_member_groups(self):
         """Test getting groups of which the user is a member"""
-        groups = create_groups("Bar")
+        community = Community.objects.create(name="Bar", slug="bar", order=1,
+                                             admin=self.systers_user)
+        groups = list(create_groups(community).values())
+        self.systers_user.leave_groups(community)
         self.assertEqual(self.systers_user.get_member_groups(groups), [])
         first_group = groups[0]
         self.systers_user.join_group(first_group)
@@ -105,7 +112,8 @@ class SystersUserTestCase(TestCase):
         bar_systers_user = SystersUser.objects.get(user=user)
         self.assertIsNone(bar_systers_user.get_last_join_request(community))
         join_request1 = JoinRequest.objects.create(user=bar_systers_user,
-                                                   community=community)
+                                                   community=community,
+                                                   is_approved=True)
         self.assertEqual(bar_systers_user.get_last_join_request(community),
                          join_request1)
         join_request2 = JoinRequest.objects.create(user=bar_systers_user,
@@ -120,20 +128,21 @@ class SystersUserTestCase(TestCase):
                                              admin=self.systers_user)
         user = User.objects.create_user(username='bar', password='foobar')
         bar_systers_user = SystersUser.objects.get(user=user)
-        status = bar_systers_user.approve_all_join_requests(community)
-        self.assertEqual(status, "no_pending_join_request")
-        join_request1 = JoinRequest.objects.create(user=bar_systers_user,
-                                                   community=community)
-        join_request2 = JoinRequest.objects.create(user=bar_systers_user,
-                                                   community=community)
-        self.assertFalse(join_request1.is_approved)
-        self.assertFalse(join_request2.is_approved)
-
-        status = bar_systers_user.approve_all_join_requests(community)
-        self.assertEqual(status, "ok")
-        join_requests = JoinRequest.objects.all()
-        for join_request in join_requests:
-            self.assertTrue(join_request.is_approved)
+        count = bar_systers_user.approve_all_join_requests(community)
+        self.assertEqual(count, 0)
+        join_request = JoinRequest.objects.create(user=bar_systers_user,
+                                                  community=community)
+        self.assertFalse(join_request.is_approved)
+
+        count = bar_systers_user.approve_all_join_requests(community,
+                                                           self.systers_user)
+        self.assertEqual(count, 1)
+        join_request = JoinRequest.objects.get()
+        self.assertTrue(join_request.is_approved)
+        self.assertEqual(join_request.approved_by, self.systers_user)
+        self.assertIsNotNone(join_request.date_approved)
+        count = bar_systers_user.approve_all_join_requests(community)
+        self.assertEqual(count, 0)
 
     def test_reject_all_join_requests(self):
         """Test rejecting all user join requests"""
@@ -142,15 +151,18 @@ class SystersUserTestCase(TestCase):
                                              admin=self.systers_user)
         user = User.objects.create_user(username='bar', password='foobar')
         bar_systers_user = SystersUser.objects.get(user=user)
-        status = bar_systers_user.delete_all_join_requests(community)
-        self.assertEqual(status, "no_pending_join_request")
+        count = bar_systers_user.delete_all_join_requests(community)
+        self.assertEqual(count, 0)
 
+        join_request = JoinRequest.objects.create(user=bar_systers_user,
+                                                  community=community,
+                                                  is_approved=True)
         JoinRequest.objects.create(user=bar_systers_user, community=community)
-        JoinRequest.objects.create(user=bar_systers_user, community=community)
-        status = bar_systers_user.delete_all_join_requests(community)
-        self.assertEqual(status, "ok")
+        with self.assertNumQueries(1):
+            count = bar_systers_user.delete_all_join_requests(community)
+        self.assertEqual(count, 1)
         self.assertFalse(bar_systers_user.is_member(community))
-        self.assertSequenceEqual(JoinRequest.objects.all(), [])
+        self.assertSequenceEqual(JoinRequest.objects.all(), [join_request])
 
     def test_leave_community(self):
         """Test leaving a community"""
@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, RequestFactory
+
+from community.models import Community
+from membership.models import JoinRequest
+from users.models import SystersUser
+from users.utils import load_membership, get_membership
+
+
+class UtilsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='foo', password='foobar')
+        self.systers_user = SystersUser.objects.get()
+        self.community = Community.objects.create(name="Foo", slug="foo",
+                                                  order=1,
+                                                  admin=self.systers_user)
+
+    def test_load_membership(self):
+        """Test loading membership details of a user in a single query"""
+        community = Community.objects.create(name="Bar", slug="bar", order=2,
+                                             admin=self.systers_user)
+        with self.assertNumQueries(1):
+            membership = load_membership(self.user, self.community)
+        self.assertEqual(membership.systers_user, self.systers_user)
+        self.assertIsNone(membership.join_request)
+
+        self.community.add_member(self.systers_user)
+        community.add_member(self.systers_user)
+        membership = load_membership(self.user, self.community)
+        self.assertEqual(membership.community_ids,
+                         {self.community.pk, community.pk})
+
+        JoinRequest.objects.create(user=self.systers_user, community=community)
+        join_request = JoinRequest.objects.create(user=self.systers_user,
+                                                  community=self.community)
+        membership = load_membership(self.user, self.community)
+        self.assertEqual(membership.join_request, join_request)
+        self.assertEqual(membership.join_request.community, self.community)
+
+        join_request.approve(approved_by=self.systers_user)
+        membership = load_membership(self.user, self.community)
+        self.assertTrue(membership.join_request.is_approved)
+        self.assertEqual(membership.join_request.approved_by_id,
+                         self.systers_user.pk)
+        self.assertEqual(membership.join_request.date_approved,
+                         join_request.date_approved)
+
+        user = User.objects.create_user(username='bar', password='foobar')
+        SystersUser.objects.filter(user=user).delete()
+        self.assertRaises(SystersUser.DoesNotExist, load_membership, user,
+                          self.community)
+
+    def test_get_membership(self):
+        """Test that membership details are loaded once per request"""
+        request = RequestFactory().get('/')
+        request.user = self.user
+        with self.assertNumQueries(1):
+            membership = get_membership(request, self.community)
+            self.assertIs(get_membership(request, self.community), membership)
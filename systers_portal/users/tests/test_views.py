@@ -1,8 +1,10 @@
 from django.contrib.auth.models import User, Group
 from django.core.urlresolvers import reverse
+from django.db.models.signals import post_save
 from django.test import TestCase, Client
 
 from community.models import Community
+from community.signals import manage_community_groups
 from membership.models import JoinRequest
 from users.models import SystersUser
 
@@ -133,6 +135,23 @@ class UserProfileViewTestCase(TestCase):
         response = self.client.get(bar_profile_url)
         self.assertEqual(response.status_code, 200)
 
+    def test_get_user_profile_view_community_admin(self):
+        """Test GET user profile as an admin of a community of the user"""
+        post_save.connect(manage_community_groups, sender=Community,
+                          dispatch_uid="manage_groups")
+        user = User.objects.create_user(username='bar', password='foobar')
+        systersuser = SystersUser.objects.get(user=user)
+        community = Community.objects.create(name="Foo", slug="foo", order=1,
+                                             admin=self.systers_user)
+        bar_profile_url = reverse('user_profile', kwargs={'username': 'bar'})
+        self.client.login(username='foo', password='foobar')
+        response = self.client.get(bar_profile_url)
+        self.assertEqual(response.status_code, 403)
+        community.add_member(systersuser)
+        community.save()
+        response = self.client.get(bar_profile_url)
+        self.assertEqual(response.status_code, 200)
+
     def test_post_user_profile_view(self):
         """Test POST user profile"""
         self.client.login(username='foo', password='foobar')
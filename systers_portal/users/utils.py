@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+from django.db import connection
+
+from users.models import SystersUser
+
+
+Membership = namedtuple('Membership',
+                        ['systers_user', 'community_ids', 'join_request'])
+
+
+def load_membership(user, community):
+    """Load the membership details of a user in a single query: the
+    SystersUser object, the ids of all communities the user is member of and
+    the last join request made by the user to a community.
+
+    :param user: User object
+    :param community: Community object
+    :return: Membership tuple, where join request can be None
+    :raises SystersUser.DoesNotExist: if the user has no SystersUser object
+    """
+    from community.models import Community
+    from membership.models import JoinRequest
+    qn = connection.ops.quote_name
+    systers_user_table = qn(SystersUser._meta.db_table)
+    members_table = qn(Community.members.through._meta.db_table)
+    join_request_table = qn(JoinRequest._meta.db_table)
+    # all the join request columns, prefixed to not clash with the columns of
+    # the SystersUser object they are annotated on
+    join_request_fields = JoinRequest._meta.concrete_fields
+    join_request_columns = ", ".join(
+        "jr.{0} AS {1}".format(qn(field.column),
+                               qn("join_request_" + field.attname))
+        for field in join_request_fields)
+    query = (
+        "SELECT su.*, "
+        "ARRAY(SELECT m.community_id FROM {0} m "
+        "WHERE m.systersuser_id = su.id) AS member_community_ids, {3} "
+        "FROM {1} su LEFT OUTER JOIN {2} jr ON jr.id = ("
+        "SELECT last_jr.id FROM {2} last_jr "
+        "WHERE last_jr.user_id = su.id AND last_jr.community_id = %s "
+        "ORDER BY last_jr.date_created DESC, last_jr.id DESC LIMIT 1) "
+        "WHERE su.user_id = %s"
+    ).format(members_table, systers_user_table, join_request_table,
+             join_request_columns)
+    rows = list(SystersUser.objects.raw(query, [community.pk, user.pk]))
+    if not rows:
+        raise SystersUser.DoesNotExist
+    systers_user = rows[0]
+    systers_user.user = user
+    join_request = None
+    if systers_user.join_request_id is not None:
+        join_request = JoinRequest(**dict(
+            (field.attname, getattr(systers_user,
+                                    "join_request_" + field.attname))
+            for field in join_request_fields))
+        join_request.user = systers_user
+        join_request.community = community
+    return Membership(systers_user, set(systers_user.member_community_ids),
+                      join_request)
+
+
+def get_membership(request, community):
+    """Get the membership details of the request user towards a community.
+    The details are loaded once per request and community.
+
+    :param request: HttpRequest object
+    :param community: Community object
+    :return: Membership tuple
+    """
+    memberships = getattr(request, '_memberships', None)
+    if memberships is None:
+        memberships = request._memberships = {}
+    if community.pk not in memberships:
+        memberships[community.pk] = load_membership(request.user, community)
+    return memberships[community.pk]
@@ -4,6 +4,7 @@ from django.views.generic import TemplateView
 from django.views.generic.edit import UpdateView
 from braces.views import LoginRequiredMixin, MultiplePermissionsRequiredMixin
 
+from community.utils import filter_communities_by_perm
 from membership.models import JoinRequest
 from users.forms import UserForm
 from users.models import SystersUser
@@ -77,12 +78,11 @@ class UserProfileView(LoginRequiredMixin, MultiplePermissionsRequiredMixin,
         * has the permission to change a community systersuser, if systersuser
           is member of any of those communities
         """
-        permissions = []
-        communities = self.systersuser.communities.all()
-        for community in communities:
-            permissions.extend([
-                request.user.has_perm("change_community_systersuser",
-                                      community)])
-        permissions.extend([request.user.is_superuser])
-        permissions.extend([request.user == self.user])
-        return any(permissions)
+        if request.user.is_superuser or request.user == self.user:
+            return True
+        if not request.user.is_active:
+            return False
+        communities = filter_communities_by_perm(
+            request.user, "change_community_systersuser",
+            self.systersuser.communities.all())
+        return communities.exists()